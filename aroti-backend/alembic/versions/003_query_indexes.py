@@ -0,0 +1,70 @@
+"""Query indexes
+
+GIN indexes for the specialists array filters and composite/partial btree
+indexes matching the specialists list and session availability predicates.
+Built with CREATE INDEX CONCURRENTLY so the tables stay writable.
+
+Revision ID: 003_query_indexes
+Revises: 002_seed
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_query_indexes'
+down_revision = '002_seed'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # languages && ARRAY[...] and categories @> ARRAY[...]
+        op.create_index(
+            'ix_specialists_languages_gin', 'specialists', ['languages'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_specialists_categories_gin', 'specialists', ['categories'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+        
+        # available = true AND price BETWEEN ... AND rating >= ...
+        op.create_index(
+            'ix_specialists_available_price_rating', 'specialists', ['price', 'rating'],
+            postgresql_where=sa.text('available'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # rating >= ... (optionally with price) without an availability filter
+        op.create_index(
+            'ix_specialists_rating_price', 'specialists', ['rating', 'price'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        
+        # check_specialist_availability: (specialist_id, date, time) among active sessions
+        op.create_index(
+            'ix_sessions_active_slot', 'sessions', ['specialist_id', 'date', 'time'],
+            postgresql_where=sa.text("status IN ('pending', 'upcoming')"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # get_sessions: user_id = ... ORDER BY date, time
+        op.create_index(
+            'ix_sessions_user_date_time', 'sessions', ['user_id', 'date', 'time'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in [
+            ('ix_sessions_user_date_time', 'sessions'),
+            ('ix_sessions_active_slot', 'sessions'),
+            ('ix_specialists_rating_price', 'specialists'),
+            ('ix_specialists_available_price_rating', 'specialists'),
+            ('ix_specialists_categories_gin', 'specialists'),
+            ('ix_specialists_languages_gin', 'specialists'),
+        ]:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,53 @@
+"""Pagination indexes
+
+Composite indexes matching the keyset pagination orders:
+reviews by (specialist_id, date, id) and sessions by (user_id, date, time, id).
+The sessions index supersedes ix_sessions_user_date_time from 003.
+
+Revision ID: 004_pagination_indexes
+Revises: 003_query_indexes
+Create Date: 2026-10-17 00:10:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_pagination_indexes'
+down_revision = '003_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # GET /api/reviews/{id}: ORDER BY date DESC, id DESC (backward scan)
+        op.create_index(
+            'ix_reviews_specialist_date_id', 'reviews', ['specialist_id', 'date', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # GET /api/sessions: ORDER BY date, time, id
+        op.create_index(
+            'ix_sessions_user_date_time_id', 'sessions', ['user_id', 'date', 'time', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_sessions_user_date_time', table_name='sessions',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sessions_user_date_time', 'sessions', ['user_id', 'date', 'time'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_sessions_user_date_time_id', table_name='sessions',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            'ix_reviews_specialist_date_id', table_name='reviews',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,52 @@
+"""Unique active slot
+
+Makes the active-slot index unique so the database, not the API, decides
+which of two concurrent bookings for the same (specialist_id, date, time)
+wins. Cancelled and completed sessions do not hold the slot.
+Supersedes ix_sessions_active_slot from 003.
+
+The unique build fails if duplicate active bookings already exist; resolve
+them (e.g. cancel the later booking) before upgrading.
+
+Revision ID: 005_unique_active_slot
+Revises: 004_pagination_indexes
+Create Date: 2026-10-17 00:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_unique_active_slot'
+down_revision = '004_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status IN ('pending', 'upcoming')")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_sessions_active_slot', 'sessions', ['specialist_id', 'date', 'time'],
+            unique=True, postgresql_where=ACTIVE,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_sessions_active_slot', table_name='sessions',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sessions_active_slot', 'sessions', ['specialist_id', 'date', 'time'],
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'uq_sessions_active_slot', table_name='sessions',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,43 @@
+"""Outbox
+
+Side effects of API writes (cache invalidation, workflow starts, reminder
+scheduling) are recorded in outbox_events in the same transaction as the
+write and delivered afterwards by the outbox relay.
+
+Revision ID: 006_outbox
+Revises: 005_unique_active_slot
+Create Date: 2026-10-17 00:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006_outbox'
+down_revision = '005_unique_active_slot'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=True),
+        sa.Column('payload', postgresql.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('available_at', sa.DateTime(), nullable=False, server_default=sa.text("(now() at time zone 'utc')")),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text("(now() at time zone 'utc')")),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_events_available_at_id', 'outbox_events', ['available_at', 'id'])
+    op.create_index('ix_outbox_events_key', 'outbox_events', ['key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_key', table_name='outbox_events')
+    op.drop_index('ix_outbox_events_available_at_id', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,26 @@
+"""Outbox traceparent
+
+Outbox events remember the trace of the request that enqueued them, so their
+delivery (e.g. the SessionBookingWorkflow start) shows up in the same trace.
+
+Revision ID: 007_outbox_traceparent
+Revises: 006_outbox
+Create Date: 2026-10-17 02:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_outbox_traceparent'
+down_revision = '006_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_events', sa.Column('traceparent', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox_events', 'traceparent')
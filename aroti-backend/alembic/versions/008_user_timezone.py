@@ -0,0 +1,38 @@
+"""User timezone
+
+Users get an IANA timezone (default UTC). Daily insights are keyed by the
+user's local date, and the hourly warm-up reads users one timezone at a time,
+paged by ID.
+
+Revision ID: 008_user_timezone
+Revises: 007_outbox_traceparent
+Create Date: 2026-10-17 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_user_timezone'
+down_revision = '007_outbox_traceparent'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('timezone', sa.String(), nullable=False, server_default='UTC')
+    )
+    # timezone = ... AND id > ... ORDER BY id (insights warm-up)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_timezone_id', 'users', ['timezone', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_timezone_id', table_name='users', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('users', 'timezone')
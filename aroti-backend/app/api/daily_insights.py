@@ -1,67 +1,61 @@
 """
 Daily insights API endpoints.
 """
-from fastapi import APIRouter, Depends
-from datetime import date
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import select
 from app.dependencies import get_current_user_id
-from app.schemas.home import DailyInsightSchema, TarotCardSchema, RitualSchema, NumerologyInsightSchema
+from app.schemas.home import DailyInsightSchema
+from app.cache.cache_aside import get_or_load
 from app.cache.redis_client import redis_client
+from app.cache.responses import cached_json_response
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.insights import build_insight, insight_key, insight_ttl, local_date, timezone_key
 
 router = APIRouter()
 
 
+async def _user_timezone(user_id: str) -> str:
+    """The user's timezone, cached in Redis; dropped by profile updates."""
+    tz = await redis_client.get_json(timezone_key(user_id))
+    if tz is None:
+        async with AsyncSessionLocal() as db:
+            tz = (await db.execute(
+                select(User.timezone).where(User.id == user_id)
+            )).scalar_one_or_none() or "UTC"
+        await redis_client.set_json(timezone_key(user_id), tz, ttl=settings.insights_timezone_ttl)
+    return tz
+
+
 @router.get("/daily-insights", response_model=DailyInsightSchema)
 async def get_daily_insights(
+    request: Request,
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Get daily insights (tarot card, horoscope, numerology, ritual, affirmation).
     Matches iOS HomeEndpoint.getDailyInsights
-    """
-    today = date.today()
     
-    # Check cache
-    cache_key = f"daily_insights:{today.isoformat()}"
-    cached = await redis_client.get_json(cache_key)
-    if cached:
-        return cached
+    Personalized from the user's birth date for the user's local day; normally
+    warmed shortly before the user's midnight (app/scheduler/insights.py), so
+    this is a cache hit.
+    """
+    tz = await _user_timezone(current_user_id)
+    today = local_date(tz)
     
-    # Generate daily insights (simplified - in production this would use actual logic)
-    # For now, return mock data matching iOS structure
-    insight = DailyInsightSchema(
-        tarotCard=TarotCardSchema(
-            id="1",
-            name="The Fool",
-            keywords=["new beginnings", "adventure", "innocence"],
-            interpretation="A new journey awaits you",
-            guidance=["Trust your instincts", "Embrace the unknown"],
-            imageName="tarot-fool"
-        ),
-        horoscope="Today brings opportunities for growth and reflection. Trust your intuition and be open to new experiences.",
-        numerology=NumerologyInsightSchema(
-            number=7,
-            preview="A day of introspection and spiritual growth"
-        ),
-        ritual=RitualSchema(
-            id="1",
-            title="Morning Meditation",
-            description="Start your day with a 10-minute meditation",
-            duration="10 minutes",
-            type="meditation",
-            intention="Set positive intentions for the day",
-            steps=["Find a quiet space", "Sit comfortably", "Focus on your breath"],
-            affirmation="I am open to the wisdom of the universe",
-            benefits=["Clarity", "Peace", "Focus"]
-        ),
-        affirmation="I trust the journey and embrace each moment with gratitude",
-        date=today
-    )
+    async def load():
+        async with AsyncSessionLocal() as db:
+            birth_date = (await db.execute(
+                select(User.birth_date).where(User.id == current_user_id)
+            )).scalar_one_or_none()
+        return build_insight(current_user_id, birth_date, today)
     
-    # Cache for the day
-    await redis_client.set_json(
-        cache_key,
-        insight.model_dump(by_alias=True),
-        ttl=86400  # 24 hours
+    # Fresh until the local day is over; stale copy is served while one caller regenerates
+    cached = await get_or_load(
+        insight_key(current_user_id, today),
+        load,
+        ttl=insight_ttl(today, tz),
+        stale_ttl=settings.cache_stale_ttl
     )
-    
-    return insight
+    return cached_json_response(request, cached)
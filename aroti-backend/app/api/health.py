@@ -1,12 +1,13 @@
 """
 Health check endpoints.
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.cache.redis_client import redis_client
+from app.observability.metrics import CONTENT_TYPE, registry
 
 router = APIRouter()
 
@@ -17,6 +18,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
 @router.get("/ready")
 async def readiness_check(db: Session = Depends(get_db)):
     """
@@ -35,18 +42,19 @@ async def readiness_check(db: Session = Depends(get_db)):
     except Exception:
         pass
     
-    # Check Redis
+    # Check Redis (skipped while the circuit breaker is open)
     try:
         checks["redis"] = await redis_client.ping()
     except Exception:
         pass
+    breaker = redis_client.breaker.stats()
     
     if all(checks.values()):
-        return {"status": "ready", "checks": checks}
+        return {"status": "ready", "checks": checks, "redisCircuit": breaker}
     else:
         from fastapi import status
         from fastapi.responses import JSONResponse
         return JSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={"status": "not ready", "checks": checks}
+            content={"status": "not ready", "checks": checks, "redisCircuit": breaker}
         )
@@ -0,0 +1,58 @@
+"""
+Numerology API endpoints.
+"""
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache_aside import serialize
+from app.database import get_async_db
+from app.dependencies import get_current_user_id
+from app.models.user import User
+from app.schemas.numerology import NumerologyBatchRequest, NumerologyBatchResponse, NumerologySchema
+from app.services.insights import local_date
+from app.services.numerology import numerology, numerology_batch
+
+router = APIRouter()
+
+
+@router.post("/numerology/batch", response_model=NumerologyBatchResponse)
+async def get_numerology_batch(
+    body: NumerologyBatchRequest,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Core destiny number, life path, personal cycle and karmic lessons for up to
+    NUMEROLOGY_BATCH_MAX birth dates, computed as one set of array operations.
+    """
+    day = body.day or datetime.now(timezone.utc).date()
+    # Serialized directly: validating thousands of results would cost more than computing them
+    payload = serialize({
+        "date": day.isoformat(),
+        "results": numerology_batch(body.birthDates, day),
+    })
+    return Response(content=payload.body, media_type="application/json")
+
+
+@router.get("/numerology/me", response_model=NumerologySchema)
+async def get_my_numerology(
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Numerology for the current user's birth date; personal numbers are for
+    the user's local date.
+    """
+    row = (await db.execute(
+        select(User.birth_date, User.timezone).where(User.id == current_user_id)
+    )).one_or_none()
+    
+    if row is None or row.birth_date is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No birth date on profile"
+        )
+    
+    return numerology(row.birth_date, local_date(row.timezone))
@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque to clients: URL-safe base64 of the sort name and the sort
+key of the last row returned. The next page starts strictly after that key,
+so pages stay stable while rows are inserted and cost the same at any depth.
+Responses keep their list body; the cursor for the next page is returned in
+the X-Next-Cursor header and is absent on the last page.
+"""
+import base64
+import json
+from datetime import date, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Query, status
+
+from app.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _text(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _iso(parse: Callable[[str], Any]) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        if not isinstance(value, str):
+            return False
+        try:
+            parse(value)
+            return True
+        except ValueError:
+            return False
+    return check
+
+
+# Expected type of each cursor key value, by (sort, key size); ids are strings
+CURSOR_KEYS: Dict[Tuple[str, int], Tuple[Callable[[Any], bool], ...]] = {
+    ("rating", 2): (_number, _text),
+    ("price", 2): (_number, _text),
+    ("date", 2): (_iso(date.fromisoformat), _text),
+    ("date", 3): (_iso(date.fromisoformat), _iso(time.fromisoformat), _text),
+}
+
+
+def encode_cursor(sort: str, key: List[Any]) -> str:
+    """Encode the sort key of the last row on a page."""
+    raw = json.dumps({"s": sort, "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str, size: int = 2) -> Optional[List[Any]]:
+    """
+    Decode a cursor issued for the same sort order with a key of `size` values.
+    Raises 400 if it is malformed or a key value has the wrong type for the sort,
+    so a tampered cursor never reaches a comparison.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        key = data["k"]
+        if data["s"] != sort or not isinstance(key, list) or len(key) != size:
+            raise ValueError("cursor does not match sort order")
+        checks = CURSOR_KEYS.get((sort, size))
+        if checks is None or not all(check(value) for check, value in zip(checks, key)):
+            raise ValueError("cursor key values do not match the sort order")
+        return key
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def page_limit(
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max)
+) -> int:
+    """Dependency for the capped page size query parameter."""
+    return limit
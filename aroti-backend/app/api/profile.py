@@ -1,78 +1,92 @@
 """
 User profile API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from typing import List
 
-from app.database import get_db
+from app.database import get_async_db, AsyncSessionLocal
 from app.dependencies import get_current_user_id
 from app.models.user import User
 from app.schemas.profile import UserDataSchema, UpdateProfileRequest
+from app.cache.cache_aside import build_entry, get_or_load
 from app.cache.redis_client import redis_client
+from app.cache.responses import cached_json_response
+from app.services.insights import is_timezone, timezone_key
+from app.services.outbox import invalidate, outbox_relay
 
 router = APIRouter()
 
+PROFILE_TTL = 300  # 5 minutes
+
+
+def profile_keys(user_id: str) -> List[str]:
+    """Cache keys derived from a user's row."""
+    return [f"profile:{user_id}", timezone_key(user_id)]
+
 
 @router.get("/user/profile", response_model=UserDataSchema)
 async def get_profile(
-    db: Session = Depends(get_db),
+    request: Request,
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Get user profile.
     Matches iOS ProfileEndpoint.getProfile
     """
-    # Check cache
-    cache_key = f"profile:{current_user_id}"
-    cached = await redis_client.get_json(cache_key)
-    if cached:
-        return cached
-    
-    # Query or create user
-    user = db.query(User).filter(User.id == current_user_id).first()
-    
-    if not user:
-        # Create new user record
-        user = User(
-            id=current_user_id,
-            name="User",  # Default name, can be updated
-            email=""  # Can be extracted from token if available
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    async def load():
+        async with AsyncSessionLocal() as db:
+            # Query or create user
+            user = await db.get(User, current_user_id)
+            
+            if not user:
+                # Create new user record
+                user = User(
+                    id=current_user_id,
+                    name="User",  # Default name, can be updated
+                    email=""  # Can be extracted from token if available
+                )
+                db.add(user)
+                await db.commit()
+                await db.refresh(user)
+            
+            return UserDataSchema.model_validate(user).model_dump(mode="json", by_alias=True)
     
-    result = UserDataSchema.model_validate(user)
-    
-    # Cache result
-    await redis_client.set_json(
-        cache_key,
-        result.model_dump(by_alias=True),
-        ttl=300  # 5 minutes
+    cached = await get_or_load(
+        f"profile:{current_user_id}",
+        load,
+        ttl=PROFILE_TTL
     )
-    
-    return result
+    return cached_json_response(request, cached)
 
 
 @router.put("/user/profile", response_model=UserDataSchema)
 async def update_profile(
     request: UpdateProfileRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Update user profile.
     Matches iOS ProfileEndpoint.updateProfile
     """
-    user = db.query(User).filter(User.id == current_user_id).first()
+    if request.timezone is not None and not is_timezone(request.timezone):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown timezone {request.timezone!r}"
+        )
+    
+    user = await db.get(User, current_user_id)
     
     if not user:
         # Create new user if doesn't exist
         user = User(
             id=current_user_id,
             name=request.name or "User",
-            email=""
+            email="",
+            timezone=request.timezone or "UTC"
         )
         db.add(user)
     else:
@@ -81,34 +95,39 @@ async def update_profile(
             user.name = request.name
         if request.location:
             user.birth_location = request.location
+        if request.timezone:
+            user.timezone = request.timezone
         
         user.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(user)
+    # Invalidate cache once the update commits
+    keys = profile_keys(current_user_id)
+    invalidate(db, *keys)
+    await db.commit()
+    await db.refresh(user)
+    outbox_relay.notify()
     
-    # Invalidate cache
-    await redis_client.delete(f"profile:{current_user_id}")
+    # The relay deletes the Redis copies; until then this process serves the new values from L1
+    profile = UserDataSchema.model_validate(user)
+    redis_client.set_local(keys[0], build_entry(profile.model_dump(mode="json", by_alias=True), PROFILE_TTL))
+    redis_client.set_local(keys[1], user.timezone)
     
-    return UserDataSchema.model_validate(user)
+    return profile
 
 
 @router.delete("/user/account", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_account(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Delete user account.
     Matches iOS ProfileEndpoint.deleteAccount
     """
-    user = db.query(User).filter(User.id == current_user_id).first()
-    
-    if user:
-        db.delete(user)
-        db.commit()
-    
-    # Invalidate cache
-    await redis_client.delete(f"profile:{current_user_id}")
+    await db.execute(delete(User).where(User.id == current_user_id))
+    keys = profile_keys(current_user_id)
+    invalidate(db, *keys)
+    await db.commit()
+    outbox_relay.notify()
     
     return None
@@ -2,55 +2,106 @@
 Sessions API endpoints.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
 import uuid
 from datetime import datetime
+from temporalio.client import WorkflowExecutionStatus
+from temporalio.service import RPCError, RPCStatusCode
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_async_db
 from app.dependencies import get_current_user_id
 from app.models.session import Session as SessionModel
-from app.models.specialist import Specialist
-from app.schemas.booking import SessionSchema, BookSessionRequest, UpdateSessionRequest
-from app.cache.redis_client import redis_client
+from app.schemas.booking import (
+    SessionSchema,
+    BookSessionRequest,
+    UpdateSessionRequest,
+    BookingAcceptedSchema,
+    BookingStatusSchema
+)
+from app.services.booking import (
+    ACTIVE_STATUSES,
+    SlotTaken,
+    SpecialistNotFound,
+    SpecialistUnavailable,
+    reserve_slot
+)
+from app.models.outbox import OutboxEvent
+from app.services.outbox import (
+    REMINDER_CANCEL,
+    REMINDER_SCHEDULE,
+    WORKFLOW_START,
+    enqueue,
+    invalidate,
+    outbox_relay
+)
+from app.workflows.client import temporal_client
+from app.workflows.session_booking import SessionBookingWorkflow, booking_workflow_id
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, page_limit
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 @router.get("/sessions", response_model=List[SessionSchema])
 async def get_sessions(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id),
-    status_filter: Optional[str] = None
+    status_filter: Optional[str] = None,
+    cursor: Optional[str] = Query(None),
+    limit: int = Depends(page_limit)
 ):
     """
-    Get user's sessions.
+    Get user's sessions in date/time order, paginated by cursor.
     Matches iOS BookingEndpoint.getSessions
     """
-    query = db.query(SessionModel).filter(SessionModel.user_id == current_user_id)
+    after = decode_cursor(cursor, "date", size=3)
+    
+    # Backed by ix_sessions_user_date_time_id
+    query = select(SessionModel).where(SessionModel.user_id == current_user_id)
     
     if status_filter:
-        query = query.filter(SessionModel.status == status_filter)
+        query = query.where(SessionModel.status == status_filter)
+    
+    if after is not None:
+        query = query.where(
+            tuple_(SessionModel.date, SessionModel.time, SessionModel.id) > tuple_(*after)
+        )
+    
+    sessions = (await db.execute(
+        query.order_by(SessionModel.date, SessionModel.time, SessionModel.id).limit(limit + 1)
+    )).scalars().all()
     
-    sessions = query.order_by(SessionModel.date, SessionModel.time).all()
+    if len(sessions) > limit:
+        last = sessions[limit - 1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor("date", [last.date, last.time, last.id])
     
-    return [SessionSchema.model_validate(s) for s in sessions]
+    return [SessionSchema.model_validate(s) for s in sessions[:limit]]
 
 
 @router.get("/sessions/{session_id}", response_model=SessionSchema)
 async def get_session(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Get session by ID.
     Matches iOS BookingEndpoint.getSession(id)
     """
-    session = db.query(SessionModel).filter(
-        SessionModel.id == session_id,
-        SessionModel.user_id == current_user_id
-    ).first()
+    session = (await db.execute(
+        select(SessionModel).where(
+            SessionModel.id == session_id,
+            SessionModel.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -61,76 +112,173 @@ async def get_session(
     return SessionSchema.model_validate(session)
 
 
-@router.post("/sessions", response_model=SessionSchema, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/sessions",
+    response_model=SessionSchema,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": BookingAcceptedSchema}}
+)
 async def book_session(
     request: BookSessionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Book a new session.
     Matches iOS BookingEndpoint.bookSession
+    
+    With BOOKING_MODE=workflow the booking is handed to SessionBookingWorkflow
+    and the response is 202 with a booking handle to poll.
     """
-    # Get specialist
-    specialist = db.query(Specialist).filter(Specialist.id == request.specialistId).first()
+    if settings.booking_mode == "workflow":
+        return await _start_booking_workflow(request, db, current_user_id)
     
-    if not specialist:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Specialist not found"
+    # Reserve the slot in one INSERT; uq_sessions_active_slot arbitrates races
+    try:
+        row = await reserve_slot(
+            db,
+            session_id=str(uuid.uuid4()),
+            specialist_id=request.specialistId,
+            user_id=current_user_id,
+            date=request.date,
+            time=request.time
         )
+    except SpecialistNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except SpecialistUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except SlotTaken as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
-    if not specialist.available:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Specialist is not available"
-        )
+    # Side effects commit with the booking and are delivered by the outbox relay
+    enqueue(db, REMINDER_SCHEDULE, _reminder_payload(row["id"], current_user_id, row["date"], row["time"]))
+    invalidate(db, f"sessions:user:{current_user_id}")
+    await db.commit()
+    outbox_relay.notify()
     
-    # Create session
-    session_id = str(uuid.uuid4())
-    new_session = SessionModel(
-        id=session_id,
-        specialist_id=request.specialistId,
-        user_id=current_user_id,
-        specialist_name=specialist.name,
-        specialist_photo=specialist.photo,
-        specialty=specialist.specialty,
-        date=request.date,
-        time=request.time,
-        duration=50,  # Default duration
-        price=specialist.price,
-        status="pending"
+    return SessionSchema.model_validate(row)
+
+
+def _reminder_payload(session_id: str, user_id: str, date: str, time: str) -> dict:
+    return {"session_id": session_id, "user_id": user_id, "date": date, "time": time}
+
+
+async def _start_booking_workflow(
+    request: BookSessionRequest,
+    db: AsyncSession,
+    user_id: str
+) -> JSONResponse:
+    """Queue a SessionBookingWorkflow start in the outbox and return 202 with the booking handle."""
+    booking_id = str(uuid.uuid4())
+    enqueue(db, WORKFLOW_START, {
+        "session_id": booking_id,
+        "specialist_id": request.specialistId,
+        "user_id": user_id,
+        "date": request.date,
+        "time": request.time
+    }, key=booking_id)
+    await db.commit()
+    outbox_relay.notify()
+    
+    status_url = f"/api/sessions/bookings/{booking_id}"
+    accepted = BookingAcceptedSchema(booking_id=booking_id, status="accepted", status_url=status_url)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=accepted.model_dump(by_alias=True),
+        headers={"Location": status_url}
     )
+
+
+@router.get("/sessions/bookings/{booking_id}", response_model=BookingStatusSchema)
+async def get_booking_status(
+    booking_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Status of a booking started with BOOKING_MODE=workflow.
+    "pending" while queued or running, then "confirmed", "rejected" or "failed".
+    """
+    # Not started yet: the workflow start is still in the outbox
+    queued = (await db.execute(
+        select(OutboxEvent.payload).where(
+            OutboxEvent.key == booking_id,
+            OutboxEvent.kind == WORKFLOW_START
+        )
+    )).scalars().first()
+    if queued is not None:
+        if queued.get("user_id") != current_user_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+        return BookingStatusSchema(booking_id=booking_id, status="pending", step="queued")
     
-    db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
+    try:
+        client = await temporal_client.get()
+        handle = client.get_workflow_handle(booking_workflow_id(booking_id))
+        description = await handle.describe()
+    except Exception as e:
+        if isinstance(e, RPCError) and e.status == RPCStatusCode.NOT_FOUND:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+        logger.error(f"Failed to describe booking {booking_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Booking service unavailable"
+        )
     
-    # Invalidate cache
-    await redis_client.delete(f"sessions:user:{current_user_id}")
+    # Bookings are only visible to the user who made them
+    memo = await description.memo()
+    if memo.get("user_id") != current_user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
     
-    # TODO: Trigger Temporal workflow for session booking
-    # from app.workflows.session_booking import start_booking_workflow
-    # await start_booking_workflow(new_session.id)
+    if description.status == WorkflowExecutionStatus.RUNNING:
+        try:
+            progress = await handle.query(SessionBookingWorkflow.status)
+        except RPCError as e:
+            # No worker available to answer the query; the booking is still queued
+            logger.warning(f"Booking status query failed for {booking_id}: {e}")
+            progress = {"step": None}
+        return BookingStatusSchema(booking_id=booking_id, status="pending", step=progress.get("step"))
     
-    return SessionSchema.model_validate(new_session)
+    if description.status == WorkflowExecutionStatus.COMPLETED:
+        result = await handle.result()
+        if result.get("success"):
+            return BookingStatusSchema(
+                booking_id=booking_id,
+                status="confirmed",
+                step="completed",
+                session_id=result.get("session_id"),
+                meeting_link=result.get("meeting_link")
+            )
+        return BookingStatusSchema(
+            booking_id=booking_id,
+            status="rejected",
+            step="rejected",
+            error=result.get("error")
+        )
+    
+    return BookingStatusSchema(
+        booking_id=booking_id,
+        status="failed",
+        error=description.status.name.lower() if description.status else None
+    )
 
 
 @router.put("/sessions/{session_id}", response_model=SessionSchema)
 async def update_session(
     session_id: str,
     request: UpdateSessionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Update a session.
     Matches iOS BookingEndpoint.updateSession
     """
-    session = db.query(SessionModel).filter(
-        SessionModel.id == session_id,
-        SessionModel.user_id == current_user_id
-    ).first()
+    session = (await db.execute(
+        select(SessionModel).where(
+            SessionModel.id == session_id,
+            SessionModel.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -146,11 +294,23 @@ async def update_session(
     
     session.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(session)
+    # Move the reminder with the session
+    if session.status in ACTIVE_STATUSES:
+        enqueue(db, REMINDER_SCHEDULE, _reminder_payload(session.id, current_user_id, session.date, session.time))
+    invalidate(db, f"sessions:user:{current_user_id}")
+    
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Moved onto a slot another active booking holds (uq_sessions_active_slot)
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This time slot is already booked"
+        )
+    await db.refresh(session)
     
-    # Invalidate cache
-    await redis_client.delete(f"sessions:user:{current_user_id}")
+    outbox_relay.notify()
     
     return SessionSchema.model_validate(session)
 
@@ -158,17 +318,19 @@ async def update_session(
 @router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_session(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Cancel a session.
     Matches iOS BookingEndpoint.cancelSession
     """
-    session = db.query(SessionModel).filter(
-        SessionModel.id == session_id,
-        SessionModel.user_id == current_user_id
-    ).first()
+    session = (await db.execute(
+        select(SessionModel).where(
+            SessionModel.id == session_id,
+            SessionModel.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -180,9 +342,9 @@ async def cancel_session(
     session.status = "cancelled"
     session.updated_at = datetime.utcnow()
     
-    db.commit()
-    
-    # Invalidate cache
-    await redis_client.delete(f"sessions:user:{current_user_id}")
+    enqueue(db, REMINDER_CANCEL, {"session_id": session_id})
+    invalidate(db, f"sessions:user:{current_user_id}")
+    await db.commit()
+    outbox_relay.notify()
     
     return None
@@ -2,15 +2,18 @@
 Specialists API endpoints.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy import select, tuple_
 
-from app.database import get_db
+from app.database import AsyncSessionLocal
 from app.dependencies import get_current_user_id
 from app.models.specialist import Specialist
 from app.models.review import Review
 from app.schemas.booking import SpecialistSchema, ReviewSchema
-from app.cache.redis_client import redis_client
+from app.cache.cache_aside import get_or_load, WithHeaders
+from app.cache.responses import cached_json_response
+from app.cache.specialist_catalog import specialist_catalog
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, page_limit
 from app.config import settings
 
 router = APIRouter()
@@ -18,129 +21,124 @@ router = APIRouter()
 
 @router.get("/specialists", response_model=List[SpecialistSchema])
 async def get_specialists(
-    db: Session = Depends(get_db),
+    request: Request,
     current_user_id: str = Depends(get_current_user_id),
     availability: Optional[str] = Query(None),
     price_min: Optional[int] = Query(None),
     price_max: Optional[int] = Query(None),
     rating: Optional[str] = Query(None),
     languages: Optional[str] = Query(None),
-    category: Optional[str] = Query(None)
+    category: Optional[str] = Query(None),
+    sort: str = Query("rating", pattern="^(rating|price)$"),
+    cursor: Optional[str] = Query(None),
+    limit: int = Depends(page_limit)
 ):
     """
     Get list of specialists with optional filtering.
     Matches iOS BookingEndpoint.getSpecialists
-    """
-    # Check cache
-    cache_key = f"specialists:list:{availability}:{price_min}:{price_max}:{rating}:{languages}:{category}"
-    cached = await redis_client.get_json(cache_key)
-    if cached:
-        return cached
-    
-    # Query database
-    query = db.query(Specialist)
-    
-    # Apply filters
-    if availability == "available":
-        query = query.filter(Specialist.available == True)
-    elif availability == "unavailable":
-        query = query.filter(Specialist.available == False)
-    
-    if price_min is not None:
-        query = query.filter(Specialist.price >= price_min)
-    
-    if price_max is not None:
-        query = query.filter(Specialist.price <= price_max)
-    
-    if rating:
-        min_rating = float(rating)
-        query = query.filter(Specialist.rating >= min_rating)
     
-    if languages:
-        lang_list = languages.split(",")
-        query = query.filter(Specialist.languages.overlap(lang_list))
-    
-    if category:
-        query = query.filter(Specialist.categories.contains([category]))
-    
-    specialists = query.all()
-    
-    # Convert to schemas
-    result = [SpecialistSchema.model_validate(s) for s in specialists]
+    Filters are evaluated against the in-process specialist catalog, so any
+    combination of parameters is served without a database or Redis lookup.
+    Results are sorted by rating (desc) or price (asc) and paginated by cursor.
+    """
+    try:
+        min_rating = float(rating) if rating else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid rating filter"
+        )
     
-    # Cache result
-    await redis_client.set_json(
-        cache_key,
-        [r.model_dump(by_alias=True) for r in result],
-        ttl=settings.cache_ttl_specialists
+    lang_list = [lang.strip() for lang in languages.split(",") if lang.strip()] if languages else None
+    
+    after = decode_cursor(cursor, sort)
+    
+    catalog = await specialist_catalog.get()
+    indices, next_key = catalog.page(
+        sort,
+        limit,
+        after,
+        availability=availability,
+        price_min=price_min,
+        price_max=price_max,
+        min_rating=min_rating,
+        languages=lang_list,
+        category=category
     )
     
-    return result
+    headers = {NEXT_CURSOR_HEADER: encode_cursor(sort, next_key)} if next_key else None
+    return cached_json_response(request, catalog.render(indices, headers))
 
 
 @router.get("/specialists/{specialist_id}", response_model=SpecialistSchema)
 async def get_specialist(
     specialist_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Get specialist by ID.
     Matches iOS BookingEndpoint.getSpecialist(id)
     """
-    # Check cache
-    cache_key = f"specialist:{specialist_id}"
-    cached = await redis_client.get_json(cache_key)
-    if cached:
-        return cached
-    
-    # Query database
-    specialist = db.query(Specialist).filter(Specialist.id == specialist_id).first()
+    async def load():
+        async with AsyncSessionLocal() as db:
+            specialist = await db.get(Specialist, specialist_id)
+            if specialist is None:
+                return None
+            return SpecialistSchema.model_validate(specialist).model_dump(by_alias=True)
+    
+    cached = await get_or_load(
+        f"specialist:{specialist_id}",
+        load,
+        ttl=settings.cache_ttl_specialist_detail,
+        stale_ttl=settings.cache_stale_ttl
+    )
     
-    if not specialist:
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Specialist not found"
         )
     
-    result = SpecialistSchema.model_validate(specialist)
-    
-    # Cache result
-    await redis_client.set_json(
-        cache_key,
-        result.model_dump(by_alias=True),
-        ttl=settings.cache_ttl_specialist_detail
-    )
-    
-    return result
+    return cached_json_response(request, cached)
 
 
 @router.get("/reviews/{specialist_id}", response_model=List[ReviewSchema])
 async def get_reviews(
     specialist_id: str,
-    db: Session = Depends(get_db),
-    current_user_id: str = Depends(get_current_user_id)
+    request: Request,
+    current_user_id: str = Depends(get_current_user_id),
+    cursor: Optional[str] = Query(None),
+    limit: int = Depends(page_limit)
 ):
     """
-    Get reviews for a specialist.
+    Get reviews for a specialist, newest first, paginated by cursor.
     Matches iOS BookingEndpoint.getReviews(specialistId)
     """
-    # Check cache
-    cache_key = f"reviews:{specialist_id}"
-    cached = await redis_client.get_json(cache_key)
-    if cached:
-        return cached
-    
-    # Query database
-    reviews = db.query(Review).filter(Review.specialist_id == specialist_id).all()
-    
-    result = [ReviewSchema.model_validate(r) for r in reviews]
-    
-    # Cache result (shorter TTL for reviews)
-    await redis_client.set_json(
-        cache_key,
-        [r.model_dump(by_alias=True) for r in result],
-        ttl=600  # 10 minutes
+    after = decode_cursor(cursor, "date")
+    
+    async def load():
+        async with AsyncSessionLocal() as db:
+            # Backed by ix_reviews_specialist_date_id (scanned backwards)
+            query = select(Review).where(Review.specialist_id == specialist_id)
+            if after is not None:
+                query = query.where(tuple_(Review.date, Review.id) < tuple_(*after))
+            reviews = (await db.execute(
+                query.order_by(Review.date.desc(), Review.id.desc()).limit(limit + 1)
+            )).scalars().all()
+            
+            items = [ReviewSchema.model_validate(r).model_dump(by_alias=True) for r in reviews[:limit]]
+            headers = {}
+            if len(reviews) > limit:
+                last = reviews[limit - 1]
+                headers[NEXT_CURSOR_HEADER] = encode_cursor("date", [last.date, last.id])
+            return WithHeaders(items, headers)
+    
+    # Pages are cached individually; shorter TTL for reviews
+    cached = await get_or_load(
+        f"reviews:{specialist_id}:{cursor or ''}:{limit}",
+        load,
+        ttl=600,  # 10 minutes
+        stale_ttl=settings.cache_stale_ttl
     )
-    
-    return result
+    return cached_json_response(request, cached)
@@ -1,19 +1,84 @@
 """
 Keycloak JWT validation and user extraction.
 """
+import asyncio
+import hashlib
+import random
+import time
+from collections import OrderedDict
 import httpx
 import jwt
+from jwt.algorithms import RSAAlgorithm
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 import logging
 
 from app.config import settings
+from app.observability.metrics import JWKS_REFRESHES, JWT_VALIDATION_DURATION
+from app.observability.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+ALGORITHMS = ["RS256"]
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified tokens.
+    Keyed by SHA-256 of the raw token; entries are dropped at the token's exp.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[Dict]:
+        """Return cached claims for a token that has not expired yet."""
+        if self.maxsize <= 0:
+            return None
+        key = self._digest(token)
+        claims = self._entries.get(key)
+        if claims is None:
+            self.misses += 1
+            return None
+        if claims["exp"] <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+    
+    def put(self, token: str, claims: Dict) -> None:
+        """Store verified claims, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        key = self._digest(token)
+        self._entries[key] = claims
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
 
 class KeycloakJWTValidator:
     """Validates JWT tokens from Keycloak."""
@@ -22,100 +87,186 @@ class KeycloakJWTValidator:
         self.issuer_uri = settings.keycloak_issuer_uri
         self.audience = settings.keycloak_audience
         self.jwks_uri = settings.keycloak_jwks_uri or f"{self.issuer_uri}/protocol/openid-connect/certs"
+        self.jwks_ttl = settings.jwks_cache_ttl
+        self.min_refresh_interval = settings.jwks_min_refresh_interval
         self._jwks_cache: Optional[Dict] = None
+        # Public keys parsed once per refresh, indexed by kid
+        self._keys: Dict[str, Any] = {}
+        self._keys_fetched_at: float = 0.0
+        self._last_attempt_at: float = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._rotation_task: Optional[asyncio.Task] = None
+        self.token_cache = VerifiedTokenCache(settings.token_cache_size)
+    
+    async def _fetch_jwks(self) -> Dict:
+        """GET the JWK set using a long-lived HTTP client."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=5.0)
+        response = await self._http.get(self.jwks_uri)
+        response.raise_for_status()
+        return response.json()
+    
+    async def refresh_keys(self, force: bool = False) -> None:
+        """
+        Fetch the JWK set and rebuild the kid -> public key index.
+        Concurrent callers share a single fetch: whoever waits on the lock
+        re-checks freshness and returns if another caller already refreshed.
+        """
+        requested_at = time.monotonic()
+        async with self._refresh_lock:
+            if self._last_attempt_at >= requested_at:
+                # Another caller fetched while we waited; share its outcome
+                if self._keys:
+                    return
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service unavailable"
+                )
+            if not force and self._keys and not self._keys_expired():
+                return
+            
+            self._last_attempt_at = time.monotonic()
+            try:
+                jwks = await self._fetch_jwks()
+            except Exception as e:
+                JWKS_REFRESHES.labels("error").inc()
+                logger.error(f"Failed to fetch JWKS: {e}")
+                if self._keys:
+                    # Keep serving the last known keys while Keycloak is unreachable
+                    return
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service unavailable"
+                )
+            
+            keys = {}
+            for jwk in jwks.get("keys", []):
+                if jwk.get("kty") != "RSA" or jwk.get("use", "sig") != "sig":
+                    continue
+                try:
+                    keys[jwk.get("kid")] = RSAAlgorithm.from_jwk(jwk)
+                except Exception as e:
+                    logger.warning(f"Skipping unparseable JWK {jwk.get('kid')}: {e}")
+            
+            JWKS_REFRESHES.labels("ok").inc()
+            self._jwks_cache = jwks
+            self._keys = keys
+            self._keys_fetched_at = time.monotonic()
+            logger.info(f"Loaded {len(keys)} signing keys from JWKS")
+    
+    def _keys_expired(self) -> bool:
+        return time.monotonic() - self._keys_fetched_at >= self.jwks_ttl
     
     async def get_jwks(self) -> Dict:
-        """Fetch JWK set from Keycloak."""
-        if self._jwks_cache:
-            return self._jwks_cache
+        """Fetch JWK set from Keycloak (cached for jwks_cache_ttl)."""
+        if self._jwks_cache is None or self._keys_expired():
+            await self.refresh_keys()
+        return self._jwks_cache
+    
+    async def get_signing_key(self, kid: Optional[str]) -> Optional[Any]:
+        """
+        Get the public key for a kid.
+        An unknown kid triggers one forced re-fetch (throttled by
+        jwks_min_refresh_interval) to pick up rotated Keycloak keys.
+        """
+        if not self._keys or self._keys_expired():
+            await self.refresh_keys()
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.jwks_uri, timeout=5.0)
-                response.raise_for_status()
-                self._jwks_cache = response.json()
-                return self._jwks_cache
-        except Exception as e:
-            logger.error(f"Failed to fetch JWKS: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Authentication service unavailable"
-            )
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_attempt_at >= self.min_refresh_interval:
+            await self.refresh_keys(force=True)
+            key = self._keys.get(kid)
+        return key
+    
+    async def _rotate_keys(self) -> None:
+        """Refresh keys shortly before the TTL runs out, with jitter across pods."""
+        while True:
+            delay = self.jwks_ttl * random.uniform(0.75, 0.9)
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh_keys(force=True)
+            except Exception as e:
+                logger.warning(f"Background JWKS refresh failed: {e}")
     
-    def get_signing_key(self, token: str, jwks: Dict) -> Optional[str]:
-        """Get the signing key for the token."""
+    async def start(self) -> None:
+        """Prefetch keys once and start background rotation."""
         try:
-            unverified_header = jwt.get_unverified_header(token)
-            kid = unverified_header.get("kid")
-            
-            for key in jwks.get("keys", []):
-                if key.get("kid") == kid:
-                    # Convert JWK to PEM format (simplified - in production use jwcrypto)
-                    # For now, we'll use PyJWT's built-in support
-                    return key
-            return None
+            await self.refresh_keys()
         except Exception as e:
-            logger.error(f"Error getting signing key: {e}")
-            return None
+            logger.warning(f"JWKS prefetch failed: {e}")
+        if self._rotation_task is None:
+            self._rotation_task = asyncio.create_task(self._rotate_keys())
+    
+    async def close(self) -> None:
+        """Stop background rotation and close the HTTP client."""
+        if self._rotation_task:
+            self._rotation_task.cancel()
+            self._rotation_task = None
+        if self._http:
+            await self._http.aclose()
+            self._http = None
     
     async def verify_token(self, token: str) -> Dict:
-        """Verify JWT token and return decoded payload."""
-        try:
-            # Fetch JWKS
-            jwks = await self.get_jwks()
+        """Verify JWT signature and claims and return decoded payload."""
+        with tracer.span("auth verify_token") as span:
+            start = time.perf_counter()
+            cached = self.token_cache.get(token)
+            span.set_attribute("auth.cached", cached is not None)
+            if cached is not None:
+                JWT_VALIDATION_DURATION.labels("cached").observe(time.perf_counter() - start)
+                return cached
             
-            # Decode token (PyJWT will automatically verify signature if jwks is provided)
-            # For RS256, we need to use the JWKS endpoint
-            unverified = jwt.decode(token, options={"verify_signature": False})
-            
-            # Verify issuer
-            if unverified.get("iss") != self.issuer_uri:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token issuer"
-                )
+            try:
+                decoded = await self._verify(token)
+            except Exception:
+                JWT_VALIDATION_DURATION.labels("rejected").observe(time.perf_counter() - start)
+                raise
+            JWT_VALIDATION_DURATION.labels("verified").observe(time.perf_counter() - start)
+            return decoded
+    
+    async def _verify(self, token: str) -> Dict:
+        """Check signature and claims; caches the claims on success."""
+        try:
+            header = jwt.get_unverified_header(token)
+            if header.get("alg") not in ALGORITHMS:
+                raise jwt.InvalidAlgorithmError(f"Unsupported algorithm {header.get('alg')}")
             
-            # Verify audience
-            token_aud = unverified.get("aud")
-            if isinstance(token_aud, list):
-                if self.audience not in token_aud:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid token audience"
-                    )
-            elif token_aud != self.audience:
+            key = await self.get_signing_key(header.get("kid"))
+            if key is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token audience"
+                    detail="Unknown signing key"
                 )
             
-            # Get signing key and verify signature
-            # In production, use a proper JWKS library like jwcrypto or python-jose
-            # For now, we'll decode with verification disabled and check manually
-            # This is a simplified version - production should use proper JWKS verification
-            
-            # Decode with full verification (requires proper JWKS handling)
-            # For development, we'll use a simpler approach
             decoded = jwt.decode(
                 token,
-                options={"verify_signature": False}  # Simplified for now
+                key,
+                algorithms=ALGORITHMS,
+                audience=self.audience,
+                issuer=self.issuer_uri,
+                options={"require": ["exp", "iss"]}
             )
-            
-            # Verify expiration
-            import time
-            if decoded.get("exp", 0) < time.time():
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token expired"
-                )
-            
+            self.token_cache.put(token, decoded)
             return decoded
-            
+        
+        except HTTPException:
+            raise
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token expired"
             )
+        except jwt.InvalidIssuerError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token issuer"
+            )
+        except jwt.InvalidAudienceError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token audience"
+            )
         except jwt.InvalidTokenError as e:
             logger.error(f"Invalid token: {e}")
             raise HTTPException(
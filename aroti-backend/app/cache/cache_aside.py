@@ -0,0 +1,184 @@
+"""
+Cache-aside helper with stampede protection.
+
+- Single-flight: concurrent misses on a key share one load in this process,
+  and a short Redis lock lets only one pod load while the others wait.
+- Stale-while-revalidate: entries carry a soft expiry; after it passes the
+  stale value is still served while one caller refreshes in the background.
+- Refresh-ahead: per-key window before soft expiry that triggers the
+  background refresh early.
+
+Values are stored as the final JSON response body plus its content hash,
+so a hit can be written to the client without decoding or re-validating.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.cache.redis_client import redis_client
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class CachedBody:
+    """Serialized JSON response body, its ETag and any extra response headers."""
+    body: str
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class WithHeaders:
+    """Loader result carrying response headers to cache alongside the body."""
+    value: Any
+    headers: Dict[str, str]
+
+
+# Loads in flight in this process, keyed by cache key
+_inflight: Dict[str, asyncio.Future] = {}
+# Strong references to background refresh tasks
+_background: Set[asyncio.Task] = set()
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def _unwrap(entry: Any) -> Optional[Dict]:
+    """Return the envelope if entry was written by this helper."""
+    if isinstance(entry, dict) and "body" in entry and "etag" in entry and "soft" in entry:
+        return entry
+    return None
+
+
+def _as_body(entry: Dict) -> CachedBody:
+    return CachedBody(body=entry["body"], etag=entry["etag"], headers=entry.get("headers", {}))
+
+
+def serialize(value: Any, headers: Optional[Dict[str, str]] = None) -> CachedBody:
+    """Encode value the way FastAPI's JSONResponse does and hash the result."""
+    body = json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    digest = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+    return CachedBody(body=body, etag=f'"{digest}"', headers=headers or {})
+
+
+def build_entry(value: Any, ttl: int) -> Dict:
+    """
+    The stored form of value, fresh for ttl seconds. Batch jobs write these
+    directly (Redis TTL ttl + stale_ttl) to pre-fill keys get_or_load reads.
+    """
+    if isinstance(value, WithHeaders):
+        cached = serialize(value.value, value.headers)
+    else:
+        cached = serialize(value)
+    return {"body": cached.body, "etag": cached.etag, "headers": cached.headers, "soft": time.time() + ttl}
+
+
+async def _store(key: str, value: Any, ttl: int, stale_ttl: int) -> Optional[CachedBody]:
+    """Write value with a soft expiry of ttl and a hard Redis TTL of ttl + stale_ttl."""
+    if value is None:
+        return None
+    entry = build_entry(value, ttl)
+    await redis_client.set_json(key, entry, ttl=ttl + stale_ttl)
+    return _as_body(entry)
+
+
+async def _load_and_store(
+    key: str,
+    loader: Loader,
+    ttl: int,
+    stale_ttl: int,
+    wait_for_peer: bool
+) -> Optional[CachedBody]:
+    """Load under the cross-pod lock; if another pod holds it, wait for its result."""
+    token = uuid.uuid4().hex
+    acquired = await redis_client.acquire_lock(_lock_key(key), token, settings.cache_lock_ttl_ms)
+    
+    if acquired is False:
+        if not wait_for_peer:
+            # Another pod is already refreshing this key
+            return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.cache_lock_wait_ms / 1000
+        while loop.time() < deadline:
+            await asyncio.sleep(0.05)
+            entry = _unwrap(await redis_client.get_json(key))
+            if entry is not None and entry["soft"] > time.time():
+                return _as_body(entry)
+        logger.warning(f"Timed out waiting for peer to load {key}, loading locally")
+    
+    try:
+        value = await loader()
+        return await _store(key, value, ttl, stale_ttl)
+    finally:
+        if acquired:
+            await redis_client.release_lock(_lock_key(key), token)
+
+
+def _single_flight(
+    key: str,
+    loader: Loader,
+    ttl: int,
+    stale_ttl: int,
+    wait_for_peer: bool = True
+) -> asyncio.Future:
+    """Return the in-flight load for key, starting one if none is running."""
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(
+            _load_and_store(key, loader, ttl, stale_ttl, wait_for_peer)
+        )
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return future
+
+
+def _refresh_in_background(key: str, loader: Loader, ttl: int, stale_ttl: int) -> None:
+    if key in _inflight:
+        return
+    task = _single_flight(key, loader, ttl, stale_ttl, wait_for_peer=False)
+    
+    def _done(t: asyncio.Future) -> None:
+        _background.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            logger.error(f"Background refresh of {key} failed: {t.exception()}")
+    
+    _background.add(task)
+    task.add_done_callback(_done)
+
+
+async def get_or_load(
+    key: str,
+    loader: Loader,
+    ttl: int,
+    stale_ttl: int = 0,
+    refresh_ahead: int = 0
+) -> Optional[CachedBody]:
+    """
+    Return the cached response body for key, loading it with loader() on a miss.
+    
+    ttl: seconds the value is fresh.
+    stale_ttl: seconds past ttl the value may still be served while it refreshes.
+    refresh_ahead: seconds before ttl runs out at which a background refresh starts.
+    
+    loader must not use the caller's request-scoped DB session, because it may
+    run in the background after the request has finished. It returns a
+    JSON-serializable value, optionally wrapped in WithHeaders; returning None
+    means "not found", is not cached, and makes get_or_load return None.
+    """
+    entry = _unwrap(await redis_client.get_json(key))
+    if entry is not None:
+        if time.time() >= entry["soft"] - refresh_ahead:
+            _refresh_in_background(key, loader, ttl, stale_ttl)
+        return _as_body(entry)
+    
+    return await asyncio.shield(_single_flight(key, loader, ttl, stale_ttl))
@@ -0,0 +1,100 @@
+"""
+Binary encoding for cached values.
+
+Layout: VERSION byte, codec byte, payload.
+The codec byte packs the serializer (low nibble) and the compression (high nibble),
+so every value says how to read it and settings can change without flushing Redis.
+Values without the header are legacy json.dumps text and are still readable.
+"""
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import msgpack
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # optional: falls back to zlib
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # optional: falls back to zlib
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+
+# Serializers: name -> (id, dumps, loads)
+SERIALIZERS: Dict[str, Tuple[int, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (1, orjson.dumps, orjson.loads),
+    "msgpack": (2, lambda value: msgpack.packb(value, use_bin_type=True),
+                lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)),
+}
+
+# Compressions: name -> (id, compress, decompress); None when the module is not installed
+COMPRESSIONS: Dict[str, Optional[Tuple[int, Callable[[bytes], bytes], Callable[[bytes], bytes]]]] = {
+    "none": (0, lambda data: data, lambda data: data),
+    "zlib": (1, lambda data: zlib.compress(data, 1), zlib.decompress),
+    "zstd": (2, lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+             lambda data: zstandard.ZstdDecompressor().decompress(data)) if zstandard else None,
+    "lz4": (3, lz4_frame.compress, lz4_frame.decompress) if lz4_frame else None,
+}
+
+
+class CodecError(ValueError):
+    """Raised when a cached value cannot be decoded."""
+
+
+class Codec:
+    """Encodes values with one serializer, compressing payloads above threshold bytes."""
+    
+    def __init__(self, serializer: str = "msgpack", compression: str = "zstd", threshold: int = 1024):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer {serializer}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression {compression}")
+        if COMPRESSIONS[compression] is None:
+            logger.warning(f"Cache compression {compression} is not installed, using zlib")
+            compression = "zlib"
+        self.serializer = serializer
+        self.compression = compression
+        self.threshold = threshold
+        self._serializer_id, self._dumps, _ = SERIALIZERS[serializer]
+        self._compression_id, self._compress, _ = COMPRESSIONS[compression]
+        # Decoders for every codec byte this process can read
+        self._loads = {id_: loads for id_, _, loads in SERIALIZERS.values()}
+        self._decompress = {entry[0]: entry[2] for entry in COMPRESSIONS.values() if entry}
+    
+    def encode(self, value: Any) -> bytes:
+        """Serialize value; raises TypeError if it is not serializable."""
+        payload = self._dumps(value)
+        compression_id = 0
+        if self._compression_id and len(payload) >= self.threshold:
+            payload = self._compress(payload)
+            compression_id = self._compression_id
+        return bytes((VERSION, compression_id << 4 | self._serializer_id)) + payload
+    
+    def decode(self, data: bytes) -> Any:
+        """Deserialize a value written by encode() or by the old json.dumps text format."""
+        if not data:
+            raise CodecError("Empty value")
+        if data[0] != VERSION:
+            # Legacy text; JSON never starts with a control byte
+            try:
+                return json.loads(data)
+            except ValueError as e:
+                raise CodecError(f"Invalid legacy JSON value: {e}")
+        if len(data) < 2:
+            raise CodecError("Truncated header")
+        loads = self._loads.get(data[1] & 0x0F)
+        decompress = self._decompress.get(data[1] >> 4)
+        if loads is None or decompress is None:
+            raise CodecError(f"Unsupported codec byte {data[1]:#04x}")
+        try:
+            return loads(decompress(data[2:]))
+        except Exception as e:
+            raise CodecError(f"Corrupt cached value: {e}")
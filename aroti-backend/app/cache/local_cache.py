@@ -0,0 +1,88 @@
+"""
+In-process L1 cache with per-entry TTL and LRU eviction.
+Sits in front of Redis for namespaces that opt in.
+"""
+import fnmatch
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+def parse_namespace_ttls(spec: str) -> Dict[str, int]:
+    """
+    Parse "specialist:60,daily_insights:300" into {"specialist": 60, ...}.
+    A namespace without a TTL is ignored.
+    """
+    result = {}
+    for item in spec.split(","):
+        name, _, ttl = item.strip().partition(":")
+        if name and ttl.isdigit() and int(ttl) > 0:
+            result[name] = int(ttl)
+    return result
+
+
+def key_namespace(key: str) -> str:
+    """Namespace is the key prefix before the first ':'."""
+    return key.split(":", 1)[0]
+
+
+def keys_namespace(keys: Sequence[str]) -> str:
+    """Shared namespace of keys, "mixed" if they differ, "none" if there are none."""
+    namespaces = {key_namespace(key) for key in keys}
+    if len(namespaces) == 1:
+        return namespaces.pop()
+    return "mixed" if namespaces else "none"
+
+
+class LocalCache:
+    """Bounded TTL/LRU map. Not thread-safe; used from the event loop only."""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds, evicting the LRU entry when full."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+    
+    def delete_matching(self, pattern: str) -> None:
+        """Drop every entry whose key matches a glob pattern."""
+        for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+            del self._entries[key]
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
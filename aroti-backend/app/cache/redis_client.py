@@ -1,58 +1,243 @@
 """
 Redis cache client for distributed caching.
 """
-import json
+import asyncio
 import logging
-from typing import Optional, Any
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
 import redis.asyncio as redis
 from redis.asyncio import Redis
+from redis.asyncio.client import NEVER_DECODE, Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 
 from app.config import settings
+from app.cache.codec import Codec, CodecError
+from app.cache.local_cache import LocalCache, key_namespace, keys_namespace, parse_namespace_ttls
+from app.observability.metrics import (
+    CACHE_ERRORS,
+    CACHE_L1_ENTRIES,
+    CACHE_OPERATION_DURATION,
+    CACHE_REQUESTS,
+    REDIS_CIRCUIT_SKIPPED,
+    REDIS_CIRCUIT_STATE,
+    REDIS_CIRCUIT_TRIPS,
+    registry
+)
+from app.observability.tracing import CLIENT, tracer
 
 logger = logging.getLogger(__name__)
 
+# Compare-and-delete so a lock that expired and was re-taken is not released
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+T = TypeVar("T")
+
+
+def _span_attributes(op: str, namespace: str, keys: Sequence[str]) -> Dict[str, Any]:
+    return {"db.system": "redis", "db.operation": op, "cache.namespace": namespace, "cache.keys": len(keys)}
+
+# Errors that mean Redis is unreachable or too slow, as opposed to a bad command
+OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RedisConnectionError):
+    """Raised instead of calling Redis while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive outage errors (within window seconds).
+    Open -> half-open after a jittered delay that doubles on every failed probe, up to max_reset_timeout.
+    Half-open lets one probe through; success closes the circuit, failure reopens it.
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int,
+        window: float,
+        reset_timeout: float,
+        max_reset_timeout: float,
+        jitter: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.jitter = jitter
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._last_failure_at = 0.0
+        self._reopens = 0
+        self._retry_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        # Counters for /ready (metrics count each event as it happens)
+        self.trips = 0
+        self.skipped = 0
+    
+    def allow(self) -> bool:
+        """Whether a call may go to Redis now; counts the call as skipped if not."""
+        if self.state == CLOSED:
+            return True
+        now = self._clock()
+        if self.state == OPEN and now >= self._retry_at:
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            # One probe at a time; a probe that never reported back is abandoned after reset_timeout
+            if self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout:
+                self._probe_started_at = now
+                return True
+        self.skipped += 1
+        REDIS_CIRCUIT_SKIPPED.inc()
+        return False
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        if self.state != CLOSED:
+            self._reopens = 0
+            self._probe_started_at = None
+            self._set_state(CLOSED)
+    
+    def record_error(self, error: Exception) -> None:
+        """Count outage errors; any other error still proves Redis answered."""
+        if not isinstance(error, OUTAGE_ERRORS) or isinstance(error, CircuitOpenError):
+            self.record_success()
+            return
+        now = self._clock()
+        if self.state == HALF_OPEN:
+            self._reopens += 1
+            self._open(now)
+            return
+        if now - self._last_failure_at > self.window:
+            self.failures = 0
+        self.failures += 1
+        self._last_failure_at = now
+        if self.state == CLOSED and self.failures >= self.failure_threshold:
+            self.trips += 1
+            REDIS_CIRCUIT_TRIPS.inc()
+            self._open(now)
+    
+    def _open(self, now: float) -> None:
+        delay = min(self.reset_timeout * 2 ** self._reopens, self.max_reset_timeout)
+        self._retry_at = now + delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._probe_started_at = None
+        self._set_state(OPEN)
+    
+    def _set_state(self, state: str) -> None:
+        if state == self.state:
+            return
+        if state == OPEN:
+            logger.warning(f"Redis circuit open after {self.failures} failures; retrying in {self._retry_at - self._clock():.1f}s")
+        elif state == CLOSED:
+            logger.info("Redis circuit closed")
+        self.state = state
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "skipped": self.skipped,
+            "retry_in": max(0.0, self._retry_at - self._clock()) if self.state == OPEN else 0.0
+        }
+
 
 class RedisClient:
     """Async Redis client wrapper."""
     
     def __init__(self):
-        self._client: Optional[Redis] = None
+        # The client is created up front; connections are opened lazily by the pool
+        self._client: Redis = self._create_client()
+        # L1: per-process copies of opted-in namespaces, invalidated over pub/sub
+        self.local = LocalCache(settings.cache_l1_max_entries)
+        self.l1_ttls = parse_namespace_ttls(settings.cache_l1_namespaces)
+        # Encoding of *_json values; reads accept every codec and legacy JSON text
+        self.codec = Codec(
+            settings.cache_serializer,
+            settings.cache_compression,
+            settings.cache_compression_threshold
+        )
+        self._instance_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+        # Lua scripts registered on the current client, keyed by source
+        self._scripts: Dict[str, Any] = {}
+        # Fails cache calls fast while Redis is unreachable
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            window=settings.redis_breaker_window,
+            reset_timeout=settings.redis_breaker_reset_timeout,
+            max_reset_timeout=settings.redis_breaker_max_reset_timeout,
+            jitter=settings.redis_breaker_jitter
+        )
     
-    async def connect(self):
-        """Connect to Redis."""
-        if self._client is None:
-            try:
-                self._client = await redis.from_url(
-                    f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}",
-                    password=settings.redis_password,
-                    encoding="utf-8",
-                    decode_responses=True
-                )
-                logger.info("Connected to Redis")
-            except Exception as e:
-                logger.error(f"Failed to connect to Redis: {e}")
-                raise
+    @staticmethod
+    def _create_client() -> Redis:
+        """Client over a bounded pool; callers wait up to redis_pool_timeout for a connection."""
+        pool = redis.BlockingConnectionPool(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            password=settings.redis_password,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_connect_timeout,
+            health_check_interval=settings.redis_health_check_interval,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        return Redis(connection_pool=pool)
     
-    async def ping(self) -> bool:
-        """Test Redis connection."""
-        if self._client is None:
-            await self.connect()
+    async def _call(
+        self,
+        op: str,
+        call: Callable[[], Awaitable[T]],
+        fallback: T,
+        keys: Sequence[str] = ()
+    ) -> T:
+        """
+        Run one Redis operation through the circuit breaker, timing and tracing it per key namespace.
+        Returns fallback without touching Redis while the circuit is open, or on error.
+        """
+        if not self.breaker.allow():
+            return fallback
+        namespace = keys_namespace(keys)
+        span = tracer.start_span(f"redis {op}", CLIENT, _span_attributes(op, namespace, keys), require_parent=True)
+        start = time.perf_counter()
         try:
-            await self._client.ping()
-            return True
+            result = await call()
         except Exception as e:
-            logger.error(f"Redis ping failed: {e}")
-            return False
+            self.breaker.record_error(e)
+            CACHE_ERRORS.labels(op, namespace).inc()
+            span.set_error(e)
+            logger.error(f"Redis {op} error ({namespace}): {e}")
+            return fallback
+        finally:
+            CACHE_OPERATION_DURATION.labels(op, namespace).observe(time.perf_counter() - start)
+            span.end()
+        self.breaker.record_success()
+        return result
+    
+    async def ping(self) -> bool:
+        """Test Redis connection."""
+        return bool(await self._call("ping", self._client.ping, False))
     
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache."""
-        if self._client is None:
-            await self.connect()
-        try:
-            return await self._client.get(key)
-        except Exception as e:
-            logger.error(f"Redis get error: {e}")
-            return None
+        return await self._call("get", lambda: self._client.get(key), None, [key])
     
     async def set(
         self,
@@ -61,38 +246,226 @@ class RedisClient:
         ttl: Optional[int] = None
     ) -> bool:
         """Set value in cache with optional TTL."""
-        if self._client is None:
-            await self.connect()
-        try:
+        async def run() -> bool:
             if ttl:
                 await self._client.setex(key, ttl, value)
             else:
                 await self._client.set(key, value)
             return True
-        except Exception as e:
-            logger.error(f"Redis set error: {e}")
+        return await self._call("set", run, False, [key])
+    
+    def set_local(self, key: str, value: Any) -> bool:
+        """
+        Put a freshly written value in this process's L1 only, without a Redis call,
+        so the writer reads its own write before the outbox delete reaches Redis.
+        Returns False if the key's namespace has not opted into L1.
+        """
+        l1_ttl = self._l1_ttl(key)
+        if l1_ttl is None:
             return False
+        self.local.set(key, value, l1_ttl)
+        return True
     
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
-        if self._client is None:
-            await self.connect()
-        try:
-            await self._client.delete(key)
+        return await self.delete_many([key])
+    
+    async def delete_many(self, keys: List[str]) -> bool:
+        """Delete keys and publish their L1 invalidations in one round trip."""
+        if not keys:
+            return True
+        for key in keys:
+            self.local.delete(key)
+        
+        async def run() -> bool:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                self._queue_invalidations(pipe, keys)
+                await pipe.execute()
+            return True
+        return await self._call("delete", run, False, keys)
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        """
+        Delete every key matching a glob pattern (e.g. "reviews:42:*").
+        Uses SCAN + UNLINK in batches, so Redis is never blocked by KEYS.
+        Returns the number of keys deleted.
+        """
+        self.local.delete_matching(pattern)
+        deleted = 0
+        
+        async def unlink(batch: List[str]) -> None:
+            nonlocal deleted
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.unlink(*batch)
+                self._queue_invalidations(pipe, batch)
+                await pipe.execute()
+            deleted += len(batch)
+        
+        async def run() -> None:
+            batch: List[str] = []
+            async for key in self._client.scan_iter(match=pattern, count=settings.cache_scan_count):
+                batch.append(key)
+                if len(batch) >= settings.cache_scan_count:
+                    await unlink(batch)
+                    batch = []
+            if batch:
+                await unlink(batch)
+        
+        await self._call("pattern_delete", run, None, [pattern])
+        return deleted
+    
+    async def tag(self, tags: List[str], keys: List[str], ttl: Optional[int] = None) -> bool:
+        """
+        Record keys under tags so invalidate_tags can drop them together.
+        A tag set lives as long as its longest-lived member (ttl), or forever without one.
+        """
+        async def run() -> bool:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.sadd(f"tag:{tag}", *keys)
+                    if ttl:
+                        pipe.expire(f"tag:{tag}", ttl, nx=True)
+                        pipe.expire(f"tag:{tag}", ttl, gt=True)
+                await pipe.execute()
             return True
+        return await self._call("tag", run, False, keys)
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key recorded under any of the tags, and the tag sets. Returns keys deleted."""
+        tag_keys = [f"tag:{tag}" for tag in tags]
+        if not tag_keys:
+            return 0
+        members = await self._call("tag_lookup", lambda: self._client.sunion(tag_keys), None, tag_keys)
+        if members is None:
+            return 0
+        keys = sorted(members)
+        if not await self.delete_many(keys + tag_keys):
+            return 0
+        return len(keys)
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """
+        Queue commands and send them in one round trip when the block exits.
+        Unlike the cache helpers, errors propagate to the caller (CircuitOpenError while open).
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Redis circuit is open")
+        async with self._client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            with tracer.span("redis pipeline", CLIENT, {"db.system": "redis"}, require_parent=True):
+                try:
+                    await pipe.execute()
+                except Exception as e:
+                    self.breaker.record_error(e)
+                    raise
+            self.breaker.record_success()
+    
+    async def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer key."""
+        return await self._call("incr", lambda: self._client.incr(key), None, [key])
+    
+    async def acquire_lock(self, key: str, token: str, ttl_ms: int) -> Optional[bool]:
+        """
+        Try to take a short-lived lock (SET NX PX).
+        Returns True if acquired, False if held elsewhere, None if Redis failed.
+        """
+        async def run() -> bool:
+            return bool(await self._client.set(key, token, nx=True, px=ttl_ms))
+        return await self._call("lock", run, None, [key])
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock only if we still own it."""
+        async def run() -> bool:
+            return bool(await self._client.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
+        return await self._call("unlock", run, False, [key])
+    
+    async def run_script(self, source: str, keys: List[str], args: List[Any]) -> Any:
+        """
+        Run a Lua script with EVALSHA, loading it on first use.
+        Unlike the cache helpers, errors propagate to the caller (CircuitOpenError while open).
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Redis circuit is open")
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self._client.register_script(source)
+        namespace = keys_namespace(keys)
+        span = tracer.start_span("redis script", CLIENT, _span_attributes("evalsha", namespace, keys), require_parent=True)
+        start = time.perf_counter()
+        try:
+            result = await script(keys=keys, args=args)
         except Exception as e:
-            logger.error(f"Redis delete error: {e}")
-            return False
+            self.breaker.record_error(e)
+            CACHE_ERRORS.labels("script", namespace).inc()
+            span.set_error(e)
+            raise
+        finally:
+            CACHE_OPERATION_DURATION.labels("script", namespace).observe(time.perf_counter() - start)
+            span.end()
+        self.breaker.record_success()
+        return result
+    
+    def _l1_ttl(self, key: str) -> Optional[int]:
+        """L1 TTL for the key's namespace, or None if it has not opted in."""
+        return self.l1_ttls.get(key_namespace(key))
+    
+    def _queue_invalidations(self, pipe: Pipeline, keys: List[str]) -> None:
+        """Queue a publish per L1-enabled key so other pods drop their copy."""
+        for key in keys:
+            if self._l1_ttl(key) is not None:
+                pipe.publish(settings.cache_invalidation_channel, f"{self._instance_id}|{key}")
+    
+    def _decode(self, key: str, value: Optional[bytes]) -> Optional[Any]:
+        if not value:
+            return None
+        try:
+            return self.codec.decode(value)
+        except CodecError as e:
+            logger.error(f"Cache decode error for {key}: {e}")
+            return None
     
     async def get_json(self, key: str) -> Optional[Any]:
-        """Get and deserialize JSON value."""
-        value = await self.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return None
-        return None
+        """Get and deserialize JSON value (served from L1 when the namespace opts in)."""
+        return (await self.mget_json([key]))[0]
+    
+    async def mget_json(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get and deserialize several JSON values in one MGET.
+        Keys held in L1 are answered locally; missing or broken values come back as None.
+        """
+        values: List[Optional[Any]] = [None] * len(keys)
+        remote: List[int] = []
+        for i, key in enumerate(keys):
+            if self._l1_ttl(key) is not None:
+                values[i] = self.local.get(key)
+            if values[i] is None:
+                remote.append(i)
+            else:
+                CACHE_REQUESTS.labels(key_namespace(key), "l1_hit").inc()
+        if not remote:
+            return values
+        
+        remote_keys = [keys[i] for i in remote]
+        # Values are binary, so skip the client's utf-8 decoding for this reply
+        raw = await self._call(
+            "mget",
+            lambda: self._client.execute_command("MGET", *remote_keys, **{NEVER_DECODE: True}),
+            None,
+            remote_keys
+        )
+        if raw is None:
+            raw = [None] * len(remote)
+        
+        for i, value in zip(remote, raw):
+            decoded = self._decode(keys[i], value)
+            CACHE_REQUESTS.labels(key_namespace(keys[i]), "miss" if decoded is None else "hit").inc()
+            l1_ttl = self._l1_ttl(keys[i])
+            if decoded is not None and l1_ttl is not None:
+                self.local.set(keys[i], decoded, l1_ttl)
+            values[i] = decoded
+        return values
     
     async def set_json(
         self,
@@ -101,19 +474,100 @@ class RedisClient:
         ttl: Optional[int] = None
     ) -> bool:
         """Serialize and set JSON value."""
+        return await self.mset_json({key: value}, ttl=ttl)
+    
+    async def mset_json(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """
+        Serialize and set several JSON values in one round trip.
+        ttls overrides ttl per key; a key with neither never expires.
+        """
+        ttls = ttls or {}
         try:
-            json_value = json.dumps(value)
-            return await self.set(key, json_value, ttl)
+            encoded = {key: self.codec.encode(value) for key, value in items.items()}
         except (TypeError, ValueError) as e:
-            logger.error(f"JSON serialization error: {e}")
+            logger.error(f"Cache serialization error: {e}")
+            return False
+        if not encoded:
+            return True
+        
+        async def run() -> bool:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, data in encoded.items():
+                    pipe.set(key, data, ex=ttls.get(key, ttl) or None)
+                self._queue_invalidations(pipe, list(encoded))
+                await pipe.execute()
+            return True
+        if not await self._call("mset", run, False, list(encoded)):
             return False
+        
+        for key, value in items.items():
+            l1_ttl = self._l1_ttl(key)
+            if l1_ttl is not None:
+                key_ttl = ttls.get(key, ttl)
+                self.local.set(key, value, min(l1_ttl, key_ttl) if key_ttl else l1_ttl)
+        return True
+    
+    async def _listen_for_invalidations(self) -> None:
+        """Drop L1 entries invalidated by other pods."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(settings.cache_invalidation_channel)
+                while True:
+                    # Short waits keep reads inside redis_socket_timeout
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    origin, _, key = message["data"].partition("|")
+                    if origin != self._instance_id:
+                        self.local.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while disconnected
+                logger.error(f"Cache invalidation listener error: {e}")
+                self.local.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+    
+    async def start_invalidation_listener(self) -> None:
+        """Subscribe to cross-pod L1 invalidations (no-op when L1 is disabled)."""
+        if self.l1_ttls and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
     
     async def close(self):
         """Close Redis connection."""
-        if self._client:
-            await self._client.close()
-            self._client = None
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        self.local.clear()
+        self._scripts.clear()
+        await self._client.aclose(close_connection_pool=True)
+        # Fresh pool so the client stays usable after shutdown (tests, workers)
+        self._client = self._create_client()
 
 
 # Global Redis client instance
 redis_client = RedisClient()
+
+
+def _collect_metrics() -> None:
+    """Refresh L1 and circuit breaker gauges before a scrape."""
+    stats = redis_client.breaker.stats()
+    for state in (CLOSED, OPEN, HALF_OPEN):
+        REDIS_CIRCUIT_STATE.labels(state).set(1 if stats["state"] == state else 0)
+    CACHE_L1_ENTRIES.set(len(redis_client.local))
+
+
+registry.add_collector(_collect_metrics)
@@ -0,0 +1,28 @@
+"""
+HTTP responses for pre-serialized cache entries (ETag / 304 support).
+"""
+from typing import Optional
+from fastapi import Request, Response, status
+
+from app.cache.cache_aside import CachedBody
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cached_json_response(request: Request, cached: CachedBody) -> Response:
+    """
+    Return the cached body as-is, skipping response_model validation and
+    re-encoding; answer 304 if the client already has this version.
+    """
+    headers = {**cached.headers, "ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
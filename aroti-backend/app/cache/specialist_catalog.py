@@ -0,0 +1,282 @@
+"""
+In-process, column-oriented snapshot of the specialists table.
+
+Price, rating and availability are NumPy columns; languages and categories
+are bitsets (one bit per distinct value, packed into uint64 words). Any
+combination of GET /api/specialists filters is answered with a handful of
+vectorized comparisons instead of a Postgres query or a per-combination
+Redis key.
+
+The snapshot is versioned: every process rebuilds from Postgres when it sees
+a new CATALOG_VERSION_KEY in Redis, and at the latest after catalog_max_age.
+The version is bumped by the outbox when a specialist:* key is invalidated,
+and by hand after writes outside the API (seed data, admin SQL):
+
+    python -m app.cache.specialist_catalog
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.cache.cache_aside import CachedBody
+from app.cache.redis_client import redis_client
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.specialist import Specialist
+from app.schemas.booking import SpecialistSchema
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "catalog:specialists:version"
+
+# Supported sort orders: name -> (column, descending); ties break on id ascending
+SORTS = {
+    "rating": ("rating", True),
+    "price": ("price", False),
+}
+
+
+class Bitset:
+    """Maps a vocabulary onto bit positions and packs per-row sets into uint64 words."""
+    
+    def __init__(self, rows: List[Iterable[str]]):
+        vocabulary = sorted({value for values in rows for value in values})
+        self.positions: Dict[str, int] = {value: i for i, value in enumerate(vocabulary)}
+        self.words = max(1, (len(vocabulary) + 63) // 64)
+        self.bits = np.zeros((len(rows), self.words), dtype=np.uint64)
+        for row, values in enumerate(rows):
+            self.bits[row] = self.mask(values)
+    
+    def mask(self, values: Iterable[str]) -> np.ndarray:
+        """Bit mask for values; values outside the vocabulary set no bits."""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for value in values:
+            position = self.positions.get(value)
+            if position is not None:
+                mask[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+        return mask
+    
+    def overlaps(self, values: Iterable[str]) -> np.ndarray:
+        """Rows sharing at least one value (array && ARRAY[...])."""
+        return (self.bits & self.mask(values)).any(axis=1)
+    
+    def contains(self, values: List[str]) -> np.ndarray:
+        """Rows containing every value (array @> ARRAY[...])."""
+        if any(value not in self.positions for value in values):
+            return np.zeros(len(self.bits), dtype=bool)
+        mask = self.mask(values)
+        return ((self.bits & mask) == mask).all(axis=1)
+
+
+class SpecialistCatalog:
+    """Immutable snapshot of all specialists at one catalog version."""
+    
+    def __init__(self, version: Optional[int], specialists: List[dict]):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.size = len(specialists)
+        # Pre-encoded JSON per row so responses are joined, not re-serialized
+        self.row_json = [
+            json.dumps(row, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+            for row in specialists
+        ]
+        # Content digest, identical on every pod holding the same rows
+        self.digest = hashlib.blake2b("\n".join(self.row_json).encode("utf-8"), digest_size=16).digest()
+        self.ids = np.array([row["id"] for row in specialists], dtype=str)
+        self.price = np.array([row["price"] for row in specialists], dtype=np.int64)
+        self.rating = np.array([row["rating"] or 0.0 for row in specialists], dtype=np.float64)
+        self.available = np.array([bool(row["available"]) for row in specialists], dtype=bool)
+        self.languages = Bitset([row["languages"] or [] for row in specialists])
+        self.categories = Bitset([row["categories"] or [] for row in specialists])
+        # Position of every row in each sort order, precomputed once per snapshot
+        self.ranks: Dict[str, np.ndarray] = {}
+        for sort, (column, descending) in SORTS.items():
+            values = getattr(self, column)
+            order = np.lexsort((self.ids, -values if descending else values))
+            rank = np.empty(self.size, dtype=np.int64)
+            rank[order] = np.arange(self.size)
+            self.ranks[sort] = rank
+    
+    def filter(
+        self,
+        availability: Optional[str] = None,
+        price_min: Optional[int] = None,
+        price_max: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        languages: Optional[List[str]] = None,
+        category: Optional[str] = None
+    ) -> np.ndarray:
+        """Row indices matching the filters, with the same semantics as the SQL query."""
+        return np.flatnonzero(self._mask(
+            availability, price_min, price_max, min_rating, languages, category
+        ))
+    
+    def _mask(
+        self,
+        availability: Optional[str],
+        price_min: Optional[int],
+        price_max: Optional[int],
+        min_rating: Optional[float],
+        languages: Optional[List[str]],
+        category: Optional[str]
+    ) -> np.ndarray:
+        selected = np.ones(self.size, dtype=bool)
+        
+        if availability == "available":
+            selected &= self.available
+        elif availability == "unavailable":
+            selected &= ~self.available
+        
+        if price_min is not None:
+            selected &= self.price >= price_min
+        
+        if price_max is not None:
+            selected &= self.price <= price_max
+        
+        if min_rating is not None:
+            selected &= self.rating >= min_rating
+        
+        if languages:
+            selected &= self.languages.overlaps(languages)
+        
+        if category:
+            selected &= self.categories.contains([category])
+        
+        return selected
+    
+    def _after(self, sort: str, key: List[Any]) -> np.ndarray:
+        """Rows strictly after the cursor key (sort value, id) in the given order."""
+        column, descending = SORTS[sort]
+        values = getattr(self, column)
+        value, last_id = key
+        beyond = values < value if descending else values > value
+        return beyond | ((values == value) & (self.ids > last_id))
+    
+    def key_of(self, sort: str, index: int) -> List[Any]:
+        """Cursor key (sort value, id) of a row."""
+        column, _ = SORTS[sort]
+        return [getattr(self, column)[index].item(), str(self.ids[index])]
+    
+    def page(
+        self,
+        sort: str,
+        limit: int,
+        after: Optional[List[Any]] = None,
+        **filters
+    ) -> Tuple[np.ndarray, Optional[List[Any]]]:
+        """
+        One page of matching rows in sort order, starting after the cursor key.
+        Returns the row indices and the key to resume from (None on the last page).
+        """
+        selected = self._mask(
+            filters.get("availability"),
+            filters.get("price_min"),
+            filters.get("price_max"),
+            filters.get("min_rating"),
+            filters.get("languages"),
+            filters.get("category")
+        )
+        if after is not None:
+            selected &= self._after(sort, after)
+        
+        matches = np.flatnonzero(selected)
+        rank = self.ranks[sort][matches]
+        if len(matches) > limit:
+            # Only the first limit+1 ranks need ordering
+            head = np.argpartition(rank, limit)[:limit + 1]
+            ordered = matches[head[np.argsort(rank[head])]]
+        else:
+            ordered = matches[np.argsort(rank)]
+        
+        indices = ordered[:limit]
+        next_key = self.key_of(sort, indices[-1]) if len(ordered) > limit else None
+        return indices, next_key
+    
+    def render(self, indices: np.ndarray, headers: Optional[Dict[str, str]] = None) -> CachedBody:
+        """JSON array body for the selected rows; ETag derives from catalog content and rows."""
+        body = "[" + ",".join(self.row_json[i] for i in indices) + "]"
+        digest = hashlib.blake2b(
+            self.digest + indices.astype(np.int64).tobytes(),
+            digest_size=16
+        ).hexdigest()
+        return CachedBody(body=body, etag=f'"{digest}"', headers=headers or {})
+
+
+class CatalogHolder:
+    """Keeps the current snapshot and rebuilds it when the Redis version moves."""
+    
+    def __init__(self):
+        self._catalog: Optional[SpecialistCatalog] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def _load_rows(self) -> List[dict]:
+        async with AsyncSessionLocal() as db:
+            specialists = (await db.execute(
+                select(Specialist).order_by(Specialist.id)
+            )).scalars().all()
+            return [SpecialistSchema.model_validate(s).model_dump(by_alias=True) for s in specialists]
+    
+    async def _current_version(self) -> Optional[int]:
+        value = await redis_client.get(CATALOG_VERSION_KEY)
+        return int(value) if value is not None else None
+    
+    def _is_stale(self, version: Optional[int]) -> bool:
+        catalog = self._catalog
+        if catalog is None:
+            return True
+        # Max age bounds staleness for writes nobody signalled (or a Redis outage)
+        if time.monotonic() - catalog.built_at >= settings.catalog_max_age:
+            return True
+        return version is not None and version != catalog.version
+    
+    async def get(self) -> SpecialistCatalog:
+        """Return the current snapshot, rebuilding it if the catalog version changed."""
+        now = time.monotonic()
+        if self._catalog is not None and now - self._checked_at < settings.catalog_version_check_interval:
+            return self._catalog
+        if self._catalog is not None and self._lock.locked():
+            # Another request is rebuilding; keep serving the current snapshot
+            return self._catalog
+        
+        async with self._lock:
+            if self._catalog is not None and time.monotonic() - self._checked_at < settings.catalog_version_check_interval:
+                return self._catalog
+            
+            version = await self._current_version()
+            if self._is_stale(version):
+                rows = await self._load_rows()
+                self._catalog = SpecialistCatalog(version, rows)
+                logger.info(f"Built specialist catalog v{version} with {len(rows)} rows")
+            self._checked_at = time.monotonic()
+            return self._catalog
+
+
+def is_specialist_key(key: str) -> bool:
+    return key.startswith("specialist:")
+
+
+async def bump_catalog_version() -> Optional[int]:
+    """Signal every process to rebuild its snapshot after a specialists write. None if Redis failed."""
+    return await redis_client.incr(CATALOG_VERSION_KEY)
+
+
+# Global catalog instance
+specialist_catalog = CatalogHolder()
+
+
+if __name__ == "__main__":
+    async def main() -> None:
+        try:
+            version = await bump_catalog_version()
+            print(f"Specialist catalog version: {version}" if version is not None else "Redis unreachable")
+        finally:
+            await redis_client.close()
+    
+    asyncio.run(main())
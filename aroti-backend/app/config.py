@@ -21,6 +21,18 @@ class Settings(BaseSettings):
     redis_port: int = int(os.getenv("REDIS_PORT", "6379"))
     redis_db: int = int(os.getenv("REDIS_DB", "0"))
     redis_password: Optional[str] = os.getenv("REDIS_PASSWORD")
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))  # per process
+    redis_pool_timeout: float = float(os.getenv("REDIS_POOL_TIMEOUT", "1"))  # wait for a free connection
+    redis_socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1"))
+    redis_socket_connect_timeout: float = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "1"))
+    redis_health_check_interval: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))  # seconds idle before PING
+    
+    # Redis circuit breaker: skip cache calls while Redis is unreachable
+    redis_breaker_failure_threshold: int = int(os.getenv("REDIS_BREAKER_FAILURE_THRESHOLD", "5"))  # consecutive errors to open
+    redis_breaker_window: float = float(os.getenv("REDIS_BREAKER_WINDOW", "10"))  # errors further apart do not add up
+    redis_breaker_reset_timeout: float = float(os.getenv("REDIS_BREAKER_RESET_TIMEOUT", "2"))  # seconds open before the first probe
+    redis_breaker_max_reset_timeout: float = float(os.getenv("REDIS_BREAKER_MAX_RESET_TIMEOUT", "30"))
+    redis_breaker_jitter: float = float(os.getenv("REDIS_BREAKER_JITTER", "0.2"))  # +/- fraction applied to probe delays
     
     # Keycloak
     keycloak_issuer_uri: str = os.getenv(
@@ -29,11 +41,33 @@ class Settings(BaseSettings):
     )
     keycloak_jwks_uri: Optional[str] = os.getenv("KEYCLOAK_JWKS_URI")
     keycloak_audience: str = os.getenv("KEYCLOAK_AUDIENCE", "aroti-app")
+    jwks_cache_ttl: int = int(os.getenv("JWKS_CACHE_TTL", "3600"))  # 1 hour
+    jwks_min_refresh_interval: int = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30"))  # unknown-kid refetch throttle
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # verified tokens kept in-process, 0 disables
     
     # API
     api_port: int = int(os.getenv("API_PORT", "8888"))
     api_host: str = os.getenv("API_HOST", "0.0.0.0")
     api_debug: bool = os.getenv("API_DEBUG", "false").lower() == "true"
+    log_format: str = os.getenv("LOG_FORMAT", "json")  # json (one object per line) or text
+    slow_request_ms: float = float(os.getenv("SLOW_REQUEST_MS", "500"))  # WARNING log + Server-Timing above this
+    slow_request_queries: int = int(os.getenv("SLOW_REQUEST_QUERIES", "25"))  # ... or at this many SQL statements
+    profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # fraction of requests profiled
+    profile_secret: str = os.getenv("PROFILE_SECRET", "")  # signs X-Debug-Profile headers; empty disables them
+    profile_dir: str = os.getenv("PROFILE_DIR", "/tmp/aroti-profiles")
+    profile_format: str = os.getenv("PROFILE_FORMAT", "collapsed")  # collapsed or speedscope
+    profile_interval_ms: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    profile_max_seconds: float = float(os.getenv("PROFILE_MAX_SECONDS", "30"))  # sampling stops after this
+    profile_max_concurrent: int = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+    profile_max_files: int = int(os.getenv("PROFILE_MAX_FILES", "200"))  # oldest profiles are deleted
+    tracing_enabled: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    trace_sample_rate: float = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))  # fraction of new traces kept
+    trace_service_name: str = os.getenv("TRACE_SERVICE_NAME", "aroti-backend")
+    trace_export_path: str = os.getenv("TRACE_EXPORT_PATH", "/tmp/aroti-traces.jsonl")  # OTLP/JSON lines; empty disables
+    trace_export_endpoint: str = os.getenv("TRACE_EXPORT_ENDPOINT", "")  # e.g. http://localhost:4318/v1/traces
+    trace_batch_size: int = int(os.getenv("TRACE_BATCH_SIZE", "512"))
+    trace_export_interval: float = float(os.getenv("TRACE_EXPORT_INTERVAL", "5"))  # seconds between partial batches
+    trace_max_queue: int = int(os.getenv("TRACE_MAX_QUEUE", "8192"))  # spans buffered before new ones are dropped
     
     # CORS
     cors_origins: list[str] = os.getenv(
@@ -49,10 +83,74 @@ class Settings(BaseSettings):
     temporal_port: int = int(os.getenv("TEMPORAL_PORT", "7233"))
     temporal_namespace: str = os.getenv("TEMPORAL_NAMESPACE", "default")
     
+    # Worker concurrency: task slots per worker and concurrent long-polls per queue
+    temporal_max_concurrent_activities: int = int(os.getenv("TEMPORAL_MAX_CONCURRENT_ACTIVITIES", "20"))
+    temporal_max_concurrent_workflow_tasks: int = int(os.getenv("TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASKS", "50"))
+    temporal_max_concurrent_activity_task_polls: int = int(os.getenv("TEMPORAL_MAX_CONCURRENT_ACTIVITY_TASK_POLLS", "5"))
+    temporal_max_concurrent_workflow_task_polls: int = int(os.getenv("TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASK_POLLS", "5"))
+    temporal_activity_threads: int = int(os.getenv("TEMPORAL_ACTIVITY_THREADS", "0"))  # 0 = one per activity slot
+    temporal_stats_interval: int = int(os.getenv("TEMPORAL_STATS_INTERVAL", "60"))  # seconds between stats logs, 0 = off
+    
+    # "inline" books inside the request; "workflow" starts SessionBookingWorkflow and returns 202
+    booking_mode: str = os.getenv("BOOKING_MODE", "inline")
+    
+    # Pagination
+    page_size_default: int = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    page_size_max: int = int(os.getenv("PAGE_SIZE_MAX", "100"))
+    
     # Cache TTLs (in seconds)
     cache_ttl_specialists: int = int(os.getenv("CACHE_TTL_SPECIALISTS", "1800"))  # 30 min
     cache_ttl_specialist_detail: int = int(os.getenv("CACHE_TTL_SPECIALIST_DETAIL", "3600"))  # 1 hour
     
+    # In-process L1 cache in front of Redis: "namespace:ttl" pairs that opt in
+    cache_l1_namespaces: str = os.getenv("CACHE_L1_NAMESPACES", "specialist:60,profile:60,user_timezone:60")
+    cache_l1_max_entries: int = int(os.getenv("CACHE_L1_MAX_ENTRIES", "2048"))
+    cache_invalidation_channel: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+    cache_scan_count: int = int(os.getenv("CACHE_SCAN_COUNT", "500"))  # SCAN batch for pattern invalidation
+    cache_serializer: str = os.getenv("CACHE_SERIALIZER", "msgpack")  # msgpack or json (orjson)
+    cache_compression: str = os.getenv("CACHE_COMPRESSION", "zstd")  # zstd, lz4, zlib or none
+    cache_compression_threshold: int = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))  # bytes
+    
+    # Stampede protection: cross-pod load lock and how long followers wait for the leader
+    cache_lock_ttl_ms: int = int(os.getenv("CACHE_LOCK_TTL_MS", "5000"))
+    cache_lock_wait_ms: int = int(os.getenv("CACHE_LOCK_WAIT_MS", "2000"))
+    cache_stale_ttl: int = int(os.getenv("CACHE_STALE_TTL", "300"))  # serve stale while refreshing
+    
+    # Outbox relay delivering post-commit side effects
+    outbox_relay_enabled: bool = os.getenv("OUTBOX_RELAY_ENABLED", "true").lower() == "true"
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+    outbox_poll_interval: float = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))  # seconds, when idle
+    outbox_max_backoff: int = int(os.getenv("OUTBOX_MAX_BACKOFF", "300"))  # seconds between failed attempts
+    outbox_lease_seconds: int = int(os.getenv("OUTBOX_LEASE_SECONDS", "60"))  # claimed rows reappear after this
+    outbox_delivery_timeout: float = float(os.getenv("OUTBOX_DELIVERY_TIMEOUT", "10"))  # per event; below the lease
+    
+    # Delayed-job scheduler (session reminders) on Redis sorted sets
+    scheduler_bucket_seconds: int = int(os.getenv("SCHEDULER_BUCKET_SECONDS", "60"))  # width of one due-time shard
+    scheduler_batch_size: int = int(os.getenv("SCHEDULER_BATCH_SIZE", "500"))  # jobs claimed per Lua call
+    scheduler_lease_ms: int = int(os.getenv("SCHEDULER_LEASE_MS", "60000"))  # claimed jobs reappear after this
+    scheduler_poll_interval: float = float(os.getenv("SCHEDULER_POLL_INTERVAL", "0.5"))  # idle sleep between claims
+    scheduler_max_attempts: int = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "5"))
+    scheduler_backoff_base: float = float(os.getenv("SCHEDULER_BACKOFF_BASE", "5"))  # seconds, doubled per attempt
+    scheduler_backoff_max: float = float(os.getenv("SCHEDULER_BACKOFF_MAX", "600"))
+    reminder_lead_time: int = int(os.getenv("REMINDER_LEAD_TIME", "86400"))  # seconds before the session
+    insights_warmup_lead: int = int(os.getenv("INSIGHTS_WARMUP_LEAD", "900"))  # seconds before local midnight
+    insights_warmup_batch: int = int(os.getenv("INSIGHTS_WARMUP_BATCH", "5000"))  # users per page
+    insights_timezone_ttl: int = int(os.getenv("INSIGHTS_TIMEZONE_TTL", "86400"))  # cached user timezone
+    numerology_batch_max: int = int(os.getenv("NUMEROLOGY_BATCH_MAX", "10000"))  # birth dates per batch request
+    
+    # Notifications (session reminders) by email; without SMTP_HOST they are only logged
+    smtp_host: str = os.getenv("SMTP_HOST", "")
+    smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
+    smtp_username: str = os.getenv("SMTP_USERNAME", "")
+    smtp_password: str = os.getenv("SMTP_PASSWORD", "")
+    smtp_from: str = os.getenv("SMTP_FROM", "Aroti <no-reply@aroti.app>")
+    smtp_starttls: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    smtp_timeout: float = float(os.getenv("SMTP_TIMEOUT", "10"))  # seconds per connection
+    
+    # In-process specialist catalog snapshot
+    catalog_version_check_interval: float = float(os.getenv("CATALOG_VERSION_CHECK_INTERVAL", "2"))
+    catalog_max_age: int = int(os.getenv("CATALOG_MAX_AGE", "300"))  # rebuild age when no version is published
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,29 +1,140 @@
 """
 SQLAlchemy database setup and session management.
 """
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import AsyncGenerator, Generator, Union
 
 from app.config import settings
+from app.observability.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_WAIT,
+    registry
+)
+from app.observability.queries import record_query
+from app.observability.tracing import CLIENT, tracer
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Map a synchronous database URL onto its asyncio driver.
+    postgresql:// and postgresql+psycopg2:// become postgresql+asyncpg://,
+    sqlite:// becomes sqlite+aiosqlite://. Anything else is returned unchanged.
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+class _TimedCheckout:
+    """Records how long each checkout waits for (or opens) a pooled connection."""
+    engine_label = ""
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
 
 # Create database engine
 engine = create_engine(
     settings.database_url,
+    poolclass=TimedQueuePool,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
     echo=settings.api_debug
 )
 
-# Create session factory
+# Create async database engine (asyncpg) used by the API routers
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    poolclass=TimedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+    echo=settings.api_debug
+)
+
+def instrument_engine(target: Union[Engine, AsyncEngine]) -> None:
+    """
+    Time every statement and attribute it to the current request (see app/observability/queries.py),
+    and trace it as a child of the current span.
+    """
+    sync_engine = target.sync_engine if isinstance(target, AsyncEngine) else target
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        # The execution context lives exactly as long as this statement
+        context._query_started_at = time.perf_counter()
+        context._query_span = tracer.start_span(
+            f"db {statement.split(None, 1)[0].upper() if statement.strip() else 'statement'}",
+            CLIENT,
+            {"db.system": conn.dialect.name, "db.statement": statement[:2000]},
+            require_parent=True
+        )
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        record_query(statement, time.perf_counter() - context._query_started_at)
+        context._query_span.end()
+    
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(exception_context):
+        span = getattr(exception_context.execution_context, "_query_span", None)
+        if span is not None:
+            span.set_error(exception_context.original_exception)
+            span.end()
+
+
+instrument_engine(engine)
+instrument_engine(async_engine)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
 
 
+def _collect_pool_metrics() -> None:
+    """Refresh pool gauges before a scrape."""
+    for label, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        DB_POOL_SIZE.labels(label).set(pool.size())
+        DB_POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+        # overflow() counts down from -pool_size until the pool is full
+        DB_POOL_OVERFLOW.labels(label).set(max(0, pool.overflow()))
+
+
+registry.add_collector(_collect_pool_metrics)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency for FastAPI routes to get database session.
@@ -34,3 +145,13 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for FastAPI routes to get an async database session.
+    Queries are awaited, so a slow Postgres round trip no longer
+    blocks the event loop for other requests on the same worker.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
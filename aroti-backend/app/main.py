@@ -2,7 +2,6 @@
 FastAPI application entry point.
 """
 import logging
-import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,15 +9,19 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, async_engine, Base
 from app.cache.redis_client import redis_client
-from app.api import specialists, sessions, profile, daily_insights, health
+from app.auth.keycloak import validator
+from app.workflows.client import temporal_client
+from app.services.outbox import outbox_relay
+from app.services.notifications import build_notifier, set_notifier
+from app.observability.logs import configure_logging
+from app.observability.middleware import MetricsMiddleware, RequestContextMiddleware, TracingMiddleware
+from app.observability.profiling import ProfilingMiddleware
+from app.api import specialists, sessions, profile, daily_insights, numerology, health
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if settings.api_debug else logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (queued; written as JSON by a background thread)
+configure_logging(logging.DEBUG if settings.api_debug else logging.INFO, settings.log_format)
 logger = logging.getLogger(__name__)
 
 
@@ -45,14 +48,29 @@ async def lifespan(app: FastAPI):
     try:
         await redis_client.ping()
         logger.info("Redis connection successful")
+        await redis_client.start_invalidation_listener()
     except Exception as e:
         logger.warning(f"Redis connection failed: {e}")
     
+    # Prefetch Keycloak signing keys and start background rotation
+    await validator.start()
+    
+    # Email notifications when SMTP is configured, otherwise logged
+    set_notifier(build_notifier())
+    
+    # Deliver post-commit side effects (cache deletes, workflow starts, reminders)
+    if settings.outbox_relay_enabled:
+        await outbox_relay.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Aroti Backend API...")
+    await outbox_relay.close()
     await redis_client.close()
+    await validator.close()
+    await temporal_client.close()
+    await async_engine.dispose()
 
 
 # Create FastAPI app
@@ -72,44 +90,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request metrics for /metrics
+app.add_middleware(MetricsMiddleware)
 
-# Request ID middleware for logging
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    """Add request ID to each request for tracing."""
-    import uuid
-    request_id = str(uuid.uuid4())[:8]
-    request.state.request_id = request_id
-    
-    start_time = time.time()
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log request
-    process_time = time.time() - start_time
-    logger.info(
-        f"[{request_id}] {request.method} {request.url.path} - "
-        f"{response.status_code} - {process_time:.3f}s"
-    )
-    
-    # Add request ID to response header
-    response.headers["X-Request-ID"] = request_id
-    
-    return response
+# Sampled or header-triggered request profiles (inside the request ID middleware)
+app.add_middleware(ProfilingMiddleware)
+
+# Server span per request (inside the request ID middleware)
+app.add_middleware(TracingMiddleware)
+
+
+# Request ID and access log (outermost, so the ID covers everything below)
+app.add_middleware(RequestContextMiddleware)
 
 
 # Exception handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    request_id = getattr(request.state, "request_id", None)
+    logger.error(f"Unhandled exception: {exc}", exc_info=True, extra={"request_id": request_id})
+    # Runs outside the middleware stack, so the request ID header is set here
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
-            "request_id": getattr(request.state, "request_id", None)
-        }
+            "request_id": request_id
+        },
+        headers={"X-Request-ID": request_id} if request_id else None
     )
 
 
@@ -119,6 +127,7 @@ app.include_router(specialists.router, prefix="/api", tags=["Specialists"])
 app.include_router(sessions.router, prefix="/api", tags=["Sessions"])
 app.include_router(profile.router, prefix="/api", tags=["Profile"])
 app.include_router(daily_insights.router, prefix="/api", tags=["Daily Insights"])
+app.include_router(numerology.router, prefix="/api", tags=["Numerology"])
 
 
 if __name__ == "__main__":
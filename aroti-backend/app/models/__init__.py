@@ -4,5 +4,6 @@ from app.models.session import Session
 from app.models.review import Review
 from app.models.user import User
 from app.models.profile import UserProfile
+from app.models.outbox import OutboxEvent
 
-__all__ = ["Specialist", "Session", "Review", "User", "UserProfile"]
+__all__ = ["Specialist", "Session", "Review", "User", "UserProfile", "OutboxEvent"]
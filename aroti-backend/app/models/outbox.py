@@ -0,0 +1,28 @@
+"""
+Outbox of side effects committed with the request's own transaction.
+Rows are delivered (and deleted) by the relay in app/services/outbox.py.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, JSON, String, Text
+from datetime import datetime
+
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # "cache.delete", "workflow.start", "reminder.schedule", "reminder.cancel"
+    key = Column(String)  # Entity the event belongs to, e.g. the booking ID of a workflow start
+    payload = Column(JSON, nullable=False)
+    traceparent = Column(String)  # Trace of the request that enqueued it; delivery continues that trace
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Next delivery attempt
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Relay scans due rows in id order; status lookups go by key (migration 006)
+    __table_args__ = (
+        Index("ix_outbox_events_available_at_id", "available_at", "id"),
+        Index("ix_outbox_events_key", "key"),
+    )
@@ -1,7 +1,7 @@
 """
 Review model matching iOS BookingModels.Review
 """
-from sqlalchemy import Column, String, Integer, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -19,3 +19,8 @@ class Review(Base):
     
     # Relationships
     specialist = relationship("Specialist", back_populates="reviews")
+    
+    # Keyset pagination: newest first per specialist (migration 004)
+    __table_args__ = (
+        Index("ix_reviews_specialist_date_id", "specialist_id", "date", "id"),
+    )
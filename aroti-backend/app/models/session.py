@@ -1,7 +1,7 @@
 """
 Session model matching iOS BookingModels.Session
 """
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -29,3 +29,14 @@ class Session(Base):
     
     # Relationships
     specialist = relationship("Specialist", back_populates="sessions")
+    
+    # One active booking per slot (005) and per-user keyset pagination (004)
+    __table_args__ = (
+        Index(
+            "uq_sessions_active_slot", "specialist_id", "date", "time",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'upcoming')"),
+            sqlite_where=text("status IN ('pending', 'upcoming')")
+        ),
+        Index("ix_sessions_user_date_time_id", "user_id", "date", "time", "id"),
+    )
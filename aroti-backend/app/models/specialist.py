@@ -1,7 +1,7 @@
 """
 Specialist model matching iOS BookingModels.Specialist
 """
-from sqlalchemy import Column, String, Float, Integer, Boolean, Text, ARRAY
+from sqlalchemy import Column, String, Float, Integer, Boolean, Text, ARRAY, Index, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -30,3 +30,11 @@ class Specialist(Base):
     # Relationships
     reviews = relationship("Review", back_populates="specialist", cascade="all, delete-orphan")
     sessions = relationship("Session", back_populates="specialist", cascade="all, delete-orphan")
+    
+    # Indexes matching the GET /api/specialists filters (migration 003)
+    __table_args__ = (
+        Index("ix_specialists_languages_gin", "languages", postgresql_using="gin"),
+        Index("ix_specialists_categories_gin", "categories", postgresql_using="gin"),
+        Index("ix_specialists_available_price_rating", "price", "rating", postgresql_where=text("available")),
+        Index("ix_specialists_rating_price", "rating", "price"),
+    )
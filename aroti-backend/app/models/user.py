@@ -1,7 +1,7 @@
 """
 User model for storing user profile data matching iOS HomeModels.UserData
 """
-from sqlalchemy import Column, String, Boolean, ARRAY, Date, DateTime
+from sqlalchemy import Column, String, Boolean, ARRAY, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -19,10 +19,20 @@ class User(Base):
     birth_date = Column(Date)
     birth_time = Column(DateTime)  # Store as datetime for time component
     birth_location = Column(String)
+    timezone = Column(String, nullable=False, default="UTC", server_default="UTC")  # IANA name, e.g. "Europe/Berlin"
     traits = Column(ARRAY(String), default=[])
     is_premium = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    sessions = relationship("Session", foreign_keys="Session.user_id", viewonly=True)
+    sessions = relationship(
+        "Session",
+        primaryjoin="User.id == foreign(Session.user_id)",
+        viewonly=True
+    )
+    
+    # Insights warm-up: one timezone at a time, paged by ID (migration 008)
+    __table_args__ = (
+        Index("ix_users_timezone_id", "timezone", "id"),
+    )
@@ -0,0 +1,3 @@
+"""
+Metrics and request instrumentation.
+"""
@@ -0,0 +1,122 @@
+"""
+Structured logging off the request path.
+
+Loggers hand records to a QueueHandler, which only snapshots the record into
+an in-memory queue; a QueueListener thread formats them as JSON lines and
+writes them to stderr. The current request ID is attached to every record
+logged while a request is being served.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+# Set by RequestContextMiddleware for the duration of a request
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the request ID of the context they were logged from."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # An explicit extra={"request_id": ...} wins over the context
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request ID and extra fields."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    Enqueues a snapshot of the record without formatting it.
+    The message is rendered now (its args may change later); the traceback is
+    rendered only when there is one, and the JSON encoding happens on the listener.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _Listener(QueueListener):
+    """QueueListener whose stop() may be called more than once."""
+    
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+
+# Listener started by the last configure_logging call
+_listener: Optional[_Listener] = None
+
+
+def configure_logging(level: int, fmt: str = "json", stream: Optional[IO[str]] = None) -> QueueListener:
+    """
+    Route all logging through a queue and start the listener that writes it out.
+    The listener is flushed at interpreter exit; calling this again replaces it.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _RecordQueueHandler(records)
+    handler.addFilter(RequestIdFilter())
+    
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    
+    _listener = _Listener(records, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def _flush() -> None:
+    """Write out records still queued when the process exits."""
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,98 @@
+"""
+Prometheus metrics, exposed with prometheus_client.
+
+The metrics live in this module's own CollectorRegistry rather than the
+client's global default, so tests can build throwaway ones. Components that
+expose pull-style stats (DB pools, Redis breaker state, L1 cache) register a
+collector that refreshes their gauges right before each scrape; counters are
+incremented where the event happens. Label values must come from bounded sets
+(route templates, key namespaces).
+"""
+import logging
+from typing import Callable, List
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+logger = logging.getLogger(__name__)
+
+# Text exposition format 0.0.4
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; the Prometheus client defaults
+DEFAULT_BUCKETS = Histogram.DEFAULT_BUCKETS
+# Seconds; for sub-millisecond operations such as cache calls and JWT checks
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Registry:
+    """A CollectorRegistry plus the collectors that refresh pull-style gauges before a scrape."""
+    
+    def __init__(self):
+        self.collector_registry = CollectorRegistry()
+        self._collectors: List[Callable[[], None]] = []
+    
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run collector before every scrape."""
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"Metrics collector {collector.__qualname__} failed: {e}")
+        return generate_latest(self.collector_registry).decode("utf-8")
+
+
+# Global registry instance
+registry = Registry()
+REGISTRY = registry.collector_registry
+
+# HTTP (labelled by route template, never the raw path)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"),
+    registry=REGISTRY
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+    registry=REGISTRY
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method", "route"), registry=REGISTRY
+)
+
+# SQLAlchemy connection pools
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ("engine",), registry=REGISTRY)
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out of the pool", ("engine",), registry=REGISTRY)
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size", ("engine",), registry=REGISTRY)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",),
+    registry=REGISTRY, buckets=FAST_BUCKETS
+)
+
+# Redis cache
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by key namespace and result (hit, l1_hit, miss)", ("namespace", "result"),
+    registry=REGISTRY
+)
+CACHE_OPERATION_DURATION = Histogram(
+    "cache_operation_duration_seconds", "Redis round-trip latency by operation and key namespace",
+    ("operation", "namespace"), registry=REGISTRY, buckets=FAST_BUCKETS
+)
+CACHE_ERRORS = Counter("cache_errors_total", "Failed Redis operations", ("operation", "namespace"), registry=REGISTRY)
+CACHE_L1_ENTRIES = Gauge("cache_l1_entries", "Entries in the in-process L1 cache", registry=REGISTRY)
+REDIS_CIRCUIT_STATE = Gauge(
+    "redis_circuit_state", "1 for the current Redis circuit breaker state", ("state",), registry=REGISTRY
+)
+# Incremented when the event happens, so they only ever go up
+REDIS_CIRCUIT_TRIPS = Counter("redis_circuit_trips_total", "Times the Redis circuit has opened", registry=REGISTRY)
+REDIS_CIRCUIT_SKIPPED = Counter(
+    "redis_circuit_skipped_total", "Redis calls skipped while the circuit was open", registry=REGISTRY
+)
+
+# JWT validation
+JWT_VALIDATION_DURATION = Histogram(
+    "jwt_validation_duration_seconds", "Bearer token validation time by outcome (cached, verified, rejected)",
+    ("result",), registry=REGISTRY, buckets=FAST_BUCKETS
+)
+JWKS_REFRESHES = Counter("jwks_refresh_total", "JWKS fetches by outcome", ("result",), registry=REGISTRY)
@@ -0,0 +1,197 @@
+"""
+Pure ASGI middleware: request IDs and access logs, route spans, and per-route request metrics.
+"""
+import logging
+import re
+import time
+import uuid
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.observability.logs import request_id_var
+from app.observability.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, HTTP_REQUESTS
+from app.observability.queries import QueryStats, query_stats_var
+from app.observability.tracing import SERVER, SpanContext, tracer
+
+logger = logging.getLogger("app.access")
+
+UNMATCHED = "unmatched"
+REQUEST_ID_HEADER = b"x-request-id"
+TRACEPARENT_HEADER = b"traceparent"
+# Upstream IDs are trusted only if they are short and cannot break a log line or header
+_VALID_REQUEST_ID = re.compile(rb"[A-Za-z0-9._:-]{1,128}")
+
+
+def incoming_request_id(scope: Scope) -> str:
+    """X-Request-ID from the ingress or caller if well-formed, otherwise a new one."""
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            if _VALID_REQUEST_ID.fullmatch(value):
+                return value.decode("ascii")
+            break
+    return uuid.uuid4().hex[:16]
+
+
+def is_slow(duration_ms: float, stats: QueryStats) -> bool:
+    return duration_ms >= settings.slow_request_ms or stats.count >= settings.slow_request_queries
+
+
+def server_timing(duration_ms: float, stats: QueryStats) -> bytes:
+    """Server-Timing value, e.g. db;dur=12.5;desc="4 queries", app;dur=40.1."""
+    db_ms = stats.total_seconds * 1000
+    return (
+        f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={duration_ms:.1f}'
+    ).encode("ascii")
+
+
+class RequestContextMiddleware:
+    """
+    Assigns the request ID (request.state.request_id, the logging context and the
+    X-Request-ID response header), collects the request's SQL statistics and writes
+    one access log line per request. Slow or query-heavy requests are logged at
+    WARNING with their slowest and most repeated statements, and get a Server-Timing header.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = incoming_request_id(scope)
+        stats = QueryStats()
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["query_stats"] = stats
+        request_token = request_id_var.set(request_id)
+        stats_token = query_stats_var.set(stats)
+        header = request_id.encode("ascii")
+        status_code = 500
+        start = time.perf_counter()
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != REQUEST_ID_HEADER]
+                headers.append((REQUEST_ID_HEADER, header))
+                # The handler has finished its queries by the time headers go out
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if is_slow(elapsed_ms, stats):
+                    headers.append((b"server-timing", server_timing(elapsed_ms, stats)))
+                message["headers"] = headers
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            fields = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": duration_ms,
+                "db_queries": stats.count,
+                "db_ms": round(stats.total_seconds * 1000, 2)
+            }
+            if is_slow(duration_ms, stats):
+                logger.warning(
+                    f"Slow request {scope['method']} {scope['path']} {status_code}",
+                    extra={**fields, **stats.summary()}
+                )
+            else:
+                logger.info(f"{scope['method']} {scope['path']} {status_code}", extra=fields)
+            query_stats_var.reset(stats_token)
+            request_id_var.reset(request_token)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that will handle the request, e.g. /api/sessions/{session_id}.
+    Raw paths are never used as labels, so cardinality stays bounded by the route table.
+    """
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            # Path matches but the method does not (405)
+            partial = route.path
+    return partial or UNMATCHED
+
+
+class MetricsMiddleware:
+    """Pure ASGI, so streaming responses are not buffered and no task is spawned per request."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        in_flight = HTTP_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+class TracingMiddleware:
+    """
+    Opens the server span of each request, continuing the caller's trace when it sends
+    a traceparent header. Must sit inside RequestContextMiddleware for the request ID.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.tracing_enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        parent = None
+        for name, value in scope["headers"]:
+            if name == TRACEPARENT_HEADER:
+                parent = SpanContext.from_traceparent(value.decode("latin-1"))
+                break
+        
+        method = scope["method"]
+        route = route_template(scope)
+        attributes = {
+            "http.request.method": method,
+            "http.route": route,
+            "url.path": scope["path"],
+            "request_id": scope.get("state", {}).get("request_id"),
+        }
+        
+        with tracer.span(f"{method} {route}", SERVER, attributes, parent) as span:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_error(f"HTTP {message['status']}")
+                await send(message)
+            
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,264 @@
+"""
+Sampled request profiling.
+
+A request is profiled when it carries a valid signed X-Debug-Profile header or
+falls inside PROFILE_SAMPLE_RATE. A sampler thread then records the request's
+stack every PROFILE_INTERVAL_MS. When the request is running on the event loop,
+the sample is its live stack. When it is suspended, the sample is its await chain,
+ending in "(awaiting)". The result is a wall-clock profile of that request only,
+even with other requests running on the same loop.
+
+The profile is written to PROFILE_DIR/<profile_id>.collapsed (flamegraph.pl,
+speedscope) or <profile_id>.speedscope.json. The profile ID is generated here,
+never taken from the client; the request ID is kept in the profile name and
+the log line.
+
+Overhead is bounded:
+- nothing runs for requests that are not profiled
+- at most PROFILE_MAX_CONCURRENT requests are profiled at once
+- sampling stops after PROFILE_MAX_SECONDS
+- only the newest PROFILE_MAX_FILES profiles are kept
+
+Sign a header value with:
+    python -m app.observability.profiling [ttl_seconds]
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-debug-profile"
+AWAITING = "(awaiting)"
+
+Stack = Tuple[str, ...]
+
+
+def sign_profile_token(ttl_seconds: int = 300, secret: Optional[str] = None) -> str:
+    """X-Debug-Profile value valid for ttl_seconds: <expires>.<hmac-sha256 hex>."""
+    expires = str(int(time.time()) + ttl_seconds)
+    key = (secret or settings.profile_secret).encode()
+    return f"{expires}.{hmac.new(key, expires.encode(), hashlib.sha256).hexdigest()}"
+
+
+def verify_profile_token(token: str, secret: Optional[str] = None) -> bool:
+    """True if the token was signed with the profiling secret and has not expired."""
+    secret = secret or settings.profile_secret
+    if not secret:
+        return False
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _running_stack(leaf, root_frame) -> Optional[Stack]:
+    """Frames from the request's root coroutine down to leaf, or None if the request is not on this stack."""
+    labels = []
+    frame = leaf
+    while frame is not None:
+        if frame is root_frame:
+            labels.append(_label(frame))
+            return tuple(reversed(labels))
+        labels.append(_label(frame))
+        frame = frame.f_back
+    return None
+
+
+def _awaiting_stack(coro) -> Stack:
+    """The await chain of a suspended coroutine, outermost first."""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    labels.append(AWAITING)
+    return tuple(labels)
+
+
+class Sampler(threading.Thread):
+    """Samples one request's stack until stop() or the time limit, then writes the profile."""
+    
+    def __init__(self, coro, loop_thread_id: int, path: str, name: str):
+        super().__init__(name=f"profiler-{name}", daemon=True)
+        self.coro = coro
+        self.loop_thread_id = loop_thread_id
+        self.path = path
+        self.profile_name = name
+        self.interval = settings.profile_interval_ms / 1000
+        self.samples: "Counter[Stack]" = Counter()
+        self._stopped = threading.Event()
+    
+    def stop(self) -> None:
+        self._stopped.set()
+    
+    def sample(self) -> None:
+        root_frame = self.coro.cr_frame
+        if root_frame is None:
+            # Coroutine finished
+            return
+        leaf = sys._current_frames().get(self.loop_thread_id)
+        stack = _running_stack(leaf, root_frame)
+        if stack is None:
+            stack = _awaiting_stack(self.coro)
+        self.samples[stack] += 1
+    
+    def run(self) -> None:
+        start = time.monotonic()
+        deadline = start + settings.profile_max_seconds
+        while not self._stopped.wait(self.interval) and time.monotonic() < deadline:
+            try:
+                self.sample()
+            except Exception:
+                # The loop thread moves on while we walk its frames; drop that sample
+                continue
+        # Wake-ups run late under GIL contention, so weigh samples by the measured spacing
+        count = sum(self.samples.values())
+        interval = (time.monotonic() - start) / count if count else self.interval
+        try:
+            write_profile(self.path, self.samples, interval, self.profile_name)
+            prune_profiles(os.path.dirname(self.path), settings.profile_max_files)
+            logger.info(f"Wrote profile {self.path} for {self.profile_name} ({count} samples)")
+        except Exception as e:
+            logger.error(f"Failed to write profile {self.path}: {e}")
+
+
+def collapsed(samples: "Counter[Stack]") -> str:
+    """Brendan Gregg's collapsed-stack format: frame;frame;frame count."""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in samples.most_common())
+
+
+def speedscope(samples: "Counter[Stack]", interval: float, name: str) -> dict:
+    """speedscope sampled profile; identical stacks are merged and weighted by duration."""
+    frames: List[dict] = []
+    index = {}
+    stacks, weights = [], []
+    for stack, count in samples.most_common():
+        ids = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            ids.append(index[label])
+        stacks.append(ids)
+        weights.append(count * interval)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": stacks,
+            "weights": weights,
+        }],
+        "name": name,
+        "exporter": "aroti-backend",
+    }
+
+
+def new_profile_id() -> str:
+    """Unique, time-ordered file stem for a profile."""
+    return f"{time.time_ns():x}-{secrets.token_hex(4)}"
+
+
+def profile_path(directory: str, profile_id: str) -> str:
+    suffix = ".speedscope.json" if settings.profile_format == "speedscope" else ".collapsed"
+    return os.path.join(directory, profile_id + suffix)
+
+
+def write_profile(path: str, samples: "Counter[Stack]", interval: float, name: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if path.endswith(".json"):
+        content = json.dumps(speedscope(samples, interval, name))
+    else:
+        content = collapsed(samples)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def prune_profiles(directory: str, keep: int) -> None:
+    """Delete all but the newest keep profiles."""
+    entries = [e for e in os.scandir(directory) if e.is_file() and not e.name.endswith(".tmp")]
+    if len(entries) <= keep:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    Profiles signed or sampled requests. Must sit inside RequestContextMiddleware,
+    which provides the request ID recorded in the profile name.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.active = 0
+    
+    def should_profile(self, scope: Scope) -> bool:
+        if self.active >= settings.profile_max_concurrent:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                if verify_profile_token(value.decode("latin-1")):
+                    return True
+                break
+        return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = scope.get("state", {}).get("request_id", "-")
+        path = profile_path(settings.profile_dir, new_profile_id())
+        name = f"{scope['method']} {scope['path']} [{request_id}]"
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile", os.path.basename(path).encode())]
+            await send(message)
+        
+        coro: Any = self.app(scope, receive, send_wrapper)
+        sampler = Sampler(coro, threading.get_ident(), path, name)
+        self.active += 1
+        sampler.start()
+        try:
+            await coro
+        finally:
+            sampler.stop()
+            self.active -= 1
+
+
+if __name__ == "__main__":
+    print(sign_profile_token(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
@@ -0,0 +1,98 @@
+"""
+Per-request SQL statistics.
+
+app/database.py hooks engine events that call record_query(); statements are
+added to the QueryStats of the current request (set by RequestContextMiddleware)
+and to any query_budget() blocks that are open, which is how tests assert that
+a handler stays within its query budget.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+# Set by RequestContextMiddleware for the duration of a request
+query_stats_var: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+# Open query_budget() blocks; empty outside tests
+_budgets: List["QueryStats"] = []
+_budgets_lock = threading.Lock()
+
+
+@dataclass
+class QueryStats:
+    """Count, total time and outliers of the statements run for one request."""
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    # Executions per statement text; one text repeated many times is the N+1 signature
+    repeats: Dict[str, int] = field(default_factory=dict)
+    
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.repeats[statement] = self.repeats.get(statement, 0) + 1
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+    
+    def most_repeated(self) -> Optional[str]:
+        return max(self.repeats, key=self.repeats.get) if self.repeats else None
+    
+    def summary(self) -> Dict:
+        """Fields for the slow-request log line."""
+        most_repeated = self.most_repeated()
+        return {
+            "db_queries": self.count,
+            "db_ms": round(self.total_seconds * 1000, 2),
+            "db_slowest_ms": round(self.slowest_seconds * 1000, 2),
+            "db_slowest_statement": _shorten(self.slowest_statement),
+            "db_max_repeats": self.repeats[most_repeated] if most_repeated else 0,
+            "db_most_repeated_statement": _shorten(most_repeated),
+        }
+
+
+def _shorten(statement: Optional[str], limit: int = 300) -> Optional[str]:
+    if statement is None:
+        return None
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """Attribute one executed statement to the current request and any open budgets."""
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    if _budgets:
+        with _budgets_lock:
+            for budget in _budgets:
+                budget.record(statement, seconds)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A block ran more statements than its budget allows."""
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Test helper: fail if more than max_queries statements run inside the block.
+    Counts statements from every thread, so requests made through TestClient are included.
+        
+        with query_budget(2):
+            client.get("/api/sessions")
+    """
+    stats = QueryStats()
+    with _budgets_lock:
+        _budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        with _budgets_lock:
+            _budgets.remove(stats)
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {count}x {_shorten(text)}" for text, count in stats.repeats.items())
+        raise QueryBudgetExceeded(f"{stats.count} queries run, budget is {max_queries}:\n{statements}")
@@ -0,0 +1,288 @@
+"""
+Span tracing with W3C trace context and batched OTLP/JSON export.
+
+Spans are opened around routes (TracingMiddleware), token verification, Redis
+calls, SQL statements, outbox deliveries and Temporal workflow starts and
+activities. The current span lives in a ContextVar, so children pick up their
+parent across awaits, greenlets and activity threads. Trace context crosses
+processes as a traceparent header (HTTP, outbox rows, Temporal headers).
+
+Finished spans are buffered in memory. A background thread writes them in
+batches as OTLP/JSON lines (the format the OpenTelemetry collector's file
+exporter writes and its otlpjsonfile receiver reads), and can also POST them
+to an OTLP/HTTP endpoint such as a local collector.
+"""
+import atexit
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = 1, 2, 3, 4, 5
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies a span across process boundaries."""
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+    
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+    
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional["SpanContext"]:
+        """Parse a W3C traceparent; None if missing or malformed."""
+        match = _TRACEPARENT.fullmatch(value.strip().lower()) if value else None
+        if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+            return None
+        return cls(match.group(1), match.group(2), int(match.group(3), 16) & 1 == 1)
+
+
+class Span:
+    """A timed operation. Ended spans are handed to the exporter if their trace is sampled."""
+    
+    __slots__ = ("name", "context", "parent_id", "kind", "attributes", "start_ns", "end_ns", "error", "_tracer")
+    
+    def __init__(self, tracer: "Tracer", name: str, context: SpanContext, parent_id: Optional[str], kind: int,
+                 attributes: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def set_error(self, error: Any) -> None:
+        self.error = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+    
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if self.context.sampled:
+                self._tracer.exporter.export(self)
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled, so call sites need no checks."""
+    
+    context = None
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+    
+    def set_error(self, error: Any) -> None:
+        pass
+    
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# Innermost open span of the current task / thread
+current_span_var: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def otlp_span(span: Span) -> Dict[str, Any]:
+    """A span in OTLP/JSON encoding."""
+    encoded = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(k, v) for k, v in span.attributes.items() if v is not None],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+class BatchExporter:
+    """
+    Buffers ended spans and writes them in batches from a background thread.
+    The buffer is bounded; spans beyond it are dropped and counted rather than
+    slowing down requests.
+    """
+    
+    def __init__(self):
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.service_name = settings.trace_service_name
+    
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) >= settings.trace_max_queue:
+                self.dropped += 1
+                return
+            self._spans.append(span)
+            if len(self._spans) >= settings.trace_batch_size:
+                self._ready.notify()
+        if self._thread is None:
+            self._start()
+    
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if len(self._spans) < settings.trace_batch_size:
+                    self._ready.wait(settings.trace_export_interval)
+            self.flush()
+    
+    def _take(self) -> List[Span]:
+        with self._lock:
+            batch = self._spans[:settings.trace_batch_size]
+            del self._spans[:settings.trace_batch_size]
+            return batch
+    
+    def flush(self) -> None:
+        """Write out every buffered span."""
+        batch = self._take()
+        while batch:
+            self._write(batch)
+            batch = self._take()
+    
+    def _write(self, batch: List[Span]) -> None:
+        body = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    _attribute("service.name", self.service_name),
+                    _attribute("process.pid", os.getpid()),
+                ]},
+                "scopeSpans": [{"scope": {"name": "aroti"}, "spans": [otlp_span(span) for span in batch]}],
+            }]
+        })
+        if settings.trace_export_path:
+            try:
+                with open(settings.trace_export_path, "a") as f:
+                    f.write(body + "\n")
+            except OSError as e:
+                logger.warning(f"Failed to write {len(batch)} spans to {settings.trace_export_path}: {e}")
+        if settings.trace_export_endpoint:
+            request = urllib.request.Request(
+                settings.trace_export_endpoint, body.encode(), {"Content-Type": "application/json"}
+            )
+            try:
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.warning(f"Failed to send {len(batch)} spans to {settings.trace_export_endpoint}: {e}")
+
+
+class Tracer:
+    """Creates spans; a no-op while TRACING_ENABLED is off."""
+    
+    def __init__(self, exporter: Optional[BatchExporter] = None):
+        self.exporter = exporter or BatchExporter()
+    
+    def start_span(
+        self,
+        name: str,
+        kind: int = INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+        require_parent: bool = False
+    ):
+        """
+        Start a span under parent, or under the current span if no parent is given.
+        Client spans pass require_parent so background polling does not start traces of its own.
+        The span is not made current; use span() for that.
+        """
+        if not settings.tracing_enabled:
+            return NOOP_SPAN
+        if parent is None:
+            current = current_span_var.get()
+            parent = current.context if current is not None else None
+        if parent is None:
+            if require_parent:
+                return NOOP_SPAN
+            context = SpanContext(
+                os.urandom(16).hex(), os.urandom(8).hex(), random.random() < settings.trace_sample_rate
+            )
+        else:
+            context = SpanContext(parent.trace_id, os.urandom(8).hex(), parent.sampled)
+        return Span(self, name, context, parent.span_id if parent else None, kind, attributes)
+    
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: int = INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+        require_parent: bool = False
+    ) -> Iterator[Any]:
+        """Run the block in a new current span; exceptions mark it as failed."""
+        span = self.start_span(name, kind, attributes, parent, require_parent)
+        if span is NOOP_SPAN:
+            yield span
+            return
+        token = current_span_var.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            current_span_var.reset(token)
+            span.end()
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent of the current span, for handing the trace to another process."""
+    span = current_span_var.get()
+    return span.context.traceparent() if span is not None else None
+
+
+# Global tracer instance
+tracer = Tracer()
+
+
+@atexit.register
+def _flush() -> None:
+    """Write out spans still buffered when the process exits."""
+    tracer.exporter.flush()
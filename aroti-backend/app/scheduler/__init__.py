@@ -0,0 +1 @@
+# Delayed jobs on Redis sorted sets
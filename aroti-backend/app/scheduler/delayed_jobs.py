@@ -0,0 +1,305 @@
+"""
+Durable delayed jobs on Redis sorted sets.
+
+Due times live in ZSETs sharded by time bucket ({prefix}:due:{n}, one per
+scheduler_bucket_seconds), with an index ZSET of non-empty buckets so a
+claim only touches shards that are due. Job payloads live in a hash keyed
+by job ID, which makes scheduling idempotent: scheduling an existing ID
+moves it instead of adding a duplicate.
+
+Workers claim due jobs in batches with one Lua call. Claimed jobs move to a
+processing ZSET scored by lease expiry; a job whose worker dies reappears
+once its lease runs out (at-least-once delivery). Failures are rescheduled
+with exponential backoff and jitter, then dead-lettered after
+scheduler_max_attempts.
+
+Bucket keys are derived inside the scripts, so this expects a single
+(non-cluster) Redis, like the rest of the cache layer.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.cache.redis_client import redis_client
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# KEYS: buckets, processing, data, where
+# ARGV: id, due_ms, bucket_key, bucket_start_ms, payload
+SCHEDULE_SCRIPT = """
+local old = redis.call("HGET", KEYS[4], ARGV[1])
+if old then
+    redis.call("ZREM", old, ARGV[1])
+end
+redis.call("ZREM", KEYS[2], ARGV[1])
+redis.call("ZADD", ARGV[3], ARGV[2], ARGV[1])
+redis.call("ZADD", KEYS[1], ARGV[4], ARGV[3])
+redis.call("HSET", KEYS[3], ARGV[1], ARGV[5])
+redis.call("HSET", KEYS[4], ARGV[1], ARGV[3])
+return 1
+"""
+
+# Same as SCHEDULE_SCRIPT, but only for a job this worker still holds;
+# a job cancelled or rescheduled while it ran is left alone
+RETRY_SCRIPT = """
+if redis.call("ZREM", KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+redis.call("ZADD", ARGV[3], ARGV[2], ARGV[1])
+redis.call("ZADD", KEYS[1], ARGV[4], ARGV[3])
+redis.call("HSET", KEYS[3], ARGV[1], ARGV[5])
+redis.call("HSET", KEYS[4], ARGV[1], ARGV[3])
+return 1
+"""
+
+# ARGV: now_ms, limit, lease_until_ms
+# Returns a flat list of id, payload pairs
+CLAIM_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local ids = {}
+
+-- Leases that ran out belong to a worker that died or stalled
+local expired = redis.call("ZRANGEBYSCORE", KEYS[2], "-inf", now, "LIMIT", 0, limit)
+for _, id in ipairs(expired) do
+    ids[#ids + 1] = id
+end
+
+if #ids < limit then
+    local buckets = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", now)
+    for _, bucket in ipairs(buckets) do
+        local due = redis.call("ZRANGEBYSCORE", bucket, "-inf", now, "LIMIT", 0, limit - #ids)
+        for _, id in ipairs(due) do
+            ids[#ids + 1] = id
+            redis.call("HDEL", KEYS[4], id)
+        end
+        if #due > 0 then
+            redis.call("ZREM", bucket, unpack(due))
+        end
+        if redis.call("ZCARD", bucket) == 0 then
+            redis.call("ZREM", KEYS[1], bucket)
+        end
+        if #ids >= limit then
+            break
+        end
+    end
+end
+
+local result = {}
+for _, id in ipairs(ids) do
+    redis.call("ZADD", KEYS[2], ARGV[3], id)
+    result[#result + 1] = id
+    result[#result + 1] = redis.call("HGET", KEYS[3], id) or ""
+end
+return result
+"""
+
+# ARGV: ids; payloads are kept for jobs rescheduled while they ran
+ACK_SCRIPT = """
+local acked = 0
+for _, id in ipairs(ARGV) do
+    if redis.call("ZREM", KEYS[2], id) == 1 then
+        acked = acked + 1
+        if redis.call("HEXISTS", KEYS[4], id) == 0 then
+            redis.call("HDEL", KEYS[3], id)
+        end
+    end
+end
+return acked
+"""
+
+# KEYS: processing, data, dead; ARGV: id, payload, max_dead
+DEAD_LETTER_SCRIPT = """
+if redis.call("ZREM", KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call("HDEL", KEYS[2], ARGV[1])
+redis.call("LPUSH", KEYS[3], ARGV[2])
+redis.call("LTRIM", KEYS[3], 0, tonumber(ARGV[3]) - 1)
+return 1
+"""
+
+# ARGV: id
+CANCEL_SCRIPT = """
+local where = redis.call("HGET", KEYS[4], ARGV[1])
+if where then
+    redis.call("ZREM", where, ARGV[1])
+end
+redis.call("HDEL", KEYS[4], ARGV[1])
+redis.call("ZREM", KEYS[2], ARGV[1])
+return redis.call("HDEL", KEYS[3], ARGV[1])
+"""
+
+MAX_DEAD_LETTERS = 10000
+
+
+@dataclass
+class Job:
+    """A claimed job."""
+    id: str
+    type: str
+    args: Dict[str, Any]
+    attempts: int
+    due_ms: int
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number attempts (1-based): doubling, capped, with jitter."""
+    delay = min(settings.scheduler_backoff_max, settings.scheduler_backoff_base * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class DelayedJobScheduler:
+    """Schedules, claims and dispatches delayed jobs."""
+    
+    def __init__(self, prefix: str = "jobs"):
+        self.prefix = prefix
+        self.keys = [
+            f"{prefix}:buckets",
+            f"{prefix}:processing",
+            f"{prefix}:data",
+            f"{prefix}:where"
+        ]
+        self.dead_key = f"{prefix}:dead"
+        self.handlers: Dict[str, Handler] = {}
+    
+    def handler(self, job_type: str) -> Callable[[Handler], Handler]:
+        """Register the coroutine that runs jobs of job_type."""
+        def register(fn: Handler) -> Handler:
+            self.handlers[job_type] = fn
+            return fn
+        return register
+    
+    def bucket_of(self, due_ms: int) -> Tuple[str, int]:
+        """Shard key for a due time and the start of its bucket in ms."""
+        width_ms = settings.scheduler_bucket_seconds * 1000
+        bucket = due_ms // width_ms
+        return f"{self.prefix}:due:{bucket}", bucket * width_ms
+    
+    def _schedule_args(self, job_id: str, job_type: str, args: Dict, due_ms: int, attempts: int) -> List:
+        bucket_key, bucket_start = self.bucket_of(due_ms)
+        payload = json.dumps({"type": job_type, "args": args, "attempts": attempts, "due": due_ms})
+        return [job_id, due_ms, bucket_key, bucket_start, payload]
+    
+    async def schedule(self, job_id: str, job_type: str, args: Dict[str, Any], run_at: float) -> bool:
+        """
+        Schedule job_id to run at run_at (epoch seconds).
+        Scheduling an ID that is already pending moves it rather than duplicating it.
+        """
+        due_ms = int(run_at * 1000)
+        try:
+            await redis_client.run_script(
+                SCHEDULE_SCRIPT, self.keys, self._schedule_args(job_id, job_type, args, due_ms, 0)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to schedule job {job_id}: {e}")
+            return False
+    
+    async def cancel(self, job_id: str) -> Optional[bool]:
+        """
+        Remove a pending job; a running attempt is not retried afterwards.
+        Returns True if removed, False if there was no such job, None if Redis failed.
+        """
+        try:
+            return bool(await redis_client.run_script(CANCEL_SCRIPT, self.keys, [job_id]))
+        except Exception as e:
+            logger.error(f"Failed to cancel job {job_id}: {e}")
+            return None
+    
+    async def claim(self, limit: Optional[int] = None, now_ms: Optional[int] = None) -> List[Job]:
+        """Lease up to limit due jobs."""
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        limit = limit or settings.scheduler_batch_size
+        flat = await redis_client.run_script(
+            CLAIM_SCRIPT, self.keys, [now_ms, limit, now_ms + settings.scheduler_lease_ms]
+        )
+        jobs = []
+        orphans = []
+        for job_id, payload in zip(flat[::2], flat[1::2]):
+            if not payload:
+                orphans.append(job_id)
+                continue
+            data = json.loads(payload)
+            jobs.append(Job(job_id, data["type"], data["args"], data["attempts"], data["due"]))
+        if orphans:
+            await self.ack(orphans)
+        return jobs
+    
+    async def ack(self, job_ids: List[str]) -> int:
+        """Mark claimed jobs done."""
+        if not job_ids:
+            return 0
+        return await redis_client.run_script(ACK_SCRIPT, self.keys, job_ids)
+    
+    async def fail(self, job: Job, error: Exception) -> None:
+        """Reschedule a failed job with backoff, or dead-letter it after max attempts."""
+        attempts = job.attempts + 1
+        if attempts >= settings.scheduler_max_attempts:
+            logger.error(f"Job {job.id} failed {attempts} times, dead-lettering: {error}")
+            payload = json.dumps({
+                "id": job.id, "type": job.type, "args": job.args,
+                "attempts": attempts, "error": str(error)
+            })
+            await redis_client.run_script(
+                DEAD_LETTER_SCRIPT,
+                [self.keys[1], self.keys[2], self.dead_key],
+                [job.id, payload, MAX_DEAD_LETTERS]
+            )
+            return
+        
+        delay = backoff_seconds(attempts)
+        logger.warning(f"Job {job.id} failed (attempt {attempts}), retrying in {delay:.1f}s: {error}")
+        due_ms = int((time.time() + delay) * 1000)
+        await redis_client.run_script(
+            RETRY_SCRIPT, self.keys, self._schedule_args(job.id, job.type, job.args, due_ms, attempts)
+        )
+    
+    async def _dispatch(self, job: Job) -> Optional[Exception]:
+        handler = self.handlers.get(job.type)
+        if handler is None:
+            return LookupError(f"No handler for job type {job.type}")
+        try:
+            await handler(job.args)
+            return None
+        except Exception as e:
+            return e
+    
+    async def run_once(self) -> int:
+        """Claim one batch, run it concurrently, and ack or retry each job. Returns the batch size."""
+        jobs = await self.claim()
+        if not jobs:
+            return 0
+        
+        errors = await asyncio.gather(*(self._dispatch(job) for job in jobs))
+        await self.ack([job.id for job, error in zip(jobs, errors) if error is None])
+        for job, error in zip(jobs, errors):
+            if error is not None:
+                await self.fail(job, error)
+        return len(jobs)
+    
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Dispatch jobs until stop is set; full batches are followed immediately by the next claim."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Scheduler loop error: {e}")
+                claimed = 0
+            if claimed < settings.scheduler_batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), settings.scheduler_poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+# Global scheduler instance
+scheduler = DelayedJobScheduler()
@@ -0,0 +1,111 @@
+"""
+Rolling daily-insights warm-up.
+One job per UTC hour (insights:warmup:{hour}), due insights_warmup_lead seconds
+before the hour. It warms the users of every timezone whose local midnight falls
+within that hour, so the writes (and the keys' expiry) are spread over 24 hourly
+waves instead of one burst at UTC midnight. Each timezone is paged through by
+user ID; a page is built at once and written to Redis in one pipeline.
+"""
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.cache.cache_aside import build_entry
+from app.cache.redis_client import redis_client
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.scheduler.delayed_jobs import scheduler
+from app.services.insights import build_insights, insight_key, insight_ttl, local_date, local_midnight
+
+logger = logging.getLogger(__name__)
+
+INSIGHTS_JOB = "insights_warmup"
+WAVE = timedelta(hours=1)
+
+
+def warmup_job_id(hour: datetime) -> str:
+    return f"insights:warmup:{hour:%Y-%m-%dT%H}"
+
+
+def next_wave(now: Optional[datetime] = None) -> datetime:
+    """Start of the next full UTC hour."""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0) + WAVE
+
+
+def due_timezones(timezones: Iterable[str], start: datetime) -> Dict[str, date]:
+    """Timezones whose local midnight falls in [start, start + 1h), with the day that begins."""
+    due = {}
+    for tz in timezones:
+        day = local_date(tz, start)
+        if local_midnight(day, tz) < start:
+            day += timedelta(days=1)
+        if local_midnight(day, tz) < start + WAVE:
+            due[tz] = day
+    return due
+
+
+async def schedule_warmup(hour: Optional[datetime] = None) -> bool:
+    """Schedule the wave for hour (default the next one); idempotent per hour."""
+    hour = hour or next_wave()
+    return await scheduler.schedule(
+        warmup_job_id(hour),
+        INSIGHTS_JOB,
+        {"hour": hour.isoformat()},
+        hour.timestamp() - settings.insights_warmup_lead
+    )
+
+
+async def warm_timezone(tz: str, day: date, sessionmaker: async_sessionmaker = AsyncSessionLocal) -> int:
+    """
+    Write day's insights for every user in tz. Returns the number written.
+    Raises if a page cannot be written, so the job is retried.
+    """
+    ttl = insight_ttl(day, tz)
+    written = 0
+    last_id = ""
+    while True:
+        async with sessionmaker() as db:
+            rows = (await db.execute(
+                select(User.id, User.birth_date)
+                .where(User.timezone == tz, User.id > last_id)
+                .order_by(User.id)
+                .limit(settings.insights_warmup_batch)
+            )).all()
+        if not rows:
+            return written
+        
+        user_ids = [row.id for row in rows]
+        payloads = build_insights(user_ids, [row.birth_date for row in rows], day)
+        entries = {
+            insight_key(user_id, day): build_entry(payload, ttl)
+            for user_id, payload in zip(user_ids, payloads)
+        }
+        if not await redis_client.mset_json(entries, ttl=ttl + settings.cache_stale_ttl):
+            raise RuntimeError(f"Failed to write daily insights for {tz} after {written} users")
+        written += len(rows)
+        last_id = user_ids[-1]
+
+
+async def warm_insights(hour: datetime, sessionmaker: async_sessionmaker = AsyncSessionLocal) -> int:
+    """Warm every timezone whose midnight falls in hour's wave. Returns the number of users written."""
+    async with sessionmaker() as db:
+        timezones = (await db.execute(select(User.timezone).distinct())).scalars().all()
+    
+    written = 0
+    for tz, day in due_timezones(timezones, hour).items():
+        written += await warm_timezone(tz, day, sessionmaker)
+    return written
+
+
+@scheduler.handler(INSIGHTS_JOB)
+async def run_insights_warmup(args: Dict[str, Any]) -> None:
+    hour = datetime.fromisoformat(args["hour"])
+    # Chain the next wave first, so a failing wave does not stop the ones after it
+    await schedule_warmup(hour + WAVE)
+    written = await warm_insights(hour)
+    logger.info(f"Warmed daily insights for {written} users ahead of {hour:%H:%M} UTC")
@@ -0,0 +1,75 @@
+"""
+Session reminders as delayed jobs.
+One job per session (reminder:{session_id}), due reminder_lead_time before it starts.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.scheduler.delayed_jobs import scheduler
+from app.services import notifications
+from app.services.notifications import Notification
+
+logger = logging.getLogger(__name__)
+
+REMINDER_JOB = "session_reminder"
+
+
+def reminder_job_id(session_id: str) -> str:
+    return f"reminder:{session_id}"
+
+
+def session_start(date: str, time: str) -> datetime:
+    """Session start from its ISO date and HH:MM time (stored as UTC)."""
+    return datetime.fromisoformat(f"{date}T{time}").replace(tzinfo=timezone.utc)
+
+
+def reminder_run_at(date: str, time: str) -> Optional[float]:
+    """
+    Epoch seconds at which a session's reminder is due, or None if it needs none.
+    A session starting within the lead time is reminded right away; a past or
+    unparseable one is skipped.
+    """
+    try:
+        start = session_start(date, time)
+    except ValueError:
+        logger.warning(f"No reminder for bad session date/time {date} {time}")
+        return None
+    
+    now = datetime.now(timezone.utc)
+    if start <= now:
+        return None
+    return max(start - timedelta(seconds=settings.reminder_lead_time), now).timestamp()
+
+
+async def schedule_session_reminder(session_id: str, user_id: str, date: str, time: str) -> bool:
+    """Schedule (or move) the reminder for a session. Returns False if none was scheduled."""
+    run_at = reminder_run_at(date, time)
+    if run_at is None:
+        return False
+    return await scheduler.schedule(
+        reminder_job_id(session_id),
+        REMINDER_JOB,
+        {"session_id": session_id, "user_id": user_id, "date": date, "time": time},
+        run_at
+    )
+
+
+async def cancel_session_reminder(session_id: str) -> Optional[bool]:
+    return await scheduler.cancel(reminder_job_id(session_id))
+
+
+def reminder_notification(args: Dict[str, Any]) -> Notification:
+    return Notification(
+        user_id=args["user_id"],
+        title="Upcoming session",
+        body=f"Your session is on {args['date']} at {args['time']} UTC.",
+        data={"type": REMINDER_JOB, "session_id": args["session_id"]}
+    )
+
+
+@scheduler.handler(REMINDER_JOB)
+async def send_session_reminder(args: Dict[str, Any]) -> None:
+    """Send the reminder through the configured notifier; a failed send is retried."""
+    await notifications.notifier.send(reminder_notification(args))
@@ -0,0 +1,35 @@
+"""
+Delayed-job worker: dispatches due reminders and insight warm-ups from Redis.
+Run one or more alongside the API; claims are atomic, so workers scale out.
+"""
+import asyncio
+import logging
+
+from app.cache.redis_client import redis_client
+from app.config import settings
+from app.observability.logs import configure_logging
+from app.scheduler.delayed_jobs import scheduler
+import app.scheduler.reminders  # noqa: F401  (registers job handlers)
+from app.scheduler.insights import schedule_warmup
+from app.services.notifications import build_notifier, set_notifier
+
+logger = logging.getLogger(__name__)
+
+
+async def run_scheduler():
+    """Run the dispatch loop until cancelled."""
+    if not await redis_client.ping():
+        logger.warning("Redis unreachable at startup; the dispatch loop will keep retrying")
+    set_notifier(build_notifier())
+    logger.info(f"Starting delayed-job worker for {', '.join(sorted(scheduler.handlers))}")
+    # Each warm-up wave schedules the next; this seeds the chain (idempotent across workers)
+    await schedule_warmup()
+    try:
+        await scheduler.run()
+    finally:
+        await redis_client.close()
+
+
+if __name__ == "__main__":
+    configure_logging(logging.INFO, settings.log_format)
+    asyncio.run(run_scheduler())
@@ -80,3 +80,26 @@ class UpdateSessionRequest(BaseModel):
     
     class Config:
         populate_by_name = True
+
+
+class BookingAcceptedSchema(BaseModel):
+    """202 response when a booking is handed to SessionBookingWorkflow"""
+    bookingId: str = Field(alias="booking_id")
+    status: str  # "accepted"
+    statusUrl: str = Field(alias="status_url")
+    
+    class Config:
+        populate_by_name = True
+
+
+class BookingStatusSchema(BaseModel):
+    """State of a booking workflow"""
+    bookingId: str = Field(alias="booking_id")
+    status: str  # "pending", "confirmed", "rejected", "failed"
+    step: Optional[str] = None
+    sessionId: Optional[str] = Field(None, alias="session_id")
+    meetingLink: Optional[str] = Field(None, alias="meeting_link")
+    error: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
@@ -35,6 +35,13 @@ class NumerologyInsightSchema(BaseModel):
     preview: str
 
 
+class PersonalNumbersSchema(BaseModel):
+    """Personal year/month/day numbers (iOS NumerologyCycleService)"""
+    personalYear: int
+    personalMonth: int
+    personalDay: int
+
+
 class DailyInsightSchema(BaseModel):
     """Matches iOS HomeModels.DailyInsight"""
     tarotCard: Optional[TarotCardSchema] = None
@@ -43,3 +50,4 @@ class DailyInsightSchema(BaseModel):
     ritual: RitualSchema
     affirmation: str
     date: date
+    personalNumbers: Optional[PersonalNumbersSchema] = None  # None without a birth date
@@ -0,0 +1,33 @@
+"""
+Pydantic schemas for numerology endpoints matching iOS MatrixOfFateService / NumerologyCycleService
+"""
+from typing import Optional
+from datetime import date
+from pydantic import BaseModel, Field
+
+from app.config import settings
+
+
+class NumerologySchema(BaseModel):
+    """Core numbers for one birth date"""
+    birthDate: date
+    coreDestinyNumber: int  # MatrixOfFateService.calculateCoreDestinyNumber
+    lifePath: int  # BlueprintService life path (same formula)
+    personalYear: int
+    personalMonth: int
+    personalDay: int
+    karmicLessons: list[str]
+
+
+class NumerologyBatchRequest(BaseModel):
+    """Birth dates to compute; personal numbers are for date (default today, UTC)"""
+    birthDates: list[date] = Field(..., min_length=1, max_length=settings.numerology_batch_max)
+    day: Optional[date] = Field(None, alias="date")
+    
+    class Config:
+        populate_by_name = True
+
+
+class NumerologyBatchResponse(BaseModel):
+    date: date
+    results: list[NumerologySchema]
@@ -16,6 +16,7 @@ class UserDataSchema(BaseModel):
     birthLocation: Optional[str] = Field(None, alias="birth_location")
     traits: Optional[list[str]] = []
     isPremium: Optional[bool] = Field(False, alias="is_premium")
+    timezone: Optional[str] = "UTC"  # IANA name
     
     class Config:
         populate_by_name = True
@@ -26,6 +27,7 @@ class UpdateProfileRequest(BaseModel):
     """Request schema for updating user profile"""
     name: Optional[str] = None
     location: Optional[str] = None  # Maps to birth_location
+    timezone: Optional[str] = None  # IANA name, e.g. "Europe/Berlin"
     
     class Config:
         populate_by_name = True
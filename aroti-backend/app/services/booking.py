@@ -0,0 +1,135 @@
+"""
+Atomic slot reservation for session bookings.
+
+A booking is a single INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING:
+the specialist row supplies name/photo/price and must be available, and the
+partial unique index uq_sessions_active_slot rejects a second active booking
+for the same (specialist_id, date, time). The database arbitrates races, so
+there is no check-then-insert window and no retry loop under contention.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.session import Session as SessionModel
+from app.models.specialist import Specialist
+
+# Statuses that hold a slot
+ACTIVE_STATUSES = ("pending", "upcoming")
+
+DEFAULT_DURATION = 50  # minutes
+
+
+class BookingError(Exception):
+    """Base class for reservation failures."""
+
+
+class SpecialistNotFound(BookingError):
+    pass
+
+
+class SpecialistUnavailable(BookingError):
+    pass
+
+
+class SlotTaken(BookingError):
+    pass
+
+
+def reservation_statement(
+    session_id: str,
+    specialist_id: str,
+    user_id: str,
+    date: str,
+    time: str
+):
+    """INSERT ... SELECT from specialists, skipped on an active-slot conflict."""
+    now = datetime.utcnow()
+    columns = [
+        "id", "specialist_id", "user_id", "specialist_name", "specialist_photo",
+        "specialty", "date", "time", "duration", "price", "status",
+        "created_at", "updated_at"
+    ]
+    source = select(
+        literal(session_id),
+        Specialist.id,
+        literal(user_id),
+        Specialist.name,
+        Specialist.photo,
+        Specialist.specialty,
+        literal(date),
+        literal(time),
+        literal(DEFAULT_DURATION),
+        Specialist.price,
+        literal("pending"),
+        literal(now),
+        literal(now)
+    ).where(
+        Specialist.id == specialist_id,
+        Specialist.available.is_(True)
+    )
+    return (
+        insert(SessionModel)
+        .from_select(columns, source)
+        .on_conflict_do_nothing(
+            index_elements=["specialist_id", "date", "time"],
+            index_where=SessionModel.status.in_(ACTIVE_STATUSES)
+        )
+        .returning(*SessionModel.__table__.c)
+    )
+
+
+def _failure(available: Optional[bool]) -> BookingError:
+    """Explain why the INSERT produced no row."""
+    if available is None:
+        return SpecialistNotFound("Specialist not found")
+    if not available:
+        return SpecialistUnavailable("Specialist is not available")
+    return SlotTaken("This time slot is already booked")
+
+
+def _availability_statement(specialist_id: str):
+    return select(Specialist.available).where(Specialist.id == specialist_id)
+
+
+async def reserve_slot(
+    db: AsyncSession,
+    session_id: str,
+    specialist_id: str,
+    user_id: str,
+    date: str,
+    time: str
+) -> dict:
+    """
+    Reserve a slot and return the new session row as a dict.
+    Raises SpecialistNotFound, SpecialistUnavailable or SlotTaken.
+    The caller commits.
+    """
+    row = (await db.execute(
+        reservation_statement(session_id, specialist_id, user_id, date, time)
+    )).mappings().first()
+    if row is None:
+        available = (await db.execute(_availability_statement(specialist_id))).scalar()
+        raise _failure(available)
+    return dict(row)
+
+
+def reserve_slot_sync(
+    db: Session,
+    session_id: str,
+    specialist_id: str,
+    user_id: str,
+    date: str,
+    time: str
+) -> dict:
+    """Synchronous reserve_slot for Temporal activities."""
+    row = db.execute(
+        reservation_statement(session_id, specialist_id, user_id, date, time)
+    ).mappings().first()
+    if row is None:
+        available = db.execute(_availability_statement(specialist_id)).scalar()
+        raise _failure(available)
+    return dict(row)
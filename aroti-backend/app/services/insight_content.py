@@ -0,0 +1,331 @@
+"""
+Content for daily insights: the 22 major arcana, rituals and the numerology
+texts, as shipped in the iOS DailyContentService and NumerologyCycleService.
+Dicts are in the API's camelCase shape so they drop straight into responses.
+"""
+from typing import Dict, List
+
+TAROT_CARDS: List[dict] = [
+    {
+        "id": "fool",
+        "name": "The Fool",
+        "keywords": ["New beginnings", "Innocence", "Adventure"],
+        "interpretation": "A new beginning, innocence, spontaneity, and a free spirit. Embrace new opportunities with an open heart.",
+        "guidance": ["Trust your instincts", "Take a leap of faith", "Embrace the unknown"],
+        "imageName": "tarot-fool"
+    },
+    {
+        "id": "magician",
+        "name": "The Magician",
+        "keywords": ["Manifestation", "Power", "Will"],
+        "interpretation": "Manifestation, resourcefulness, power, and inspired action. You have all the tools you need to succeed.",
+        "guidance": ["Focus your energy", "Use all available resources", "Take decisive action"],
+        "imageName": "tarot-magician"
+    },
+    {
+        "id": "priestess",
+        "name": "The High Priestess",
+        "keywords": ["Intuition", "Mystery", "Wisdom"],
+        "interpretation": "Intuition, mystery, and inner wisdom. Trust your inner voice and look beyond the surface.",
+        "guidance": ["Listen to your intuition", "Seek inner knowledge", "Trust the unknown"],
+        "imageName": "tarot-priestess"
+    },
+    {
+        "id": "empress",
+        "name": "The Empress",
+        "keywords": ["Fertility", "Abundance", "Nature"],
+        "interpretation": "Fertility, abundance, and nurturing energy. Connect with nature and embrace your creative power.",
+        "guidance": ["Nurture yourself and others", "Embrace abundance", "Connect with nature"],
+        "imageName": "tarot-empress"
+    },
+    {
+        "id": "emperor",
+        "name": "The Emperor",
+        "keywords": ["Authority", "Structure", "Control"],
+        "interpretation": "Authority, structure, and stability. Take control and establish order in your life.",
+        "guidance": ["Set clear boundaries", "Take leadership", "Build solid foundations"],
+        "imageName": "tarot-emperor"
+    },
+    {
+        "id": "hierophant",
+        "name": "The Hierophant",
+        "keywords": ["Tradition", "Spirituality", "Guidance"],
+        "interpretation": "Tradition, spirituality, and seeking guidance. Connect with established wisdom and spiritual practices.",
+        "guidance": ["Seek spiritual guidance", "Honor traditions", "Find a mentor"],
+        "imageName": "tarot-hierophant"
+    },
+    {
+        "id": "lovers",
+        "name": "The Lovers",
+        "keywords": ["Love", "Harmony", "Choices"],
+        "interpretation": "Love, harmony, and important choices. Balance your heart and mind in decisions.",
+        "guidance": ["Follow your heart", "Seek harmony", "Make conscious choices"],
+        "imageName": "tarot-lovers"
+    },
+    {
+        "id": "chariot",
+        "name": "The Chariot",
+        "keywords": ["Victory", "Willpower", "Control"],
+        "interpretation": "Victory, willpower, and determination. Harness opposing forces to move forward.",
+        "guidance": ["Stay focused", "Use your willpower", "Overcome obstacles"],
+        "imageName": "tarot-chariot"
+    },
+    {
+        "id": "strength",
+        "name": "Strength",
+        "keywords": ["Courage", "Patience", "Inner strength"],
+        "interpretation": "Courage, patience, and inner strength. True power comes from gentleness and self-control.",
+        "guidance": ["Be patient", "Show compassion", "Trust your inner strength"],
+        "imageName": "tarot-strength"
+    },
+    {
+        "id": "hermit",
+        "name": "The Hermit",
+        "keywords": ["Introspection", "Guidance", "Solitude"],
+        "interpretation": "Introspection, guidance, and inner wisdom. Take time for solitude and reflection.",
+        "guidance": ["Seek inner guidance", "Take time alone", "Reflect on your path"],
+        "imageName": "tarot-hermit"
+    },
+    {
+        "id": "wheel",
+        "name": "Wheel of Fortune",
+        "keywords": ["Change", "Cycles", "Destiny"],
+        "interpretation": "Change, cycles, and destiny. Life is in constant motion, embrace the turning wheel.",
+        "guidance": ["Accept change", "Trust the cycle", "Go with the flow"],
+        "imageName": "tarot-wheel"
+    },
+    {
+        "id": "justice",
+        "name": "Justice",
+        "keywords": ["Balance", "Fairness", "Truth"],
+        "interpretation": "Balance, fairness, and truth. Seek justice and make decisions with integrity.",
+        "guidance": ["Seek truth", "Make fair decisions", "Take responsibility"],
+        "imageName": "tarot-justice"
+    },
+    {
+        "id": "hanged",
+        "name": "The Hanged Man",
+        "keywords": ["Surrender", "Letting go", "New perspective"],
+        "interpretation": "Surrender, letting go, and new perspectives. Sometimes you must pause to see clearly.",
+        "guidance": ["Let go of control", "See things differently", "Embrace waiting"],
+        "imageName": "tarot-hanged"
+    },
+    {
+        "id": "death",
+        "name": "Death",
+        "keywords": ["Transformation", "Endings", "Rebirth"],
+        "interpretation": "Transformation, endings, and rebirth. Let go of what no longer serves to make room for new growth.",
+        "guidance": ["Embrace endings", "Allow transformation", "Release the old"],
+        "imageName": "tarot-death"
+    },
+    {
+        "id": "temperance",
+        "name": "Temperance",
+        "keywords": ["Balance", "Moderation", "Harmony"],
+        "interpretation": "Balance, moderation, and harmony. Find the middle path and blend opposites.",
+        "guidance": ["Seek balance", "Practice moderation", "Blend opposites"],
+        "imageName": "tarot-temperance"
+    },
+    {
+        "id": "devil",
+        "name": "The Devil",
+        "keywords": ["Bondage", "Materialism", "Shadow"],
+        "interpretation": "Bondage, materialism, and shadow aspects. Recognize what holds you back and break free.",
+        "guidance": ["Examine attachments", "Face your shadows", "Break free from limitations"],
+        "imageName": "tarot-devil"
+    },
+    {
+        "id": "tower",
+        "name": "The Tower",
+        "keywords": ["Sudden change", "Revelation", "Breakthrough"],
+        "interpretation": "Sudden change, revelation, and breakthrough. Sometimes destruction clears the way for truth.",
+        "guidance": ["Embrace sudden change", "Let go of false structures", "Welcome revelation"],
+        "imageName": "tarot-tower"
+    },
+    {
+        "id": "star",
+        "name": "The Star",
+        "keywords": ["Hope", "Inspiration", "Healing"],
+        "interpretation": "Hope, inspiration, and healing. After darkness comes light and renewed faith.",
+        "guidance": ["Have hope", "Find inspiration", "Heal and renew"],
+        "imageName": "tarot-star"
+    },
+    {
+        "id": "moon",
+        "name": "The Moon",
+        "keywords": ["Illusion", "Intuition", "Unconscious"],
+        "interpretation": "Illusion, intuition, and the unconscious. Trust your intuition but beware of deception.",
+        "guidance": ["Trust your intuition", "Face your fears", "Look beyond illusions"],
+        "imageName": "tarot-moon"
+    },
+    {
+        "id": "sun",
+        "name": "The Sun",
+        "keywords": ["Joy", "Success", "Vitality"],
+        "interpretation": "Joy, success, and vitality. Embrace positivity and let your light shine brightly.",
+        "guidance": ["Embrace joy", "Celebrate success", "Radiate positivity"],
+        "imageName": "tarot-sun"
+    },
+    {
+        "id": "judgement",
+        "name": "Judgement",
+        "keywords": ["Reflection", "Awakening", "Forgiveness"],
+        "interpretation": "Reflection, awakening, and forgiveness. It's time to evaluate your past and rise to a higher calling.",
+        "guidance": ["Reflect on your path", "Awaken to new purpose", "Practice forgiveness"],
+        "imageName": "tarot-judgement"
+    },
+    {
+        "id": "world",
+        "name": "The World",
+        "keywords": ["Completion", "Achievement", "Fulfillment"],
+        "interpretation": "Completion, achievement, and fulfillment. You've reached a milestone and are ready for new beginnings.",
+        "guidance": ["Celebrate completion", "Acknowledge achievement", "Prepare for new cycles"],
+        "imageName": "tarot-world"
+    }
+]
+
+RITUALS: List[dict] = [
+    {
+        "id": "1",
+        "title": "Grounding Breath",
+        "description": "A simple breathing practice to center yourself and reconnect with your body.",
+        "duration": "3 min",
+        "type": "Grounding",
+        "intention": "This ritual helps you ground your energy and reconnect with your body after a busy day.",
+        "steps": ["Find a quiet space and sit comfortably.", "Take three slow, deep breaths.", "Place your hand over your heart and set your intention.", "Repeat the affirmation silently three times."],
+        "affirmation": "I am grounded, centered, and at peace.",
+        "benefits": ["Reduces stress and anxiety", "Improves focus", "Regulates nervous system", "Promotes relaxation"]
+    },
+    {
+        "id": "2",
+        "title": "Morning Intention",
+        "description": "Set a meaningful intention for your day with this gentle morning practice.",
+        "duration": "5 min",
+        "type": "Intention",
+        "intention": "This ritual helps you start your day with clarity and purpose.",
+        "steps": ["Sit comfortably with your back straight.", "Take three deep breaths, inhaling through your nose and exhaling through your mouth.", "Bring to mind three things you're grateful for today.", "Ask yourself: 'What is one intention I want to set for today?'", "Visualize yourself embodying this intention throughout your day."],
+        "affirmation": "I move through my day with intention and grace.",
+        "benefits": ["Increases focus and clarity", "Aligns actions with values", "Reduces morning anxiety", "Creates positive momentum"]
+    },
+    {
+        "id": "3",
+        "title": "Evening Gratitude",
+        "description": "End your day with gratitude and reflection.",
+        "duration": "4 min",
+        "type": "Gratitude",
+        "intention": "This ritual helps you reflect on your day and cultivate gratitude.",
+        "steps": ["Find a comfortable seated or lying position.", "Close your eyes and take five deep breaths.", "Think of three things from today you're grateful for.", "Allow yourself to feel the warmth of gratitude in your heart.", "Set an intention for restful sleep."],
+        "affirmation": "I am grateful for all the blessings in my life.",
+        "benefits": ["Boosts mood and happiness", "Shifts perspective positively", "Reduces negative thinking", "Improves sleep quality"]
+    }
+]
+
+# Personal day number -> preview (NumerologyCycleService.getPersonalDayDescription)
+PERSONAL_DAY_PREVIEWS: Dict[int, str] = {
+    1: "Leadership patterns become more noticeable",
+    2: "Cooperation patterns feel more accessible",
+    3: "Creative patterns surface more easily",
+    4: "Structure supports clear thinking",
+    5: "Change patterns become more noticeable",
+    6: "Care patterns feel more aligned",
+    7: "Introspection patterns play a stronger role",
+    8: "Material patterns become more noticeable",
+    9: "Completion patterns feel more accessible",
+    11: "Intuitive patterns are heightened",
+    22: "Master building patterns are active",
+    33: "Master teaching patterns are present"
+}
+DEFAULT_PREVIEW = "Numerological patterns become more noticeable"
+
+# Numerology number -> affirmations (DailyContentService.numerologyAffirmations)
+AFFIRMATIONS: Dict[int, List[str]] = {
+    1: [
+        "I trust my ability to lead and create new paths",
+        "I embrace my independence and take bold action",
+        "I am a natural leader and pioneer",
+        "I confidently step into new beginnings",
+        "I honor my unique identity and express it authentically"
+    ],
+    2: [
+        "I create harmony in all my relationships",
+        "I honor cooperation and partnership",
+        "I trust the power of collaboration",
+        "I find balance through connection with others",
+        "I am patient and diplomatic in all interactions"
+    ],
+    3: [
+        "I express my creativity freely and joyfully",
+        "I communicate with clarity and inspiration",
+        "I bring joy and creativity to everything I do",
+        "I share my gifts with the world",
+        "I embrace my natural optimism and enthusiasm"
+    ],
+    4: [
+        "I build solid foundations for my dreams",
+        "I create structure that supports my growth",
+        "I am practical and reliable in all I do",
+        "I organize my life with intention and care",
+        "I honor discipline and methodical progress"
+    ],
+    5: [
+        "I embrace change as an opportunity for growth",
+        "I am free to explore new experiences",
+        "I adapt gracefully to life's changes",
+        "I welcome adventure and new possibilities",
+        "I trust my ability to navigate transitions"
+    ],
+    6: [
+        "I nurture myself and others with love",
+        "I create harmony in my home and relationships",
+        "I am responsible and caring in all I do",
+        "I find fulfillment through service and care",
+        "I honor my need to give and receive love"
+    ],
+    7: [
+        "I trust my inner wisdom and intuition",
+        "I seek truth and deeper understanding",
+        "I honor my need for reflection and solitude",
+        "I connect with my spiritual nature",
+        "I am open to receiving spiritual guidance"
+    ],
+    8: [
+        "I manifest abundance and success",
+        "I use my power wisely and responsibly",
+        "I achieve my goals through focused action",
+        "I am capable of creating material abundance",
+        "I balance material success with spiritual growth"
+    ],
+    9: [
+        "I complete cycles with grace and wisdom",
+        "I serve others with compassion and love",
+        "I release what no longer serves me",
+        "I embrace endings as new beginnings",
+        "I honor my humanitarian nature"
+    ],
+    11: [
+        "I trust my intuitive insights and spiritual guidance",
+        "I am a channel for inspiration and illumination",
+        "I honor my heightened sensitivity and awareness",
+        "I share my spiritual gifts with the world",
+        "I embrace my role as an intuitive messenger"
+    ],
+    22: [
+        "I turn my grand visions into practical reality",
+        "I build something meaningful and lasting",
+        "I combine idealism with practical action",
+        "I manifest my dreams on a large scale",
+        "I am a master builder of lasting structures"
+    ],
+    33: [
+        "I teach and heal through compassion",
+        "I uplift others with my wisdom and love",
+        "I serve humanity with my gifts",
+        "I am a master teacher and healer",
+        "I express universal love through my actions"
+    ]
+}
+
+HOROSCOPE = (
+    "Today brings opportunities for growth and reflection. "
+    "Trust your intuition and be open to new experiences."
+)
@@ -0,0 +1,138 @@
+"""
+Personalized daily insights.
+
+Personal year/month/day numbers come from app.services.numerology (the iOS
+NumerologyCycleService formulas). Users without a birth date get the
+universal day number, reduce(year + month + day).
+
+The tarot card, ritual and affirmation are picked by a hash of the user ID and
+the date. A user sees the same card all day and a new one tomorrow, and every
+pod, like the warm-up job, picks the same one.
+
+Days are the user's local days (User.timezone), so keys roll over and expire
+at each user's own midnight rather than all at once.
+
+build_insights() computes the numbers and picks for a whole batch of users
+as NumPy array arithmetic and table lookups; only assembling the response
+dicts is per user.
+"""
+import zlib
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+from app.services.insight_content import (
+    AFFIRMATIONS,
+    DEFAULT_PREVIEW,
+    HOROSCOPE,
+    PERSONAL_DAY_PREVIEWS,
+    RITUALS,
+    TAROT_CARDS,
+)
+from app.services.numerology import MASTER_NUMBERS, personal_numbers, reduce_number
+
+# Number of affirmations per reduced number, indexable by an array of numbers
+_AFFIRMATION_COUNTS = np.array([len(AFFIRMATIONS.get(n, ())) or 1 for n in range(max(MASTER_NUMBERS) + 1)], dtype=np.uint64)
+
+
+def insight_key(user_id: str, day: date) -> str:
+    return f"daily_insights:{user_id}:{day.isoformat()}"
+
+
+def timezone_key(user_id: str) -> str:
+    return f"user_timezone:{user_id}"
+
+
+def is_timezone(name: str) -> bool:
+    """Whether name is a known IANA timezone."""
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=1024)
+def user_zone(name: Optional[str]) -> ZoneInfo:
+    """ZoneInfo for a stored timezone name; unknown or missing names fall back to UTC."""
+    return ZoneInfo(name) if name and is_timezone(name) else ZoneInfo("UTC")
+
+
+def local_date(tz: Optional[str], now: Optional[datetime] = None) -> date:
+    """The user's current local date."""
+    return (now or datetime.now(timezone.utc)).astimezone(user_zone(tz)).date()
+
+
+def local_midnight(day: date, tz: Optional[str]) -> datetime:
+    """The instant day starts in tz."""
+    return datetime.combine(day, time.min, tzinfo=user_zone(tz))
+
+
+def insight_ttl(day: date, tz: Optional[str] = None, now: Optional[datetime] = None) -> int:
+    """Seconds until day is over in tz, so an entry written before midnight lasts all of day."""
+    now = now or datetime.now(timezone.utc)
+    return max(60, int((local_midnight(day + timedelta(days=1), tz) - now).total_seconds()))
+
+
+def _mix(seeds: np.ndarray, day: date) -> np.ndarray:
+    """splitmix64 of (seed, day): well spread, identical on every machine."""
+    x = seeds.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + np.uint64(day.toordinal())
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def _column(values: Iterable[int], size: int) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64, count=size)
+
+
+def build_insights(
+    user_ids: Sequence[str],
+    birth_dates: Sequence[Optional[date]],
+    day: date
+) -> List[dict]:
+    """Daily insight payloads (DailyInsightSchema shape) for many users at once."""
+    size = len(user_ids)
+    has_birth = np.fromiter((b is not None for b in birth_dates), dtype=bool, count=size)
+    birth_months = _column((b.month if b else 0 for b in birth_dates), size)
+    birth_days = _column((b.day if b else 0 for b in birth_dates), size)
+    
+    years, months, days = personal_numbers(birth_months, birth_days, day)
+    numbers = np.where(has_birth, days, reduce_number(day.year + day.month + day.day))
+    
+    mixed = _mix(_column((zlib.crc32(user_id.encode()) for user_id in user_ids), size), day)
+    cards = (mixed % np.uint64(len(TAROT_CARDS))).tolist()
+    rituals = ((mixed >> np.uint64(16)) % np.uint64(len(RITUALS))).tolist()
+    affirmations = ((mixed >> np.uint64(32)) % _AFFIRMATION_COUNTS[numbers]).tolist()
+    
+    iso_day = day.isoformat()
+    payloads = []
+    for user_years, user_months, user_days, number, card, ritual, affirmation, known in zip(
+        years.tolist(), months.tolist(), days.tolist(), numbers.tolist(),
+        cards, rituals, affirmations, has_birth.tolist()
+    ):
+        payloads.append({
+            "tarotCard": TAROT_CARDS[card],
+            "horoscope": HOROSCOPE,
+            "numerology": {"number": number, "preview": PERSONAL_DAY_PREVIEWS.get(number, DEFAULT_PREVIEW)},
+            "ritual": RITUALS[ritual],
+            "affirmation": AFFIRMATIONS[number][affirmation],
+            "date": iso_day,
+            "personalNumbers": {
+                "personalYear": user_years,
+                "personalMonth": user_months,
+                "personalDay": user_days,
+            } if known else None,
+        })
+    return payloads
+
+
+def build_insight(user_id: str, birth_date: Optional[date], day: date) -> dict:
+    """Daily insight payload for one user; same result as the batch path."""
+    return build_insights([user_id], [birth_date], day)[0]
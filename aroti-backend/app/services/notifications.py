@@ -0,0 +1,105 @@
+"""
+User notifications behind a pluggable Notifier.
+
+Job handlers build a Notification and hand it to the module-level notifier.
+The API and the delayed-job worker install build_notifier() at startup: an
+EmailNotifier over SMTP when SMTP_HOST is set, otherwise a LogNotifier that
+only logs (development and tests). send() raising makes the delayed job retry.
+"""
+import asyncio
+import logging
+import smtplib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Notification:
+    """A notification for one user."""
+    user_id: str
+    title: str
+    body: str
+    data: Dict[str, str] = field(default_factory=dict)
+
+
+class Notifier(ABC):
+    """Delivers notifications to users."""
+    
+    @abstractmethod
+    async def send(self, notification: Notification) -> None:
+        """Deliver notification; raise if it should be retried."""
+
+
+class LogNotifier(Notifier):
+    """Logs notifications instead of delivering them."""
+    
+    async def send(self, notification: Notification) -> None:
+        logger.info(
+            f"Notification for user {notification.user_id}: {notification.title} - {notification.body}",
+            extra={"notification_data": notification.data}
+        )
+
+
+class EmailNotifier(Notifier):
+    """
+    Emails notifications to the address on the user's row over SMTP.
+    smtplib blocks, so each message is sent on a worker thread.
+    """
+    
+    def __init__(self, sessionmaker: async_sessionmaker = AsyncSessionLocal):
+        self.sessionmaker = sessionmaker
+    
+    async def _email_of(self, user_id: str) -> Optional[str]:
+        async with self.sessionmaker() as db:
+            return (await db.execute(select(User.email).where(User.id == user_id))).scalar_one_or_none()
+    
+    def _deliver(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=settings.smtp_timeout) as smtp:
+            if settings.smtp_starttls:
+                smtp.starttls()
+            if settings.smtp_username:
+                smtp.login(settings.smtp_username, settings.smtp_password)
+            smtp.send_message(message)
+    
+    async def send(self, notification: Notification) -> None:
+        email = await self._email_of(notification.user_id)
+        if not email:
+            # Retrying cannot help until the user adds an address
+            logger.warning(f"No email address for user {notification.user_id}, dropping '{notification.title}'")
+            return
+        
+        message = EmailMessage()
+        message["From"] = settings.smtp_from
+        message["To"] = email
+        message["Subject"] = notification.title
+        message.set_content(notification.body)
+        await asyncio.to_thread(self._deliver, message)
+        logger.info(f"Emailed '{notification.title}' to user {notification.user_id}")
+
+
+def build_notifier() -> Notifier:
+    """Notifier for the configured transport."""
+    if settings.smtp_host:
+        return EmailNotifier()
+    logger.warning("SMTP_HOST not set; notifications are only logged")
+    return LogNotifier()
+
+
+# Notifier used by job handlers; replaced with set_notifier()
+notifier: Notifier = LogNotifier()
+
+
+def set_notifier(new_notifier: Notifier) -> None:
+    global notifier
+    notifier = new_notifier
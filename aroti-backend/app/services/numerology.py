@@ -0,0 +1,158 @@
+"""
+Numerology from birth dates, matching the iOS services.
+
+    core destiny number / life path = reduce(reduce(year) + reduce(month) + reduce(day))
+        (MatrixOfFateService and BlueprintService use the same formula)
+    personal year  = reduce(birth month + birth day + year)
+    personal month = reduce(personal year + month)
+    personal day   = reduce(personal month + day)
+    karmic lessons = digits 1-9 missing from the birth date written as {year}{month}{day}
+
+reduce() sums digits until one digit or a master number (11, 22, 33) is left.
+
+Every reduction a date can need (years up to 9999 plus a month and a day) is
+looked up in tables built once at import. A single date indexes Python tuples;
+a batch indexes the same tables as NumPy arrays with whole columns of dates.
+"""
+from datetime import date
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+MASTER_NUMBERS = (11, 22, 33)
+
+# Largest sum to reduce: year 9999 + month 12 + day 31, with room to spare
+TABLE_SIZE = 10_100
+
+# date.toordinal() of 1970-01-01, day zero of datetime64
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+KARMIC_MEANINGS = {
+    1: "Learn independence and leadership",
+    2: "Develop cooperation and patience",
+    3: "Cultivate creativity and expression",
+    4: "Build structure and discipline",
+    5: "Embrace change and freedom",
+    6: "Practice service and responsibility",
+    7: "Seek wisdom and spirituality",
+    8: "Balance material and spiritual",
+    9: "Complete cycles and serve others",
+}
+NO_KARMIC_LESSONS = ("No major karmic lessons detected",)
+
+
+def reduce_number(value: int) -> int:
+    """Sum digits until one digit or a master number remains."""
+    while value > 9 and value not in MASTER_NUMBERS:
+        value = sum(int(digit) for digit in str(value))
+    return value
+
+
+def _digit_mask(value: int) -> int:
+    """Bit d - 1 set for each digit d (1-9) in value."""
+    return sum(1 << (int(digit) - 1) for digit in set(str(value)) if digit != "0")
+
+
+def _lessons(missing: int) -> Tuple[str, ...]:
+    return tuple(KARMIC_MEANINGS[d] for d in range(1, 10) if missing & (1 << (d - 1))) or NO_KARMIC_LESSONS
+
+
+REDUCED = tuple(reduce_number(n) for n in range(TABLE_SIZE))
+DIGIT_MASKS = tuple(_digit_mask(n) for n in range(TABLE_SIZE))
+# Karmic lessons by mask of missing digits
+KARMIC_LESSONS = tuple(_lessons(missing) for missing in range(512))
+
+_REDUCED = np.array(REDUCED, dtype=np.int64)
+_DIGIT_MASKS = np.array(DIGIT_MASKS, dtype=np.int64)
+
+
+def date_column(dates: Sequence[date]) -> np.ndarray:
+    """datetime64[D] array of dates (much faster than np.array on date objects)."""
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    return (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def date_parts(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Year, month and day columns of a datetime64 array."""
+    dates = dates.astype("datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    return (
+        months.astype("datetime64[Y]").astype(np.int64) + 1970,
+        months.astype(np.int64) % 12 + 1,
+        (dates - months).astype(np.int64) + 1,
+    )
+
+
+def personal_numbers(
+    birth_months: np.ndarray,
+    birth_days: np.ndarray,
+    day: date
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Personal year, month and day numbers on day."""
+    years = _REDUCED[birth_months + birth_days + day.year]
+    months = _REDUCED[years + day.month]
+    return years, months, _REDUCED[months + day.day]
+
+
+def numerology_arrays(birth_dates: np.ndarray, day: date) -> Dict[str, np.ndarray]:
+    """
+    Numbers for a column of birth dates, as arrays. karmicMask holds the
+    missing digits (bit d - 1 for digit d); KARMIC_LESSONS turns it into text.
+    """
+    years, months, days = date_parts(birth_dates)
+    destiny = _REDUCED[_REDUCED[years] + _REDUCED[months] + _REDUCED[days]]
+    personal_year, personal_month, personal_day = personal_numbers(months, days, day)
+    present = _DIGIT_MASKS[years] | _DIGIT_MASKS[months] | _DIGIT_MASKS[days]
+    return {
+        "coreDestinyNumber": destiny,
+        "lifePath": destiny,
+        "personalYear": personal_year,
+        "personalMonth": personal_month,
+        "personalDay": personal_day,
+        "karmicMask": present ^ 0x1FF,
+    }
+
+
+def numerology_batch(birth_dates: Sequence[date], day: date) -> List[dict]:
+    """
+    Numerology payloads (NumerologySchema shape) for many birth dates at once.
+    karmicLessons are shared tuples from KARMIC_LESSONS; they serialize as lists.
+    """
+    columns = numerology_arrays(date_column(birth_dates), day)
+    return [
+        {
+            "birthDate": birth_date.isoformat(),
+            "coreDestinyNumber": destiny,
+            "lifePath": destiny,
+            "personalYear": personal_year,
+            "personalMonth": personal_month,
+            "personalDay": personal_day,
+            "karmicLessons": KARMIC_LESSONS[missing],
+        }
+        for birth_date, destiny, personal_year, personal_month, personal_day, missing in zip(
+            birth_dates,
+            columns["coreDestinyNumber"].tolist(),
+            columns["personalYear"].tolist(),
+            columns["personalMonth"].tolist(),
+            columns["personalDay"].tolist(),
+            columns["karmicMask"].tolist(),
+        )
+    ]
+
+
+def numerology(birth_date: date, day: date) -> dict:
+    """Numerology payload for one birth date, from the lookup tables."""
+    year, month, birth_day = birth_date.year, birth_date.month, birth_date.day
+    destiny = REDUCED[REDUCED[year] + REDUCED[month] + REDUCED[birth_day]]
+    personal_year = REDUCED[month + birth_day + day.year]
+    personal_month = REDUCED[personal_year + day.month]
+    present = DIGIT_MASKS[year] | DIGIT_MASKS[month] | DIGIT_MASKS[birth_day]
+    return {
+        "birthDate": birth_date.isoformat(),
+        "coreDestinyNumber": destiny,
+        "lifePath": destiny,
+        "personalYear": personal_year,
+        "personalMonth": personal_month,
+        "personalDay": REDUCED[personal_month + day.day],
+        "karmicLessons": KARMIC_LESSONS[present ^ 0x1FF],
+    }
@@ -0,0 +1,236 @@
+"""
+Transactional outbox.
+
+Routes record side effects with enqueue()/invalidate() on their own DB
+session, so the events commit or roll back together with the write. The
+relay then delivers them off the request path in three steps:
+claim: a short transaction picks due rows FOR UPDATE SKIP LOCKED (so every
+    API pod can run one) and leases them by moving available_at
+    OUTBOX_LEASE_SECONDS ahead; a relay that dies mid-batch loses its lease.
+deliver: with no transaction or connection held, all cache deletes of the
+    batch become one Redis call (bumping the specialist catalog version when
+    specialist:* keys are among them); workflow starts and reminder updates
+    run concurrently, each bounded by OUTBOX_DELIVERY_TIMEOUT.
+settle: a second short transaction deletes delivered rows and backs off
+    failed ones.
+Delivery is at-least-once; every handler is idempotent.
+"""
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from temporalio.exceptions import WorkflowAlreadyStartedError
+
+from app.cache.redis_client import redis_client
+from app.cache.specialist_catalog import bump_catalog_version, is_specialist_key
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.outbox import OutboxEvent
+from app.observability.tracing import CONSUMER, SpanContext, current_traceparent, tracer
+from app.scheduler.reminders import REMINDER_JOB, reminder_job_id, reminder_run_at
+from app.scheduler.delayed_jobs import scheduler
+from app.workflows.client import temporal_client
+from app.workflows.session_booking import (
+    TASK_QUEUE,
+    BookingRequest,
+    SessionBookingWorkflow,
+    booking_workflow_id
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_DELETE = "cache.delete"
+WORKFLOW_START = "workflow.start"
+REMINDER_SCHEDULE = "reminder.schedule"
+REMINDER_CANCEL = "reminder.cancel"
+
+
+def enqueue(db, kind: str, payload: Dict[str, Any], key: Optional[str] = None) -> None:
+    """Add an event to the caller's transaction (works with Session and AsyncSession)."""
+    db.add(OutboxEvent(kind=kind, key=key, payload=payload, traceparent=current_traceparent()))
+
+
+def invalidate(db, *keys: str) -> None:
+    """
+    Delete cache keys once the transaction commits.
+    This process's L1 copies are dropped right away so the caller reads its own write.
+    """
+    for key in keys:
+        redis_client.local.delete(key)
+    enqueue(db, CACHE_DELETE, {"keys": list(keys)})
+
+
+async def _start_workflow(payload: Dict[str, Any]) -> None:
+    client = await temporal_client.get()
+    try:
+        await client.start_workflow(
+            SessionBookingWorkflow.run,
+            BookingRequest(**payload),
+            id=booking_workflow_id(payload["session_id"]),
+            task_queue=TASK_QUEUE,
+            memo={"user_id": payload["user_id"]}
+        )
+    except WorkflowAlreadyStartedError:
+        # Redelivery of a start that already went through
+        pass
+
+
+async def _schedule_reminder(payload: Dict[str, Any]) -> None:
+    run_at = reminder_run_at(payload["date"], payload["time"])
+    if run_at is None:
+        return
+    if not await scheduler.schedule(reminder_job_id(payload["session_id"]), REMINDER_JOB, payload, run_at):
+        raise RuntimeError("Failed to schedule reminder")
+
+
+async def _cancel_reminder(payload: Dict[str, Any]) -> None:
+    if await scheduler.cancel(reminder_job_id(payload["session_id"])) is None:
+        raise RuntimeError("Failed to cancel reminder")
+
+
+# Per-event handlers; cache deletes are batched separately
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+    WORKFLOW_START: _start_workflow,
+    REMINDER_SCHEDULE: _schedule_reminder,
+    REMINDER_CANCEL: _cancel_reminder,
+}
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next delivery attempt: doubling, capped."""
+    return min(settings.outbox_max_backoff, 2 ** attempts)
+
+
+class OutboxRelay:
+    """Background task delivering outbox events."""
+    
+    def __init__(self, sessionmaker=AsyncSessionLocal):
+        self._sessionmaker = sessionmaker
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def notify(self) -> None:
+        """Wake the relay after a commit instead of waiting for the next poll."""
+        self._wakeup.set()
+    
+    async def _deliver(self, events: List[OutboxEvent]) -> Dict[int, str]:
+        """Deliver a batch; returns the error for each event that failed."""
+        failures: Dict[int, str] = {}
+        
+        deletes = [event for event in events if event.kind == CACHE_DELETE]
+        if deletes:
+            keys = sorted({key for event in deletes for key in event.payload["keys"]})
+            if not await redis_client.delete_many(keys):
+                failures.update({event.id: "Redis delete failed" for event in deletes})
+            elif any(is_specialist_key(key) for key in keys) and await bump_catalog_version() is None:
+                failures.update({event.id: "Catalog version bump failed" for event in deletes})
+        
+        others = [event for event in events if event.kind != CACHE_DELETE]
+        
+        async def deliver(event: OutboxEvent) -> None:
+            handler = HANDLERS.get(event.kind)
+            # Delivery joins the trace of the request that enqueued the event
+            with tracer.span(
+                f"outbox {event.kind}",
+                CONSUMER,
+                {"outbox.event_id": event.id, "outbox.attempts": event.attempts},
+                SpanContext.from_traceparent(event.traceparent)
+            ) as span:
+                try:
+                    if handler is None:
+                        raise LookupError(f"Unknown outbox event kind {event.kind}")
+                    await asyncio.wait_for(handler(event.payload), settings.outbox_delivery_timeout)
+                except asyncio.TimeoutError:
+                    failures[event.id] = f"Timed out after {settings.outbox_delivery_timeout}s"
+                    span.set_error(TimeoutError(failures[event.id]))
+                except Exception as e:
+                    failures[event.id] = str(e) or type(e).__name__
+                    span.set_error(e)
+        
+        await asyncio.gather(*(deliver(event) for event in others))
+        return failures
+    
+    async def _claim(self) -> List[OutboxEvent]:
+        """Lease a batch of due events; the row locks are held only for this transaction."""
+        async with self._sessionmaker() as db:
+            now = datetime.utcnow()
+            events = (await db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.available_at <= now)
+                .order_by(OutboxEvent.id)
+                .limit(settings.outbox_batch_size)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+            for event in events:
+                event.available_at = now + timedelta(seconds=settings.outbox_lease_seconds)
+            await db.commit()
+            return events
+    
+    async def _settle(self, events: List[OutboxEvent], failures: Dict[int, str]) -> None:
+        """Delete delivered events and back off failed ones."""
+        async with self._sessionmaker() as db:
+            now = datetime.utcnow()
+            delivered = [event.id for event in events if event.id not in failures]
+            if delivered:
+                await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(delivered)))
+            for event in events:
+                if event.id in failures:
+                    attempts = event.attempts + 1
+                    last_error = failures[event.id][:1000]
+                    await db.execute(
+                        update(OutboxEvent)
+                        .where(OutboxEvent.id == event.id)
+                        .values(
+                            attempts=attempts,
+                            available_at=now + timedelta(seconds=retry_delay(attempts)),
+                            last_error=last_error
+                        )
+                    )
+                    logger.warning(f"Outbox event {event.id} ({event.kind}) failed, attempt {attempts}: {last_error}")
+            await db.commit()
+    
+    async def relay_once(self) -> int:
+        """Claim, deliver and settle one batch of due events. Returns the number of events handled."""
+        events = await self._claim()
+        if not events:
+            return 0
+        
+        failures = await self._deliver(events)
+        await self._settle(events, failures)
+        return len(events)
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                handled = await self.relay_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox relay error: {e}")
+                handled = 0
+            if handled < settings.outbox_batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.outbox_poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+    
+    async def start(self) -> None:
+        """Start relaying in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def close(self) -> None:
+        """Stop relaying; waits for the task, so nothing is cut off mid-shutdown by the engine dispose."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+# Global relay instance
+outbox_relay = OutboxRelay()
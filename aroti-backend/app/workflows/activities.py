@@ -1,11 +1,18 @@
 """
 Temporal activities for session booking workflow.
+
+Activities that use the synchronous SessionLocal are plain functions: the
+worker runs them on its activity thread pool so they never block the event
+loop. Non-blocking activities stay async.
 """
 from temporalio import activity
+from temporalio.exceptions import ApplicationError
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models.session import Session as SessionModel
 from app.models.specialist import Specialist
+from app.services.booking import BookingError, SlotTaken, reserve_slot_sync
+from app.scheduler.reminders import reminder_run_at, schedule_session_reminder
 import logging
 from typing import TYPE_CHECKING
 
@@ -16,7 +23,7 @@ logger = logging.getLogger(__name__)
 
 
 @activity.defn
-async def check_specialist_availability(
+def check_specialist_availability(
     specialist_id: str,
     date: str,
     time: str
@@ -44,42 +51,38 @@ async def check_specialist_availability(
 
 
 @activity.defn
-async def create_session_record(booking_request: dict) -> dict:
+def create_session_record(booking_request: dict) -> dict:
     """
     Create session record in database.
+    Booking failures (slot taken, specialist missing or unavailable) are
+    non-retryable ApplicationErrors typed with the BookingError subclass name.
     """
     db: Session = SessionLocal()
     try:
-        specialist = db.query(Specialist).filter(
-            Specialist.id == booking_request["specialist_id"]
-        ).first()
-        
-        if not specialist:
-            raise ValueError(f"Specialist {booking_request['specialist_id']} not found")
-        
-        session = SessionModel(
-            id=booking_request["session_id"],
-            specialist_id=booking_request["specialist_id"],
-            user_id=booking_request["user_id"],
-            specialist_name=specialist.name,
-            specialist_photo=specialist.photo,
-            specialty=specialist.specialty,
-            date=booking_request["date"],
-            time=booking_request["time"],
-            duration=50,
-            price=specialist.price,
-            status="pending"
-        )
-        
-        db.add(session)
+        try:
+            row = reserve_slot_sync(
+                db,
+                session_id=booking_request["session_id"],
+                specialist_id=booking_request["specialist_id"],
+                user_id=booking_request["user_id"],
+                date=booking_request["date"],
+                time=booking_request["time"]
+            )
+        except SlotTaken:
+            # A retried attempt may find the slot held by its own earlier insert
+            existing = db.get(SessionModel, booking_request["session_id"])
+            if existing is None:
+                raise ApplicationError("Slot already booked", type="SlotTaken", non_retryable=True)
+            row = {c.name: getattr(existing, c.name) for c in SessionModel.__table__.columns}
+        except BookingError as e:
+            raise ApplicationError(str(e), type=type(e).__name__, non_retryable=True)
         db.commit()
-        db.refresh(session)
         
         return {
-            "session_id": session.id,
-            "specialist_name": session.specialist_name,
-            "date": session.date,
-            "time": session.time
+            "session_id": row["id"],
+            "specialist_name": row["specialist_name"],
+            "date": row["date"],
+            "time": row["time"]
         }
     finally:
         db.close()
@@ -98,17 +101,22 @@ async def send_confirmation_email(user_id: str, session_data: dict) -> None:
 
 @activity.defn
 async def schedule_reminder(
+    session_id: str,
     user_id: str,
     date: str,
     time: str
 ) -> None:
     """
     Schedule a reminder notification 24 hours before the session.
-    TODO: Integrate with notification service
+    Enqueued on the Redis delayed-job scheduler instead of a sleeping workflow.
+    Past or unparseable sessions need no reminder; failing to enqueue one raises
+    a retryable ApplicationError so the retry policy applies.
     """
-    logger.info(f"Scheduling reminder for user {user_id} for session on {date} at {time}")
-    # Placeholder for reminder scheduling logic
-    pass
+    if reminder_run_at(date, time) is None:
+        logger.info(f"No reminder needed for session {session_id} on {date} at {time}")
+        return
+    if not await schedule_session_reminder(session_id, user_id, date, time):
+        raise ApplicationError(f"Reminder for session {session_id} was not scheduled", type="ReminderNotScheduled")
 
 
 @activity.defn
@@ -0,0 +1,41 @@
+"""
+Long-lived Temporal client shared by API requests.
+"""
+import asyncio
+import logging
+from typing import Optional
+from temporalio.client import Client
+
+from app.config import settings
+from app.workflows.tracing import TracingInterceptor
+
+logger = logging.getLogger(__name__)
+
+
+class TemporalClient:
+    """Connects once per process; the SDK client multiplexes all calls over one channel."""
+    
+    def __init__(self):
+        self._client: Optional[Client] = None
+        self._lock = asyncio.Lock()
+    
+    async def get(self) -> Client:
+        """Return the shared client, connecting on first use."""
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._client = await Client.connect(
+                        f"{settings.temporal_host}:{settings.temporal_port}",
+                        namespace=settings.temporal_namespace,
+                        interceptors=[TracingInterceptor()]
+                    )
+                    logger.info(f"Connected to Temporal at {settings.temporal_host}:{settings.temporal_port}")
+        return self._client
+    
+    async def close(self) -> None:
+        """Drop the client; the SDK closes its channel when it is released."""
+        self._client = None
+
+
+# Global Temporal client instance
+temporal_client = TemporalClient()
@@ -0,0 +1,119 @@
+"""
+Activity executor and timing for the Temporal worker.
+
+Blocking activities run on ActivityThreadPool, which counts submissions
+still waiting for a thread. ActivityTimingInterceptor records per-activity
+execution latency and schedule-to-start latency (time spent queued on the
+Temporal server). Both are logged periodically by the worker.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from temporalio import activity
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor,
+)
+
+
+class ActivityThreadPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor that tracks queued and running activities."""
+    
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix="activity")
+        self._counts_lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+    
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        with self._counts_lock:
+            self.queued += 1
+        
+        def run():
+            with self._counts_lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._counts_lock:
+                    self.running -= 1
+        
+        return super().submit(run)
+    
+    def stats(self) -> Dict[str, int]:
+        return {"threads": self._max_workers, "queued": self.queued, "running": self.running}
+
+
+class LatencyStats:
+    """Count, total and max of observed durations, in seconds."""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def summary(self) -> Dict[str, float]:
+        avg = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "avg_ms": round(avg * 1000, 1), "max_ms": round(self.max * 1000, 1)}
+
+
+class ActivityTimingInterceptor(Interceptor):
+    """Records latency per activity type; stats are reset each time they are drained."""
+    
+    def __init__(self):
+        self.execution: Dict[str, LatencyStats] = {}
+        self.schedule_to_start: Dict[str, LatencyStats] = {}
+        self.failures: Dict[str, int] = {}
+    
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _TimingActivityInbound(next, self)
+    
+    def record(self, activity_type: str, seconds: float, queued_seconds: float, failed: bool) -> None:
+        self.execution.setdefault(activity_type, LatencyStats()).observe(seconds)
+        self.schedule_to_start.setdefault(activity_type, LatencyStats()).observe(queued_seconds)
+        if failed:
+            self.failures[activity_type] = self.failures.get(activity_type, 0) + 1
+    
+    def drain(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries since the previous drain, keyed by activity type."""
+        report = {
+            name: {
+                "execution": stats.summary(),
+                "schedule_to_start": self.schedule_to_start[name].summary(),
+                "failures": self.failures.get(name, 0)
+            }
+            for name, stats in self.execution.items()
+        }
+        self.execution = {}
+        self.schedule_to_start = {}
+        self.failures = {}
+        return report
+
+
+class _TimingActivityInbound(ActivityInboundInterceptor):
+    def __init__(self, next: ActivityInboundInterceptor, owner: ActivityTimingInterceptor):
+        super().__init__(next)
+        self._owner = owner
+    
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        info = activity.info()
+        queued = (info.started_time - info.current_attempt_scheduled_time).total_seconds()
+        start = time.perf_counter()
+        failed = False
+        try:
+            return await super().execute_activity(input)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            # For thread-pool activities this includes any wait for a free thread
+            self._owner.record(info.activity_type, time.perf_counter() - start, max(queued, 0.0), failed)
@@ -2,16 +2,28 @@
 Temporal workflow for session booking process.
 """
 from dataclasses import dataclass
+from typing import Optional
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError, ApplicationError
 
-from app.workflows.activities import (
-    check_specialist_availability,
-    create_session_record,
-    send_confirmation_email,
-    schedule_reminder,
-    generate_meeting_link
-)
+# Activities pull in SQLAlchemy and app settings; keep them out of the sandbox
+with workflow.unsafe.imports_passed_through():
+    from app.workflows.activities import (
+        check_specialist_availability,
+        create_session_record,
+        send_confirmation_email,
+        schedule_reminder,
+        generate_meeting_link
+    )
+
+
+TASK_QUEUE = "session-booking"
+
+
+def booking_workflow_id(booking_id: str) -> str:
+    """Workflow ID for a booking; the booking ID doubles as the session ID."""
+    return f"booking-{booking_id}"
 
 
 @dataclass
@@ -28,6 +40,15 @@ class BookingRequest:
 class SessionBookingWorkflow:
     """Workflow for booking a session with a specialist."""
     
+    def __init__(self):
+        self._step = "checking_availability"
+        self._error: Optional[str] = None
+    
+    @workflow.query
+    def status(self) -> dict:
+        """Current step, for GET /api/sessions/bookings/{id} while the workflow runs."""
+        return {"step": self._step, "error": self._error}
+    
     @workflow.run
     async def run(self, booking_request: BookingRequest) -> dict:
         """
@@ -58,27 +79,31 @@ class SessionBookingWorkflow:
         )
         
         if not is_available:
-            return {
-                "success": False,
-                "error": "Specialist is not available at the requested time"
-            }
+            return self._reject("Specialist is not available at the requested time")
         
-        # Step 2: Create session record
-        session_data = await workflow.execute_activity(
-            create_session_record,
-            {
-                "session_id": booking_request.session_id,
-                "specialist_id": booking_request.specialist_id,
-                "user_id": booking_request.user_id,
-                "date": booking_request.date,
-                "time": booking_request.time
-            },
-            start_to_close_timeout=30.0,
-            retry_policy=retry_policy
-        )
+        # Step 2: Create session record (the unique slot index settles races)
+        self._step = "creating_session"
+        try:
+            session_data = await workflow.execute_activity(
+                create_session_record,
+                {
+                    "session_id": booking_request.session_id,
+                    "specialist_id": booking_request.specialist_id,
+                    "user_id": booking_request.user_id,
+                    "date": booking_request.date,
+                    "time": booking_request.time
+                },
+                start_to_close_timeout=30.0,
+                retry_policy=retry_policy
+            )
+        except ActivityError as e:
+            if isinstance(e.cause, ApplicationError) and e.cause.type == "SlotTaken":
+                return self._reject("Specialist is not available at the requested time")
+            raise
         
         # Step 3: Send confirmation email (fire and forget)
-        workflow.execute_activity(
+        self._step = "confirming"
+        workflow.start_activity(
             send_confirmation_email,
             booking_request.user_id,
             session_data,
@@ -87,16 +112,20 @@ class SessionBookingWorkflow:
         )
         
         # Step 4: Schedule reminder (24 hours before session)
-        workflow.execute_activity(
+        workflow.start_activity(
             schedule_reminder,
-            booking_request.user_id,
-            booking_request.date,
-            booking_request.time,
+            args=[
+                booking_request.session_id,
+                booking_request.user_id,
+                booking_request.date,
+                booking_request.time
+            ],
             start_to_close_timeout=30.0,
             retry_policy=retry_policy
         )
         
         # Step 5: Generate meeting link
+        self._step = "generating_meeting_link"
         meeting_link = await workflow.execute_activity(
             generate_meeting_link,
             booking_request.session_id,
@@ -104,8 +133,14 @@ class SessionBookingWorkflow:
             retry_policy=retry_policy
         )
         
+        self._step = "completed"
         return {
             "success": True,
             "session_id": booking_request.session_id,
             "meeting_link": meeting_link
         }
+    
+    def _reject(self, error: str) -> dict:
+        self._step = "rejected"
+        self._error = error
+        return {"success": False, "error": error}
@@ -0,0 +1,93 @@
+"""
+Trace context across Temporal.
+
+TracingInterceptor is installed on the Temporal client in the API and in the
+worker. Starting a workflow opens a span and sends its traceparent as a
+Temporal header. Workflow code only copies that header onto the activities
+it schedules, which is deterministic and safe to replay. Each activity then
+runs in a span that is a child of the workflow start, so the request, the
+workflow start and every activity (with its SQL and Redis spans) share one trace.
+"""
+from typing import Any, Mapping, Optional, Type
+
+from temporalio import activity, workflow
+from temporalio.api.common.v1 import Payload
+from temporalio.client import Interceptor as ClientInterceptor
+from temporalio.client import OutboundInterceptor, StartWorkflowInput, WorkflowHandle
+from temporalio.converter import PayloadConverter
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor as WorkerInterceptor,
+    StartActivityInput,
+    WorkflowInboundInterceptor,
+    WorkflowInterceptorClassInput,
+    WorkflowOutboundInterceptor,
+)
+
+from app.observability.tracing import PRODUCER, SERVER, SpanContext, tracer
+
+TRACE_HEADER = "traceparent"
+
+
+def _with_traceparent(headers: Mapping[str, Payload], traceparent: str) -> Mapping[str, Payload]:
+    return {**headers, TRACE_HEADER: PayloadConverter.default.to_payloads([traceparent])[0]}
+
+
+def _traceparent(headers: Mapping[str, Payload]) -> Optional[str]:
+    payload = headers.get(TRACE_HEADER)
+    if payload is None:
+        return None
+    return PayloadConverter.default.from_payloads([payload])[0]
+
+
+class TracingInterceptor(ClientInterceptor, WorkerInterceptor):
+    """
+    Client and worker interceptor; workers built from a client that has it pick it up
+    automatically, so it must not also be passed to Worker(interceptors=...).
+    """
+    
+    def intercept_client(self, next: OutboundInterceptor) -> OutboundInterceptor:
+        return _TracingClientOutbound(next)
+    
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _TracingActivityInbound(next)
+    
+    def workflow_interceptor_class(
+        self, input: WorkflowInterceptorClassInput
+    ) -> Optional[Type[WorkflowInboundInterceptor]]:
+        return _TracingWorkflowInbound
+
+
+class _TracingClientOutbound(OutboundInterceptor):
+    async def start_workflow(self, input: StartWorkflowInput) -> WorkflowHandle[Any, Any]:
+        attributes = {"temporal.workflow_type": input.workflow, "temporal.workflow_id": input.id,
+                      "temporal.task_queue": input.task_queue}
+        with tracer.span(f"StartWorkflow:{input.workflow}", PRODUCER, attributes) as span:
+            if span.context is not None:
+                input.headers = _with_traceparent(input.headers, span.context.traceparent())
+            return await super().start_workflow(input)
+
+
+class _TracingActivityInbound(ActivityInboundInterceptor):
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        info = activity.info()
+        attributes = {"temporal.activity_type": info.activity_type, "temporal.workflow_id": info.workflow_id,
+                      "temporal.attempt": info.attempt}
+        parent = SpanContext.from_traceparent(_traceparent(input.headers))
+        # Sync activities run on the worker's thread pool with a copy of this context
+        with tracer.span(f"RunActivity:{info.activity_type}", SERVER, attributes, parent):
+            return await super().execute_activity(input)
+
+
+class _TracingWorkflowInbound(WorkflowInboundInterceptor):
+    def init(self, outbound: WorkflowOutboundInterceptor) -> None:
+        super().init(_TracingWorkflowOutbound(outbound))
+
+
+class _TracingWorkflowOutbound(WorkflowOutboundInterceptor):
+    def start_activity(self, input: StartActivityInput) -> workflow.ActivityHandle:
+        header = workflow.info().headers.get(TRACE_HEADER)
+        if header is not None:
+            input.headers = {**input.headers, TRACE_HEADER: header}
+        return super().start_activity(input)
@@ -7,7 +7,11 @@ from temporalio.client import Client
 from temporalio.worker import Worker
 
 from app.config import settings
-from app.workflows.session_booking import SessionBookingWorkflow
+from app.observability.logs import configure_logging
+from app.observability.tracing import tracer
+from app.workflows.instrumentation import ActivityThreadPool, ActivityTimingInterceptor
+from app.workflows.session_booking import TASK_QUEUE, SessionBookingWorkflow
+from app.workflows.tracing import TracingInterceptor
 from app.workflows.activities import (
     check_specialist_availability,
     create_session_record,
@@ -19,20 +23,18 @@ from app.workflows.activities import (
 logger = logging.getLogger(__name__)
 
 
-async def run_worker():
-    """Run Temporal worker."""
-    # Connect to Temporal server
-    client = await Client.connect(
-        f"{settings.temporal_host}:{settings.temporal_port}",
-        namespace=settings.temporal_namespace
-    )
-    
-    logger.info(f"Connected to Temporal at {settings.temporal_host}:{settings.temporal_port}")
-    
-    # Create worker
-    worker = Worker(
+def build_worker(
+    client: Client,
+    activity_pool: ActivityThreadPool,
+    timing: ActivityTimingInterceptor
+) -> Worker:
+    """
+    Worker with concurrency limits from settings and blocking activities on activity_pool.
+    Interceptors on the client (tracing) are applied too.
+    """
+    return Worker(
         client,
-        task_queue="session-booking",
+        task_queue=TASK_QUEUE,
         workflows=[SessionBookingWorkflow],
         activities=[
             check_specialist_availability,
@@ -40,13 +42,73 @@ async def run_worker():
             send_confirmation_email,
             schedule_reminder,
             generate_meeting_link
-        ]
+        ],
+        activity_executor=activity_pool,
+        interceptors=[timing],
+        max_concurrent_activities=settings.temporal_max_concurrent_activities,
+        max_concurrent_workflow_tasks=settings.temporal_max_concurrent_workflow_tasks,
+        max_concurrent_activity_task_polls=settings.temporal_max_concurrent_activity_task_polls,
+        max_concurrent_workflow_task_polls=settings.temporal_max_concurrent_workflow_task_polls
+    )
+
+
+async def report_stats(
+    activity_pool: ActivityThreadPool,
+    timing: ActivityTimingInterceptor,
+    interval: float
+) -> None:
+    """Log activity thread-pool depth and per-activity latency every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        pool = activity_pool.stats()
+        logger.info(
+            f"Activity pool: {pool['running']}/{pool['threads']} threads busy, {pool['queued']} queued"
+        )
+        for name, report in timing.drain().items():
+            execution = report["execution"]
+            queued = report["schedule_to_start"]
+            logger.info(
+                f"Activity {name}: {execution['count']} runs, "
+                f"avg {execution['avg_ms']}ms, max {execution['max_ms']}ms, "
+                f"schedule-to-start avg {queued['avg_ms']}ms, max {queued['max_ms']}ms, "
+                f"{report['failures']} failed"
+            )
+
+
+async def run_worker():
+    """Run Temporal worker."""
+    # Connect to Temporal server; the tracing interceptor also applies to the worker
+    client = await Client.connect(
+        f"{settings.temporal_host}:{settings.temporal_port}",
+        namespace=settings.temporal_namespace,
+        interceptors=[TracingInterceptor()]
     )
     
-    logger.info("Starting Temporal worker...")
-    await worker.run()
+    logger.info(f"Connected to Temporal at {settings.temporal_host}:{settings.temporal_port}")
+    
+    # One thread per activity slot unless configured otherwise; every thread may hold a DB connection
+    threads = settings.temporal_activity_threads or settings.temporal_max_concurrent_activities
+    activity_pool = ActivityThreadPool(threads)
+    timing = ActivityTimingInterceptor()
+    worker = build_worker(client, activity_pool, timing)
+    
+    reporter = None
+    if settings.temporal_stats_interval > 0:
+        reporter = asyncio.create_task(report_stats(activity_pool, timing, settings.temporal_stats_interval))
+    
+    logger.info(
+        f"Starting Temporal worker: {settings.temporal_max_concurrent_activities} activity slots "
+        f"on {threads} threads, {settings.temporal_max_concurrent_workflow_tasks} workflow task slots"
+    )
+    try:
+        await worker.run()
+    finally:
+        if reporter:
+            reporter.cancel()
+        activity_pool.shutdown(wait=True)
 
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
+    configure_logging(logging.INFO, settings.log_format)
+    tracer.exporter.service_name = f"{settings.trace_service_name}-worker"
     asyncio.run(run_worker())
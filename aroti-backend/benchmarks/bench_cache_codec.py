@@ -0,0 +1,107 @@
+"""
+Cache codec micro-benchmark: encoded size and encode/decode time per payload.
+
+Payloads are cache_aside envelopes built the way the endpoints build them:
+a specialist detail, a 50-review page, the daily insights body and a
+100-row specialists list (the old specialists:list:* value). "legacy" is the
+json.dumps text RedisClient stored before the codec; codecs whose compression
+module is not installed are skipped.
+
+Usage (no services needed):
+    python -m benchmarks.bench_cache_codec [iterations]
+"""
+import json
+import sys
+import time
+from datetime import date
+
+from app.cache.cache_aside import serialize
+from app.cache.codec import COMPRESSIONS, Codec
+from app.services.insights import build_insight
+
+LANGUAGES = ["en", "es", "pt", "fr", "de"]
+CATEGORIES = ["tarot", "astrology", "numerology", "reiki", "meditation"]
+
+
+def specialist(i: int) -> dict:
+    return {
+        "id": f"{i:08d}-1c2d-4e5f-8a9b-0c1d2e3f4a5b",
+        "name": f"Specialist {i}",
+        "specialty": "Tarot & Astrology",
+        "categories": CATEGORIES[i % 3:i % 3 + 2],
+        "country": "Portugal",
+        "countryFlag": "🇵🇹",
+        "rating": 4.0 + (i % 10) / 10,
+        "reviewCount": 100 + i,
+        "sessionCount": 1000 + 7 * i,
+        "price": 40 + i % 60,
+        "bio": "Intuitive reader with a decade of practice in tarot, astrology and energy work. " * 3,
+        "yearsOfPractice": 5 + i % 20,
+        "photo": f"https://cdn.aroti.app/specialists/{i}.jpg",
+        "available": i % 4 != 0,
+        "languages": LANGUAGES[i % 2:i % 2 + 3],
+        "addedDate": "2024-01-15"
+    }
+
+
+def review(i: int) -> dict:
+    return {
+        "id": f"r{i}",
+        "specialistId": "00000001-1c2d-4e5f-8a9b-0c1d2e3f4a5b",
+        "userName": f"User {i}",
+        "rating": 5 - i % 2,
+        "comment": "Thoughtful, precise reading that helped me see things more clearly.",
+        "date": "2024-03-01"
+    }
+
+
+def envelope(value, headers=None) -> dict:
+    cached = serialize(value, headers)
+    return {"body": cached.body, "etag": cached.etag, "headers": cached.headers, "soft": time.time() + 600}
+
+
+PAYLOADS = {
+    "specialist detail": envelope(specialist(1)),
+    "reviews page (50)": envelope([review(i) for i in range(50)], {"X-Next-Cursor": "eyJrIjoicjUwIn0"}),
+    "daily insights": envelope(build_insight("user-1", date(1990, 7, 15), date.today())),
+    "specialists list (100)": envelope([specialist(i) for i in range(100)]),
+}
+
+
+def codecs() -> dict:
+    result = {}
+    for serializer in ("json", "msgpack"):
+        for compression in ("none", "zlib", "zstd", "lz4"):
+            if COMPRESSIONS[compression] is None:
+                continue
+            result[f"{serializer}+{compression}"] = Codec(serializer, compression, threshold=1024)
+    return result
+
+
+def timed(fn, iterations: int) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int) -> None:
+    for name, payload in PAYLOADS.items():
+        legacy = json.dumps(payload).encode()
+        print(f"{name}: legacy {len(legacy)} bytes")
+        print(f"  {'codec':<16}{'bytes':>8}{'ratio':>8}{'encode us':>12}{'decode us':>12}")
+        rows = [("legacy", legacy, lambda: json.dumps(payload).encode(), lambda: json.loads(legacy))]
+        for label, codec in codecs().items():
+            data = codec.encode(payload)
+            rows.append((label, data, lambda c=codec: c.encode(payload), lambda c=codec, d=data: c.decode(d)))
+        for label, data, encode, decode in rows:
+            print(
+                f"  {label:<16}{len(data):>8}{len(data) / len(legacy):>8.2f}"
+                f"{timed(encode, iterations):>12.1f}{timed(decode, iterations):>12.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
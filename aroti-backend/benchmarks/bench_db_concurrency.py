@@ -0,0 +1,61 @@
+"""
+Concurrency benchmark: sync SessionLocal vs async AsyncSessionLocal.
+
+Simulates N concurrent requests on one event loop, each running a query that
+takes QUERY_SECONDS on the server (pg_sleep). The "before" run calls the
+synchronous session from inside a coroutine, the way the routers used to; the
+"after" run awaits the async session.
+
+Usage (requires a reachable Postgres at DATABASE_URL):
+    python -m benchmarks.bench_db_concurrency [concurrency] [query_seconds]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.database import SessionLocal, AsyncSessionLocal, async_engine
+
+
+async def sync_request(query_seconds: float) -> None:
+    """Handler body before: blocking query inside async def."""
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT pg_sleep(:s)"), {"s": query_seconds})
+    finally:
+        db.close()
+
+
+async def async_request(query_seconds: float) -> None:
+    """Handler body after: awaited query on AsyncSession."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT pg_sleep(:s)"), {"s": query_seconds})
+
+
+async def run(handler, concurrency: int, query_seconds: float) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(query_seconds) for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def main(concurrency: int, query_seconds: float) -> None:
+    # Warm both pools so connection setup is not measured
+    await run(sync_request, 1, 0)
+    await run(async_request, 1, 0)
+
+    before = await run(sync_request, concurrency, query_seconds)
+    after = await run(async_request, concurrency, query_seconds)
+
+    print(f"{concurrency} concurrent requests, {query_seconds * 1000:.0f} ms query each")
+    print(f"  before (sync session):  {before:.3f}s total, {concurrency / before:.1f} req/s")
+    print(f"  after  (async session): {after:.3f}s total, {concurrency / after:.1f} req/s")
+    print(f"  speedup: {before / after:.1f}x")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    query_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    asyncio.run(main(concurrency, query_seconds))
@@ -0,0 +1,79 @@
+"""
+Numerology throughput over many birth dates.
+
+Compares, on the same random birth dates:
+
+- per date (ported): the iOS services' approach, reducing with string digit
+  sums on every call (run on a sample and scaled, it is slow)
+- per date (tables): numerology(), the GET /api/numerology/me path
+- arrays: numerology_arrays() over a datetime64 column, the numbers only
+- batch payloads: numerology_batch(), arrays plus building the response dicts
+
+Usage (no services needed):
+    python -m benchmarks.bench_numerology [birthdates]
+"""
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+from app.services.numerology import KARMIC_MEANINGS, numerology, numerology_arrays, numerology_batch
+
+TODAY = date(2026, 10, 17)
+PORTED_SAMPLE = 100_000
+
+
+def ported_reduce(value: int) -> int:
+    while value > 9 and value not in (11, 22, 33):
+        value = sum(int(digit) for digit in str(value))
+    return value
+
+
+def ported(birth_date: date, day: date) -> dict:
+    """Line-by-line port of the Swift services, for comparison."""
+    year, month, birth_day = birth_date.year, birth_date.month, birth_date.day
+    destiny = ported_reduce(ported_reduce(year) + ported_reduce(month) + ported_reduce(birth_day))
+    personal_year = ported_reduce(month + birth_day + day.year)
+    personal_month = ported_reduce(personal_year + day.month)
+    digits = set(f"{year}{month}{birth_day}")
+    return {
+        "birthDate": birth_date.isoformat(),
+        "coreDestinyNumber": destiny,
+        "lifePath": destiny,
+        "personalYear": personal_year,
+        "personalMonth": personal_month,
+        "personalDay": ported_reduce(personal_month + day.day),
+        "karmicLessons": [KARMIC_MEANINGS[d] for d in range(1, 10) if str(d) not in digits]
+        or ["No major karmic lessons detected"],
+    }
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(count: int) -> None:
+    rng = np.random.default_rng(7)
+    column = np.datetime64("1930-01-01") + rng.integers(0, 80 * 365, count).astype("timedelta64[D]")
+    birth_dates = column.astype(object).tolist()
+    sample = birth_dates[:min(count, PORTED_SAMPLE)]
+    
+    scale = count / len(sample)
+    rows = [
+        ("per date (ported)", timed(lambda: [ported(b, TODAY) for b in sample]) * scale),
+        ("per date (tables)", timed(lambda: [numerology(b, TODAY) for b in birth_dates])),
+        ("arrays", timed(lambda: numerology_arrays(column, TODAY))),
+        ("batch payloads", timed(lambda: numerology_batch(birth_dates, TODAY))),
+    ]
+    
+    print(f"{count} birth dates")
+    print(f"  {'path':<20}{'seconds':>10}{'dates/s':>14}")
+    for label, seconds in rows:
+        print(f"  {label:<20}{seconds:>10.3f}{count / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,123 @@
+"""
+Per-request overhead of the request ID / access log middleware.
+
+Drives two otherwise identical FastAPI apps straight through ASGI (no sockets,
+no server), so the difference is the middleware and logging alone:
+
+- before: @app.middleware("http") (BaseHTTPMiddleware) with a synchronous
+  f-string log line written by a StreamHandler
+- after: RequestContextMiddleware (pure ASGI) with the QueueHandler/QueueListener
+  JSON logging from app.observability.logs
+
+Both write their log lines to os.devnull, so the "before" numbers are a lower
+bound: a real stderr behind a slow pipe blocks the event loop for longer.
+
+Usage (no services needed):
+    python -m benchmarks.bench_request_middleware [requests]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+
+from app.observability.logs import configure_logging
+from app.observability.middleware import RequestContextMiddleware
+
+logger = logging.getLogger("bench")
+
+
+def build_before() -> FastAPI:
+    app = FastAPI()
+    
+    @app.middleware("http")
+    async def add_request_id(request: Request, call_next):
+        request_id = str(uuid.uuid4())[:8]
+        request.state.request_id = request_id
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info(
+            f"[{request_id}] {request.method} {request.url.path} - "
+            f"{response.status_code} - {process_time:.3f}s"
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+    
+    add_route(app)
+    return app
+
+
+def build_after() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    add_route(app)
+    return app
+
+
+def add_route(app: FastAPI) -> None:
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    
+    sent = False
+    done = asyncio.Event()
+    
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like uvicorn: disconnect is only reported once the response is complete
+        await done.wait()
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+    
+    await app(scope, receive, send)
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    """Mean microseconds per request."""
+    for _ in range(200):
+        await call(app)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main(requests: int) -> None:
+    devnull = open(os.devnull, "w")
+    
+    root = logging.getLogger()
+    root.handlers[:] = [logging.StreamHandler(devnull)]
+    root.handlers[0].setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    root.setLevel(logging.INFO)
+    before = asyncio.run(run(build_before(), requests))
+    
+    listener = configure_logging(logging.INFO, "json", devnull)
+    after = asyncio.run(run(build_after(), requests))
+    listener.stop()
+    
+    print(f"{requests} sequential requests through ASGI")
+    print(f"  before (BaseHTTPMiddleware + sync log): {before:7.1f} us/request")
+    print(f"  after  (pure ASGI + queued JSON log):   {after:7.1f} us/request")
+    print(f"  saved: {before - after:.1f} us/request ({(before - after) / before:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,148 @@
+"""
+Shared test fixtures.
+"""
+import fnmatch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.cache.redis_client import CircuitBreaker, redis_client
+from app.models.outbox import OutboxEvent
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+    
+    async def execute(self):
+        self.redis.round_trips += 1
+        commands, self.commands = self.commands, []
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        self.commands = []
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+    
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.ttls = {}
+        self.gets = 0
+        self.round_trips = 0
+        self.deletes = []
+        self.published = []
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def get(self, key):
+        self.gets += 1
+        self.round_trips += 1
+        return self.data.get(key)
+    
+    async def mget(self, keys):
+        self.gets += len(keys)
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+    
+    async def execute_command(self, command, *args, **options):
+        # Only MGET with NEVER_DECODE (binary cache values) goes through here
+        assert command == "MGET"
+        values = await self.mget(list(args))
+        return [value.encode() if isinstance(value, str) else value for value in values]
+    
+    async def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        if ex:
+            self.ttls[key] = ex
+        else:
+            self.ttls.pop(key, None)
+        return True
+    
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+    
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+    
+    async def delete(self, *keys):
+        self.deletes.append(keys)
+        for key in keys:
+            self.data.pop(key, None)
+            self.sets.pop(key, None)
+    
+    unlink = delete
+    
+    async def scan_iter(self, match=None, count=None):
+        for key in sorted(self.data):
+            if fnmatch.fnmatchcase(key, match or "*"):
+                yield key
+    
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+    
+    async def sunion(self, keys):
+        return set().union(*(self.sets.get(key, set()) for key in keys))
+    
+    async def expire(self, key, ttl, nx=False, gt=False):
+        current = self.ttls.get(key)
+        if (nx and current is not None) or (gt and (current is None or ttl <= current)):
+            return False
+        self.ttls[key] = ttl
+        return True
+    
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+    
+    async def eval(self, script, numkeys, key, token):
+        # Only the compare-and-delete lock release script is used
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def fake_redis():
+    """Point the global redis_client at a FakeRedis for the test."""
+    original = redis_client._client, redis_client.l1_ttls, redis_client.breaker
+    redis_client._client = FakeRedis()
+    redis_client.l1_ttls = {}
+    # Earlier tests may have tripped the breaker against a real, unreachable Redis
+    redis_client.breaker = CircuitBreaker(
+        failure_threshold=5, window=10, reset_timeout=2, max_reset_timeout=30, jitter=0
+    )
+    redis_client.local.clear()
+    yield redis_client._client
+    redis_client._client, redis_client.l1_ttls, redis_client.breaker = original
+    redis_client.local.clear()
+
+
+@pytest.fixture
+async def outbox_db():
+    """Sessionmaker for a throwaway database holding outbox_events."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(OutboxEvent.__table__.create)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
@@ -0,0 +1,153 @@
+"""
+Asynchronous booking tests against a local stand-in for the Temporal client.
+Workflow starts go through the outbox (SQLite) and are delivered by running the relay.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from temporalio.client import WorkflowExecutionStatus
+from temporalio.exceptions import WorkflowAlreadyStartedError
+from temporalio.service import RPCError, RPCStatusCode
+
+from app.config import settings
+from app.database import get_async_db
+from app.dependencies import get_current_user_id
+from app.main import app
+from app.services.outbox import OutboxRelay
+from app.workflows.client import temporal_client
+from app.workflows.session_booking import TASK_QUEUE, SessionBookingWorkflow
+
+
+class FakeDescription:
+    def __init__(self, status, memo):
+        self.status = status
+        self._memo = memo
+    
+    async def memo(self):
+        return self._memo
+
+
+class FakeHandle:
+    def __init__(self, workflow):
+        self.workflow = workflow
+    
+    async def describe(self):
+        return FakeDescription(self.workflow["status"], self.workflow["memo"])
+    
+    async def query(self, query):
+        assert query == SessionBookingWorkflow.status
+        return {"step": self.workflow["step"], "error": None}
+    
+    async def result(self):
+        return self.workflow["result"]
+
+
+class FakeTemporal:
+    """Records started workflows; tests move them between states."""
+    
+    def __init__(self):
+        self.workflows = {}
+    
+    async def start_workflow(self, run, arg, *, id, task_queue, memo):
+        assert run == SessionBookingWorkflow.run
+        assert task_queue == TASK_QUEUE
+        if id in self.workflows:
+            raise WorkflowAlreadyStartedError(id, "SessionBookingWorkflow")
+        self.workflows[id] = {
+            "request": arg,
+            "memo": memo,
+            "status": WorkflowExecutionStatus.RUNNING,
+            "step": "checking_availability",
+            "result": None
+        }
+    
+    def get_workflow_handle(self, workflow_id):
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
+            return MissingHandle()
+        return FakeHandle(workflow)
+
+
+class MissingHandle:
+    async def describe(self):
+        raise RPCError("workflow not found", RPCStatusCode.NOT_FOUND, b"")
+
+
+@pytest.fixture
+def temporal(monkeypatch, outbox_db):
+    fake = FakeTemporal()
+    monkeypatch.setattr(temporal_client, "_client", fake)
+    monkeypatch.setattr(settings, "booking_mode", "workflow")
+    
+    async def get_test_db():
+        async with outbox_db() as db:
+            yield db
+    
+    app.dependency_overrides[get_async_db] = get_test_db
+    app.dependency_overrides[get_current_user_id] = lambda: "user-1"
+    yield fake
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def relay(outbox_db):
+    return OutboxRelay(outbox_db)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def book(client):
+    return client.post("/api/sessions", json={"specialistId": "1", "date": "2026-03-15", "time": "10:00"})
+
+
+async def test_booking_returns_202_and_starts_workflow_from_outbox(temporal, client, relay):
+    response = book(client)
+    
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "accepted"
+    assert response.headers["Location"] == body["status_url"] == f"/api/sessions/bookings/{body['booking_id']}"
+    assert temporal.workflows == {}
+    
+    queued = client.get(body["status_url"]).json()
+    assert (queued["status"], queued["step"]) == ("pending", "queued")
+    
+    assert await relay.relay_once() == 1
+    workflow = temporal.workflows[f"booking-{body['booking_id']}"]
+    assert workflow["request"].session_id == body["booking_id"]
+    assert workflow["request"].user_id == "user-1"
+    assert workflow["memo"] == {"user_id": "user-1"}
+
+
+async def test_status_follows_workflow(temporal, client, relay):
+    booking_id = book(client).json()["booking_id"]
+    await relay.relay_once()
+    workflow = temporal.workflows[f"booking-{booking_id}"]
+    
+    pending = client.get(f"/api/sessions/bookings/{booking_id}").json()
+    assert pending["status"] == "pending"
+    assert pending["step"] == "checking_availability"
+    
+    workflow["status"] = WorkflowExecutionStatus.COMPLETED
+    workflow["result"] = {"success": True, "session_id": booking_id, "meeting_link": "https://meet.aroti.app/x"}
+    confirmed = client.get(f"/api/sessions/bookings/{booking_id}").json()
+    assert confirmed["status"] == "confirmed"
+    assert confirmed["session_id"] == booking_id
+    assert confirmed["meeting_link"] == "https://meet.aroti.app/x"
+    
+    workflow["result"] = {"success": False, "error": "Specialist is not available at the requested time"}
+    rejected = client.get(f"/api/sessions/bookings/{booking_id}").json()
+    assert rejected["status"] == "rejected"
+    assert rejected["error"].startswith("Specialist is not available")
+
+
+async def test_status_hidden_from_other_users(temporal, client, relay):
+    booking_id = book(client).json()["booking_id"]
+    app.dependency_overrides[get_current_user_id] = lambda: "user-2"
+    assert client.get(f"/api/sessions/bookings/{booking_id}").status_code == 404
+    
+    await relay.relay_once()
+    assert client.get(f"/api/sessions/bookings/{booking_id}").status_code == 404
+    assert client.get("/api/sessions/bookings/unknown").status_code == 404
@@ -23,3 +23,4 @@ def test_readiness_check():
     assert response.status_code in [200, 503]
     assert "status" in response.json()
     assert "checks" in response.json()
+    assert response.json()["redisCircuit"]["state"] in ["closed", "open", "half_open"]
@@ -0,0 +1,63 @@
+"""
+Numerology endpoint tests.
+"""
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import get_async_db
+from app.dependencies import get_current_user_id
+from app.main import app
+from app.services.insights import local_date
+from app.services.numerology import numerology
+
+
+@pytest.fixture
+async def client():
+    """App client for user-1 against a throwaway users table (SQLite has no ARRAY)."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE users (id VARCHAR PRIMARY KEY, birth_date DATE, timezone VARCHAR)"))
+        await conn.execute(text(
+            "INSERT INTO users VALUES ('user-1', '1990-07-15', 'Asia/Tokyo'), ('user-2', NULL, 'UTC')"
+        ))
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    
+    async def get_test_db():
+        async with sessionmaker() as db:
+            yield db
+    
+    app.dependency_overrides[get_async_db] = get_test_db
+    app.dependency_overrides[get_current_user_id] = lambda: "user-1"
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def test_batch(client):
+    response = client.post(
+        "/api/numerology/batch", json={"birthDates": ["1990-07-15", "1993-02-09"], "date": "2026-10-17"}
+    )
+    
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    body = response.json()
+    assert body["date"] == "2026-10-17"
+    assert [r["lifePath"] for r in body["results"]] == [5, 33]
+    assert body["results"][0]["personalDay"] == 5
+    assert client.post("/api/numerology/batch", json={"birthDates": []}).status_code == 422
+
+
+async def test_me_uses_the_local_date(client):
+    response = client.get("/api/numerology/me")
+    
+    expected = numerology(date(1990, 7, 15), local_date("Asia/Tokyo"))
+    assert response.status_code == 200
+    assert response.json() == {**expected, "karmicLessons": list(expected["karmicLessons"])}
+    
+    app.dependency_overrides[get_current_user_id] = lambda: "user-2"
+    assert client.get("/api/numerology/me").status_code == 404
@@ -0,0 +1,33 @@
+"""
+Cursor pagination helper tests.
+"""
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("date", ["2026-03-01", "10:00", "abc"])
+    assert decode_cursor(cursor, "date", size=3) == ["2026-03-01", "10:00", "abc"]
+    assert decode_cursor(None, "date") is None
+    assert decode_cursor(encode_cursor("rating", [4.5, "s1"]), "rating") == [4.5, "s1"]
+    assert decode_cursor(encode_cursor("price", [40, "s1"]), "price") == [40, "s1"]
+
+
+@pytest.mark.parametrize("cursor, sort, size", [
+    ("not-base64!!", "rating", 2),
+    (encode_cursor("price", [40, "1"]), "rating", 2),
+    (encode_cursor("date", ["2026-03-01", "1"]), "date", 3),
+    (encode_cursor("rating", [{"x": 1}, "1"]), "rating", 2),
+    (encode_cursor("rating", ["4.5", "1"]), "rating", 2),
+    (encode_cursor("price", [40, 1]), "price", 2),
+    (encode_cursor("price", [True, "1"]), "price", 2),
+    (encode_cursor("date", [20260301, "1"]), "date", 2),
+    (encode_cursor("date", ["yesterday", "1"]), "date", 2),
+    (encode_cursor("date", ["2026-03-01", "10h", "1"]), "date", 3),
+])
+def test_invalid_cursor_is_rejected(cursor, sort, size):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, sort, size=size)
+    assert exc.value.status_code == 400
@@ -0,0 +1,67 @@
+"""
+Profile endpoint tests.
+"""
+import json
+
+import pytest
+from sqlalchemy import select, text
+from starlette.requests import Request
+
+from app.api.profile import delete_account, get_profile, update_profile
+from app.cache.redis_client import redis_client
+from app.models.outbox import OutboxEvent
+from app.schemas.profile import UpdateProfileRequest
+from app.services.insights import timezone_key
+from app.services.outbox import CACHE_DELETE, outbox_relay
+
+
+@pytest.fixture
+async def profile_db(outbox_db, fake_redis, monkeypatch):
+    """outbox_db plus a users table (SQLite has no ARRAY), with the profile namespaces in L1."""
+    monkeypatch.setattr(outbox_relay, "notify", lambda: None)
+    monkeypatch.setattr(redis_client, "l1_ttls", {"profile": 60, "user_timezone": 60})
+    async with outbox_db() as db:
+        await db.execute(text(
+            "CREATE TABLE users (id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR, sun_sign VARCHAR, "
+            "moon_sign VARCHAR, birth_date DATE, birth_time DATETIME, birth_location VARCHAR, "
+            "timezone VARCHAR NOT NULL DEFAULT 'UTC', traits VARCHAR, is_premium BOOLEAN, "
+            "created_at DATETIME, updated_at DATETIME)"
+        ))
+        await db.execute(text("INSERT INTO users (id, name, email) VALUES ('u1', 'Ada', '')"))
+        await db.commit()
+    return outbox_db
+
+
+async def cache_deletes(sessionmaker):
+    async with sessionmaker() as db:
+        events = (await db.execute(select(OutboxEvent))).scalars().all()
+    return [(e.kind, e.payload) for e in events]
+
+
+async def test_update_is_read_back_before_the_relay_deletes_the_redis_copy(profile_db, fake_redis):
+    stale = {"body": json.dumps({"name": "Ada", "timezone": "UTC"}), "etag": '"old"', "headers": {}, "soft": 2e9}
+    await redis_client.set_json("profile:u1", stale)
+    await redis_client.set_json(timezone_key("u1"), "UTC")
+    redis_client.local.clear()
+    
+    async with profile_db() as db:
+        await update_profile(UpdateProfileRequest(name="Grace", timezone="Europe/Berlin"), db=db, current_user_id="u1")
+    
+    # No Redis call on the write path: the delete is left to the outbox relay
+    assert fake_redis.deletes == []
+    assert await cache_deletes(profile_db) == [(CACHE_DELETE, {"keys": ["profile:u1", timezone_key("u1")]})]
+    # ...while this process reads its own write from L1
+    response = await get_profile(Request({"type": "http", "headers": []}), current_user_id="u1")
+    assert json.loads(response.body)["name"] == "Grace"
+    assert await redis_client.get_json(timezone_key("u1")) == "Europe/Berlin"
+
+
+async def test_account_deletion_leaves_the_redis_delete_to_the_relay(profile_db, fake_redis):
+    await redis_client.set_json("profile:u1", {"body": "{}", "etag": '"x"', "headers": {}, "soft": 2e9})
+    
+    async with profile_db() as db:
+        await delete_account(db=db, current_user_id="u1")
+    
+    assert fake_redis.deletes == []
+    assert redis_client.local.get("profile:u1") is None
+    assert await cache_deletes(profile_db) == [(CACHE_DELETE, {"keys": ["profile:u1", timezone_key("u1")]})]
@@ -0,0 +1,93 @@
+"""
+Cache-aside stampede protection tests.
+"""
+import asyncio
+import json
+import time
+import pytest
+
+from app.cache.cache_aside import get_or_load, serialize
+
+
+def envelope(value, soft):
+    cached = serialize(value)
+    return json.dumps({"body": cached.body, "etag": cached.etag, "soft": soft})
+
+
+def counting_loader(value, delay=0.02):
+    calls = {"n": 0}
+    
+    async def load():
+        calls["n"] += 1
+        await asyncio.sleep(delay)
+        return value
+    
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(fake_redis):
+    """Concurrent misses on one key run the loader once."""
+    load, calls = counting_loader({"items": [1, 2, 3]})
+    
+    results = await asyncio.gather(*(
+        get_or_load("specialists:list:x", load, ttl=60) for _ in range(25)
+    ))
+    
+    assert calls["n"] == 1
+    assert all(json.loads(r.body) == {"items": [1, 2, 3]} for r in results)
+    assert "lock:specialists:list:x" not in fake_redis.data
+
+
+@pytest.mark.asyncio
+async def test_waits_for_peer_pod_holding_lock(fake_redis):
+    """If another pod holds the load lock, wait for its value instead of loading."""
+    fake_redis.data["lock:daily_insights:d"] = "other-pod"
+    load, calls = counting_loader("mine")
+    
+    async def peer_finishes():
+        await asyncio.sleep(0.1)
+        fake_redis.data["daily_insights:d"] = envelope("theirs", time.time() + 60)
+    
+    result, _ = await asyncio.gather(
+        get_or_load("daily_insights:d", load, ttl=60),
+        peer_finishes()
+    )
+    
+    assert json.loads(result.body) == "theirs"
+    assert calls["n"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_refreshing(fake_redis):
+    """Soft-expired entries are returned immediately and refreshed in the background."""
+    fake_redis.data["specialist:1"] = envelope("old", time.time() - 1)
+    load, calls = counting_loader("new")
+    
+    assert (await get_or_load("specialist:1", load, ttl=60, stale_ttl=60)).body == '"old"'
+    await asyncio.sleep(0.05)
+    
+    assert calls["n"] == 1
+    assert (await get_or_load("specialist:1", load, ttl=60, stale_ttl=60)).body == '"new"'
+
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_window(fake_redis):
+    """A fresh entry inside the refresh-ahead window triggers one early refresh."""
+    fake_redis.data["specialist:2"] = envelope("cur", time.time() + 10)
+    load, calls = counting_loader("next")
+    
+    assert (await get_or_load("specialist:2", load, ttl=60)).body == '"cur"'
+    assert (await get_or_load("specialist:2", load, ttl=60, refresh_ahead=30)).body == '"cur"'
+    await asyncio.sleep(0.05)
+    
+    assert calls["n"] == 1
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_cached(fake_redis):
+    """A loader returning None yields None and stores nothing."""
+    load, calls = counting_loader(None)
+    
+    assert await get_or_load("specialist:missing", load, ttl=60) is None
+    assert "specialist:missing" not in fake_redis.data
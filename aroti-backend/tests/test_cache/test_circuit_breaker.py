@@ -0,0 +1,130 @@
+"""
+Redis circuit breaker tests.
+"""
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+
+from app.cache.redis_client import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, RedisClient
+from tests.conftest import FakeRedis
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **overrides):
+    options = dict(failure_threshold=3, window=10, reset_timeout=2, max_reset_timeout=8, jitter=0)
+    options.update(overrides)
+    return CircuitBreaker(clock=clock, **options)
+
+
+class DownRedis(FakeRedis):
+    """FakeRedis whose reads fail as if the server were unreachable."""
+    
+    def __init__(self):
+        super().__init__()
+        self.down = True
+    
+    async def get(self, key):
+        self.gets += 1
+        if self.down:
+            raise RedisConnectionError("Connection refused")
+        return self.data.get(key)
+
+
+def test_opens_after_consecutive_outage_errors():
+    """Only connection/timeout errors count; a command error resets the count."""
+    clock = Clock()
+    breaker = make_breaker(clock)
+    
+    breaker.record_error(RedisConnectionError())
+    breaker.record_error(RedisConnectionError())
+    breaker.record_error(ResponseError("WRONGTYPE"))
+    breaker.record_error(RedisConnectionError())
+    breaker.record_error(RedisConnectionError())
+    assert breaker.state == CLOSED
+    
+    breaker.record_error(RedisConnectionError())
+    assert breaker.state == OPEN
+    assert breaker.trips == 1
+    assert breaker.allow() is False
+
+
+def test_errors_outside_window_do_not_add_up():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    
+    for _ in range(2):
+        breaker.record_error(RedisConnectionError())
+    clock.now += 11
+    breaker.record_error(RedisConnectionError())
+    
+    assert breaker.state == CLOSED
+    assert breaker.failures == 1
+
+
+def test_half_open_allows_one_probe_and_backs_off_on_failure():
+    """Failed probes double the open delay up to max_reset_timeout; a good probe closes."""
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=1)
+    breaker.record_error(RedisConnectionError())
+    
+    clock.now += 2
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is False
+    
+    breaker.record_error(RedisConnectionError())
+    assert breaker.stats()["retry_in"] == 4
+    breaker.record_error(RedisConnectionError())  # late error from another call while open
+    assert breaker.state == OPEN
+    
+    clock.now += 4
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() is True
+
+
+def test_probe_delay_is_jittered():
+    clock = Clock()
+    delays = set()
+    for _ in range(20):
+        breaker = make_breaker(clock, failure_threshold=1, jitter=0.5)
+        breaker.record_error(RedisConnectionError())
+        delay = breaker.stats()["retry_in"]
+        assert 1 <= delay <= 3
+        delays.add(delay)
+    assert len(delays) > 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_redis_until_probe_succeeds():
+    """While open, cache calls return the fallback without reaching Redis."""
+    clock = Clock()
+    client = RedisClient()
+    client.l1_ttls = {}
+    client._client = DownRedis()
+    client.breaker = make_breaker(clock)
+    
+    for _ in range(3):
+        assert await client.get("profile:1") is None
+    assert client._client.gets == 3
+    assert client.breaker.state == OPEN
+    
+    assert await client.get("profile:1") is None
+    assert await client.get_json("profile:1") is None
+    assert client._client.gets == 3
+    assert client.breaker.skipped == 2
+    with pytest.raises(CircuitOpenError):
+        await client.run_script("return 1", [], [])
+    
+    client._client.down = False
+    client._client.data["profile:1"] = "cached"
+    clock.now += 2
+    assert await client.get("profile:1") == "cached"
+    assert client.breaker.state == CLOSED
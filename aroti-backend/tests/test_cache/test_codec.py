@@ -0,0 +1,68 @@
+"""
+Cache value codec tests.
+"""
+import json
+
+import pytest
+
+from app.cache.codec import COMPRESSIONS, Codec, CodecError
+from app.cache.redis_client import RedisClient
+from tests.conftest import FakeRedis
+
+ENVELOPE = {
+    "body": json.dumps([{"id": str(i), "name": f"Specialist {i}", "languages": ["en", "es"]} for i in range(50)]),
+    "etag": '"abc"',
+    "headers": {"X-Next-Cursor": "c1"},
+    "soft": 1700000000.5
+}
+
+
+@pytest.mark.parametrize("serializer", ["json", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd", "lz4"])
+def test_round_trip(serializer, compression):
+    codec = Codec(serializer, compression, threshold=256)
+    
+    assert codec.decode(codec.encode(ENVELOPE)) == ENVELOPE
+    assert codec.decode(codec.encode({"small": 1})) == {"small": 1}
+
+
+def test_compresses_only_above_threshold():
+    """The high nibble of the codec byte records whether the payload was compressed."""
+    codec = Codec("msgpack", "zlib", threshold=256)
+    
+    small = codec.encode({"small": 1})
+    large = codec.encode(ENVELOPE)
+    
+    assert small[1] >> 4 == 0
+    assert large[1] >> 4 == COMPRESSIONS["zlib"][0]
+    assert len(large) < len(json.dumps(ENVELOPE))
+
+
+def test_reads_values_written_with_other_settings():
+    """Every value carries its own codec byte, so settings can change during a rollout."""
+    written = Codec("json", "zlib", threshold=0).encode(ENVELOPE)
+    
+    assert Codec("msgpack", "none").decode(written) == ENVELOPE
+
+
+def test_reads_legacy_json_text():
+    codec = Codec()
+    
+    assert codec.decode(json.dumps(ENVELOPE).encode()) == ENVELOPE
+    with pytest.raises(CodecError):
+        codec.decode(b"not json")
+    with pytest.raises(CodecError):
+        codec.decode(bytes((1, 0x0F)) + b"payload")
+
+
+@pytest.mark.asyncio
+async def test_client_reads_legacy_and_binary_values():
+    """Keys written before the codec change decode alongside new ones."""
+    client = RedisClient()
+    client.l1_ttls = {}
+    client._client = FakeRedis()
+    client._client.data["profile:old"] = json.dumps({"name": "A"})
+    await client.set_json("profile:new", {"name": "B"})
+    
+    assert isinstance(client._client.data["profile:new"], bytes)
+    assert await client.mget_json(["profile:old", "profile:new"]) == [{"name": "A"}, {"name": "B"}]
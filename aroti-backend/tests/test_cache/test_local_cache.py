@@ -0,0 +1,62 @@
+"""
+In-process L1 cache tests.
+"""
+import pytest
+
+from app.cache.local_cache import LocalCache, parse_namespace_ttls
+from app.cache.redis_client import RedisClient
+from tests.conftest import FakeRedis
+
+
+def test_parse_namespace_ttls():
+    """Only namespaces with a positive TTL opt in."""
+    assert parse_namespace_ttls("specialist:60, daily_insights:300,profile,bad:x") == {
+        "specialist": 60,
+        "daily_insights": 300
+    }
+
+
+def test_local_cache_lru_eviction():
+    """Oldest untouched entry is evicted when full."""
+    cache = LocalCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_opted_in_namespace_only():
+    """Opted-in keys skip Redis after the first read; others always hit Redis."""
+    client = RedisClient()
+    client.l1_ttls = {"specialist": 60}
+    client._client = FakeRedis()
+    
+    await client.set_json("specialist:1", {"id": "1"}, ttl=3600)
+    await client.set_json("profile:1", {"name": "A"}, ttl=300)
+    client.local.clear()
+    
+    for _ in range(3):
+        assert await client.get_json("specialist:1") == {"id": "1"}
+        assert await client.get_json("profile:1") == {"name": "A"}
+    
+    # one Redis read for the L1 key, three for the non-opted-in key
+    assert client._client.gets == 4
+
+
+@pytest.mark.asyncio
+async def test_delete_publishes_invalidation():
+    """delete() clears L1 locally and notifies other pods."""
+    client = RedisClient()
+    client.l1_ttls = {"specialist": 60}
+    client._client = FakeRedis()
+    
+    await client.set_json("specialist:1", {"id": "1"}, ttl=3600)
+    await client.delete("specialist:1")
+    
+    assert client.local.get("specialist:1") is None
+    assert client._client.published[-1][1].endswith("|specialist:1")
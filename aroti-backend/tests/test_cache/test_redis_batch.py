@@ -0,0 +1,117 @@
+"""
+Multi-key Redis helpers: one round trip per batch, pattern and tag invalidation.
+"""
+import pytest
+
+from app.cache.redis_client import RedisClient
+from tests.conftest import FakeRedis
+
+
+@pytest.fixture
+def client():
+    client = RedisClient()
+    client.l1_ttls = {"specialist": 60}
+    client._client = FakeRedis()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_mset_json_applies_per_key_ttl_in_one_round_trip(client):
+    """ttls overrides the default per key; all SETs share one pipeline."""
+    ok = await client.mset_json(
+        {"profile:1": {"a": 1}, "profile:2": {"b": 2}, "profile:3": {"c": 3}},
+        ttl=300,
+        ttls={"profile:2": 30}
+    )
+    
+    assert ok is True
+    assert client._client.round_trips == 1
+    assert client._client.ttls == {"profile:1": 300, "profile:2": 30, "profile:3": 300}
+    assert client.codec.decode(client._client.data["profile:2"]) == {"b": 2}
+
+
+@pytest.mark.asyncio
+async def test_mget_json_preserves_order_and_misses(client):
+    """One MGET for all keys; absent and undecodable values come back as None."""
+    await client.mset_json({"profile:1": {"a": 1}, "profile:3": {"c": 3}})
+    client._client.data["profile:4"] = "not json"
+    client._client.round_trips = 0
+    
+    values = await client.mget_json(["profile:1", "profile:2", "profile:3", "profile:4"])
+    
+    assert values == [{"a": 1}, None, {"c": 3}, None]
+    assert client._client.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_mget_json_serves_l1_keys_locally(client):
+    """Keys already in L1 are not sent to Redis."""
+    await client.mset_json({"specialist:1": {"id": "1"}, "profile:1": {"a": 1}})
+    client._client.gets = 0
+    
+    values = await client.mget_json(["specialist:1", "profile:1"])
+    
+    assert values == [{"id": "1"}, {"a": 1}]
+    assert client._client.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_many_is_one_round_trip_and_publishes_l1_keys(client):
+    """DEL and the L1 invalidation publishes go out together."""
+    await client.mset_json({"specialist:1": {}, "profile:1": {}})
+    client._client.round_trips = 0
+    client._client.published.clear()
+    
+    assert await client.delete_many(["specialist:1", "profile:1"]) is True
+    
+    assert client._client.round_trips == 1
+    assert client._client.deletes[-1] == ("specialist:1", "profile:1")
+    assert [message.split("|")[1] for _, message in client._client.published] == ["specialist:1"]
+    assert client.local.get("specialist:1") is None
+
+
+@pytest.mark.asyncio
+async def test_delete_pattern_removes_matching_keys_only(client):
+    """SCAN + UNLINK drops matching keys in Redis and L1."""
+    await client.mset_json({"specialist:1:reviews": [], "specialist:2:reviews": [], "specialist:1": {}})
+    
+    deleted = await client.delete_pattern("specialist:*:reviews")
+    
+    assert deleted == 2
+    assert sorted(client._client.data) == ["specialist:1"]
+    assert client.local.get("specialist:1") == {}
+    assert client.local.get("specialist:1:reviews") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_deletes_members_and_tag_sets(client):
+    """Keys recorded under a tag are deleted with it; untagged keys survive."""
+    await client.mset_json({"profile:1": {}, "profile:2": {}, "profile:3": {}})
+    await client.tag(["user:1"], ["profile:1", "profile:2"], ttl=60)
+    await client.tag(["user:1"], ["profile:2"], ttl=600)
+    
+    assert client._client.ttls["tag:user:1"] == 600
+    
+    deleted = await client.invalidate_tags("user:1")
+    
+    assert deleted == 2
+    assert sorted(client._client.data) == ["profile:3"]
+    assert "tag:user:1" not in client._client.sets
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propagates_errors(client):
+    """Unlike the cache helpers, the pipeline context manager does not swallow errors."""
+    class Boom(Exception):
+        pass
+    
+    async def failing_set(*args, **kwargs):
+        raise Boom()
+    
+    client._client.set = failing_set
+    
+    with pytest.raises(Boom):
+        async with client.pipeline() as pipe:
+            pipe.set("profile:1", "{}")
+    
+    assert await client.mset_json({"profile:1": {}}) is False
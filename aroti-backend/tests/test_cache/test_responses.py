@@ -0,0 +1,46 @@
+"""
+Pre-serialized cache response tests.
+"""
+from starlette.requests import Request
+
+from app.cache.cache_aside import serialize
+from app.cache.responses import cached_json_response, etag_matches
+
+
+def make_request(headers=None):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_serialize_matches_fastapi_encoding():
+    """Body is compact JSON and the ETag is stable for equal content."""
+    cached = serialize({"name": "Sophia", "price": 35})
+    assert cached.body == '{"name":"Sophia","price":35}'
+    assert serialize({"name": "Sophia", "price": 35}).etag == cached.etag
+    assert serialize({"name": "Sophia", "price": 40}).etag != cached.etag
+
+
+def test_cached_response_returns_body_with_etag():
+    cached = serialize([{"id": "1"}])
+    response = cached_json_response(make_request(), cached)
+    
+    assert response.status_code == 200
+    assert response.body == b'[{"id":"1"}]'
+    assert response.headers["etag"] == cached.etag
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_cached_response_304_on_matching_etag():
+    cached = serialize([{"id": "1"}])
+    response = cached_json_response(make_request({"If-None-Match": cached.etag}), cached)
+    
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == cached.etag
+
+
+def test_etag_matches_lists_and_weak_tags():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
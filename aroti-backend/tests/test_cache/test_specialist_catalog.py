@@ -0,0 +1,150 @@
+"""
+In-process specialist catalog tests.
+"""
+import itertools
+import json
+import random
+import pytest
+
+from app.cache.specialist_catalog import CatalogHolder, SpecialistCatalog, CATALOG_VERSION_KEY
+
+LANGUAGES = ["English", "Spanish", "Greek", "Japanese", "Romanian"] + [f"Lang{i}" for i in range(70)]
+CATEGORIES = ["Astrology", "Numerology", "Reiki", "Therapy"]
+
+
+def make_rows(n=300, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(i),
+            "price": rng.randint(20, 120),
+            "rating": round(rng.uniform(3, 5), 1),
+            "available": rng.random() > 0.3,
+            "languages": rng.sample(LANGUAGES, rng.randint(0, 3)),
+            "categories": rng.sample(CATEGORIES, rng.randint(0, 2))
+        }
+        for i in range(n)
+    ]
+
+
+def reference_filter(rows, availability, price_min, price_max, min_rating, languages, category):
+    """Row-by-row equivalent of the SQL WHERE clause."""
+    result = []
+    for i, row in enumerate(rows):
+        if availability == "available" and not row["available"]:
+            continue
+        if availability == "unavailable" and row["available"]:
+            continue
+        if price_min is not None and row["price"] < price_min:
+            continue
+        if price_max is not None and row["price"] > price_max:
+            continue
+        if min_rating is not None and row["rating"] < min_rating:
+            continue
+        if languages and not set(languages) & set(row["languages"]):
+            continue
+        if category and category not in row["categories"]:
+            continue
+        result.append(i)
+    return result
+
+
+def test_filter_matches_sql_semantics():
+    """Every filter combination selects the same rows as the reference."""
+    rows = make_rows()
+    catalog = SpecialistCatalog(1, rows)
+    
+    for combo in itertools.product(
+        [None, "available", "unavailable"],
+        [None, 50],
+        [None, 90],
+        [None, 4.5],
+        [None, ["Greek"], ["Lang69", "English"], ["Klingon"]],
+        [None, "Reiki", "Unknown"]
+    ):
+        expected = reference_filter(rows, *combo)
+        assert catalog.filter(*combo).tolist() == expected, combo
+
+
+def test_render_returns_selected_rows_as_json():
+    rows = make_rows(10)
+    catalog = SpecialistCatalog(1, rows)
+    indices = catalog.filter(price_min=60)
+    
+    cached = catalog.render(indices)
+    
+    assert json.loads(cached.body) == [rows[i] for i in indices]
+    assert cached.etag == SpecialistCatalog(2, rows).render(indices).etag
+
+
+@pytest.mark.asyncio
+async def test_holder_rebuilds_on_version_change(fake_redis, monkeypatch):
+    """A new catalog version in Redis triggers exactly one rebuild."""
+    from app.config import settings
+    monkeypatch.setattr(settings, "catalog_version_check_interval", 0)
+    
+    holder = CatalogHolder()
+    loads = {"n": 0}
+    
+    async def load_rows():
+        loads["n"] += 1
+        return make_rows(5)
+    
+    holder._load_rows = load_rows
+    fake_redis.data[CATALOG_VERSION_KEY] = "1"
+    
+    first = await holder.get()
+    assert await holder.get() is first
+    assert loads["n"] == 1
+    
+    fake_redis.data[CATALOG_VERSION_KEY] = "2"
+    second = await holder.get()
+    assert second is not first
+    assert second.version == 2
+    assert loads["n"] == 2
+
+
+@pytest.mark.asyncio
+async def test_holder_rebuilds_after_max_age_without_a_version_bump(fake_redis, monkeypatch):
+    """Writes nobody signalled still show up once the snapshot reaches catalog_max_age."""
+    from app.config import settings
+    monkeypatch.setattr(settings, "catalog_version_check_interval", 0)
+    monkeypatch.setattr(settings, "catalog_max_age", 60)
+    
+    holder = CatalogHolder()
+    
+    async def load_rows():
+        return make_rows(5)
+    
+    holder._load_rows = load_rows
+    fake_redis.data[CATALOG_VERSION_KEY] = "1"
+    
+    first = await holder.get()
+    assert await holder.get() is first
+    
+    first.built_at -= 61
+    second = await holder.get()
+    assert second is not first
+    assert second.version == 1
+
+
+@pytest.mark.parametrize("sort", ["rating", "price"])
+def test_keyset_pages_cover_matches_in_order(sort):
+    """Walking pages by cursor key yields every match once, in sort order."""
+    rows = make_rows()
+    catalog = SpecialistCatalog(1, rows)
+    expected = catalog.filter(availability="available")
+    column, descending = {"rating": ("rating", True), "price": ("price", False)}[sort]
+    expected = sorted(
+        expected,
+        key=lambda i: ((-rows[i][column] if descending else rows[i][column]), rows[i]["id"])
+    )
+    
+    seen, after = [], None
+    while True:
+        indices, after = catalog.page(sort, 7, after, availability="available")
+        seen.extend(indices.tolist())
+        if after is None:
+            break
+    
+    assert seen == expected
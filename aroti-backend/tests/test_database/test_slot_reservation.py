@@ -0,0 +1,107 @@
+"""
+Slot reservation tests.
+The concurrent-booking stress test requires PostgreSQL at DATABASE_URL.
+"""
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401  (configure all mappers)
+from app.config import settings
+from app.database import Base, get_async_database_url
+from app.models.session import Session as SessionModel
+from app.models.specialist import Specialist
+from app.services.booking import (
+    SlotTaken,
+    SpecialistNotFound,
+    SpecialistUnavailable,
+    reservation_statement,
+    reserve_slot,
+)
+
+CONCURRENCY = 50
+
+
+def test_reservation_is_single_conditional_insert():
+    """Availability check, insert and conflict handling share one statement."""
+    sql = str(reservation_statement("s1", "42", "user-1", "2026-03-15", "10:00").compile(
+        dialect=postgresql.dialect()
+    ))
+    assert sql.startswith("INSERT INTO sessions")
+    assert "FROM specialists" in sql
+    assert "ON CONFLICT (specialist_id, date, time) WHERE status IN" in sql
+    assert "DO NOTHING RETURNING" in sql
+
+
+@pytest.fixture
+async def pg_sessionmaker():
+    """Async sessionmaker bound to a throwaway schema with one specialist per availability."""
+    schema = f"booking_test_{uuid.uuid4().hex[:8]}"
+    engine = create_async_engine(
+        get_async_database_url(settings.database_url),
+        pool_size=CONCURRENCY,
+        connect_args={"server_settings": {"search_path": schema}}
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(Specialist.__table__.insert(), [
+                {"id": "open", "name": "Open", "specialty": "Tarot", "price": 40, "available": True},
+                {"id": "away", "name": "Away", "specialty": "Tarot", "price": 40, "available": False},
+            ])
+    except Exception:
+        await engine.dispose()
+        pytest.skip("PostgreSQL not available")
+    
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    await engine.dispose()
+
+
+async def _book(sessionmaker, specialist_id="open", user_id="user-1", time="10:00"):
+    async with sessionmaker() as db:
+        row = await reserve_slot(db, str(uuid.uuid4()), specialist_id, user_id, "2026-03-15", time)
+        await db.commit()
+        return row
+
+
+async def test_concurrent_bookings_for_one_slot_have_one_winner(pg_sessionmaker):
+    results = await asyncio.gather(
+        *(_book(pg_sessionmaker, user_id=f"user-{i}") for i in range(CONCURRENCY)),
+        return_exceptions=True
+    )
+    
+    booked = [r for r in results if isinstance(r, dict)]
+    conflicts = [r for r in results if isinstance(r, SlotTaken)]
+    assert len(booked) == 1
+    assert len(conflicts) == CONCURRENCY - 1
+    assert booked[0]["status"] == "pending"
+    assert booked[0]["specialist_name"] == "Open"
+
+
+async def test_cancelled_booking_releases_slot(pg_sessionmaker):
+    first = await _book(pg_sessionmaker)
+    with pytest.raises(SlotTaken):
+        await _book(pg_sessionmaker, user_id="user-2")
+    
+    async with pg_sessionmaker() as db:
+        await db.execute(
+            update(SessionModel).where(SessionModel.id == first["id"]).values(status="cancelled")
+        )
+        await db.commit()
+    
+    second = await _book(pg_sessionmaker, user_id="user-2")
+    assert second["user_id"] == "user-2"
+
+
+async def test_missing_or_unavailable_specialist(pg_sessionmaker):
+    with pytest.raises(SpecialistNotFound):
+        await _book(pg_sessionmaker, specialist_id="nobody")
+    with pytest.raises(SpecialistUnavailable):
+        await _book(pg_sessionmaker, specialist_id="away")
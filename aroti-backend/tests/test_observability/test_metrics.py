@@ -0,0 +1,121 @@
+"""
+Prometheus metrics tests.
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from prometheus_client import Counter, Histogram
+
+from app.auth.keycloak import validator
+from app.cache.redis_client import CircuitBreaker, RedisClient
+from app.main import app
+from app.observability.metrics import Registry, registry
+from tests.conftest import FakeRedis
+
+client = TestClient(app)
+
+
+def sample(text: str, line_prefix: str) -> float:
+    """Value of the first sample line starting with line_prefix."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"No sample {line_prefix} in metrics")
+
+
+def test_exposition_follows_the_text_format():
+    """Cumulative buckets ending in +Inf, _created samples and escaped label values."""
+    throwaway = Registry()
+    histogram = Histogram(
+        "demo_seconds", "Demo", ("route",), registry=throwaway.collector_registry, buckets=(0.1, 1.0)
+    )
+    counter = Counter("demo_events_total", "Demo events", ("path",), registry=throwaway.collector_registry)
+    for value in (0.05, 0.5, 5):
+        histogram.labels("/a").observe(value)
+    counter.labels('C:\\tmp\n"quoted"').inc()
+    
+    lines = throwaway.render().splitlines()
+    
+    assert "# TYPE demo_seconds histogram" in lines
+    assert [line for line in lines if line.startswith("demo_seconds_") and "_created" not in line] == [
+        'demo_seconds_bucket{le="0.1",route="/a"} 1.0',
+        'demo_seconds_bucket{le="1.0",route="/a"} 2.0',
+        'demo_seconds_bucket{le="+Inf",route="/a"} 3.0',
+        'demo_seconds_count{route="/a"} 3.0',
+        'demo_seconds_sum{route="/a"} 5.55',
+    ]
+    assert "# TYPE demo_events_total counter" in lines
+    assert 'demo_events_total{path="C:\\\\tmp\\n\\"quoted\\""} 1.0' in lines
+    assert sample("\n".join(lines), 'demo_events_created{path=') > 0
+    assert sample("\n".join(lines), 'demo_seconds_created{route="/a"}') > 0
+
+
+def test_circuit_counters_count_events_not_snapshots():
+    """Trips and skips are counted as they happen; a fresh breaker does not move them back."""
+    text = client.get("/metrics").text
+    trips, skipped = sample(text, "redis_circuit_trips_total "), sample(text, "redis_circuit_skipped_total ")
+    breaker = CircuitBreaker(failure_threshold=1, window=10, reset_timeout=60, max_reset_timeout=60, jitter=0)
+    
+    breaker.record_error(ConnectionError("down"))
+    assert not breaker.allow()
+    CircuitBreaker(failure_threshold=1, window=10, reset_timeout=60, max_reset_timeout=60, jitter=0)
+    
+    text = client.get("/metrics").text
+    assert sample(text, "redis_circuit_trips_total ") == trips + 1
+    assert sample(text, "redis_circuit_skipped_total ") == skipped + 1
+    assert "# TYPE redis_circuit_trips_total counter" in text.splitlines()
+
+
+def test_requests_are_labelled_by_route_template():
+    """Raw paths never become label values."""
+    client.get("/api/sessions/3f2a9c")
+    client.get("/no/such/path/42")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_requests_total{method="GET",route="/api/sessions/{session_id}",status="403"}' in text
+    assert 'route="unmatched",status="404"' in text
+    assert "3f2a9c" not in text
+    assert 'http_requests_in_flight{method="GET",route="/metrics"} 1' in text
+
+
+def test_scrape_includes_pool_and_breaker_gauges():
+    text = client.get("/metrics").text
+    
+    assert sample(text, 'db_pool_size{engine="async"}') == 10
+    assert 'db_pool_checked_out{engine="sync"}' in text
+    assert 'redis_circuit_state{state="closed"}' in text
+
+
+@pytest.mark.asyncio
+async def test_cache_lookups_count_hits_and_misses_per_namespace():
+    redis = RedisClient()
+    redis.l1_ttls = {}
+    redis._client = FakeRedis()
+    await redis.set_json("profile:1", {"a": 1})
+    before = registry.render()
+    
+    await redis.mget_json(["profile:1", "profile:2"])
+    
+    after = registry.render()
+    for result in ("hit", "miss"):
+        prefix = f'cache_requests_total{{namespace="profile",result="{result}"}}'
+        assert sample(after, prefix) == (sample(before, prefix) if prefix in before else 0) + 1
+    assert sample(after, 'cache_operation_duration_seconds_count{namespace="profile",operation="mget"}') >= 1
+
+
+@pytest.mark.asyncio
+async def test_jwt_validation_is_timed_by_outcome():
+    prefix = 'jwt_validation_duration_seconds_count{result="cached"}'
+    before = registry.render()
+    validator.token_cache.put("token", {"exp": time.time() + 60, "sub": "u1"})
+    
+    await validator.verify_token("token")
+    
+    validator.token_cache.clear()
+    assert sample(registry.render(), prefix) == (sample(before, prefix) if prefix in before else 0) + 1
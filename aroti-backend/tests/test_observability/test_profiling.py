@@ -0,0 +1,106 @@
+"""
+Sampled request profiler tests.
+"""
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.observability.middleware import RequestContextMiddleware
+from app.observability.profiling import AWAITING, ProfilingMiddleware, sign_profile_token, verify_profile_token
+
+SECRET = "profile-test-secret"
+
+
+def busy_handler_work(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    
+    @app.get("/work")
+    async def work():
+        busy_handler_work(0.15)
+        await asyncio.sleep(0.15)
+        return {}
+    
+    return app
+
+
+def wait_for(path, timeout: float = 3.0) -> str:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists():
+            return path.read_text()
+        time.sleep(0.02)
+    raise AssertionError(f"{path} was not written")
+
+
+def configure(monkeypatch, tmp_path, **overrides):
+    values = {"profile_secret": SECRET, "profile_dir": str(tmp_path), "profile_sample_rate": 0.0,
+              "profile_interval_ms": 2, "profile_format": "collapsed", **overrides}
+    for name, value in values.items():
+        monkeypatch.setattr(settings, name, value)
+
+
+def test_profile_tokens_are_signed_and_expire():
+    assert verify_profile_token(sign_profile_token(60, SECRET), SECRET)
+    assert not verify_profile_token(sign_profile_token(60, "other"), SECRET)
+    assert not verify_profile_token(sign_profile_token(-1, SECRET), SECRET)
+    assert not verify_profile_token("garbage", SECRET)
+
+
+def test_signed_header_writes_collapsed_stacks(monkeypatch, tmp_path):
+    """Only the profiled request's own stacks are recorded: CPU time and await time."""
+    configure(monkeypatch, tmp_path)
+    client = TestClient(make_app())
+    
+    unsigned = client.get("/work", headers={"X-Debug-Profile": sign_profile_token(60, "wrong")})
+    signed = client.get("/work", headers={"X-Request-ID": "req-prof-1", "X-Debug-Profile": sign_profile_token(60)})
+    
+    assert "x-profile" not in unsigned.headers
+    filename = signed.headers["x-profile"]
+    assert filename.endswith(".collapsed") and "req-prof-1" not in filename
+    lines = wait_for(tmp_path / filename).splitlines()
+    assert len(list(tmp_path.iterdir())) == 1
+    
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    cpu = sum(n for stack, n in stacks.items() if "busy_handler_work" in stack)
+    waiting = sum(n for stack, n in stacks.items() if stack.endswith(AWAITING) and "make_app.<locals>.work" in stack)
+    assert cpu >= 10 and waiting >= 10
+
+
+def test_sample_rate_writes_speedscope(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path, profile_sample_rate=1.0, profile_format="speedscope")
+    
+    response = TestClient(make_app()).get("/work", headers={"X-Request-ID": "req-prof-2"})
+    
+    filename = response.headers["x-profile"]
+    document = json.loads(wait_for(tmp_path / filename))
+    profile = document["profiles"][0]
+    names = [frame["name"] for frame in document["shared"]["frames"]]
+    assert filename.endswith(".speedscope.json")
+    assert document["name"] == "GET /work [req-prof-2]"
+    assert profile["type"] == "sampled" and len(profile["samples"]) == len(profile["weights"])
+    assert any("busy_handler_work" in name for name in names)
+    assert 0.2 < profile["endValue"] < 1.0
+
+
+def test_client_request_ids_do_not_name_profile_files(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path, profile_sample_rate=1.0)
+    client = TestClient(make_app())
+    
+    filenames = [client.get("/work", headers={"X-Request-ID": "same-id"}).headers["x-profile"] for _ in range(2)]
+    
+    assert filenames[0] != filenames[1]
+    for filename in filenames:
+        wait_for(tmp_path / filename)
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(filenames)
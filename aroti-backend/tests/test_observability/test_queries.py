@@ -0,0 +1,79 @@
+"""
+Per-request SQL statistics, Server-Timing and query budget tests.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import instrument_engine
+from app.observability.middleware import RequestContextMiddleware
+from app.observability.queries import QueryBudgetExceeded, QueryStats, query_budget, query_stats_var
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+def make_app(engine, queries: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    
+    @app.get("/items")
+    async def items():
+        async with engine.connect() as conn:
+            for i in range(queries):
+                await conn.execute(text("SELECT :i"), {"i": i})
+        return []
+    
+    return app
+
+
+@pytest.mark.asyncio
+async def test_statements_are_attributed_to_the_current_request(engine):
+    """Async engine events run in a greenlet but still see the request's context."""
+    stats = QueryStats()
+    token = query_stats_var.set(stats)
+    try:
+        async with engine.connect() as conn:
+            for i in range(3):
+                await conn.execute(text("SELECT :i"), {"i": i})
+            await conn.execute(text("SELECT 42"))
+    finally:
+        query_stats_var.reset(token)
+    
+    assert stats.count == 4
+    assert stats.total_seconds >= stats.slowest_seconds > 0
+    assert stats.most_repeated() == "SELECT ?"
+    assert stats.summary()["db_max_repeats"] == 3
+
+
+def test_server_timing_only_for_query_heavy_requests(engine, monkeypatch):
+    monkeypatch.setattr(settings, "slow_request_queries", 5)
+    
+    light = TestClient(make_app(engine, 2)).get("/items")
+    heavy = TestClient(make_app(engine, 5)).get("/items")
+    
+    assert "server-timing" not in light.headers
+    assert heavy.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="5 queries"' in heavy.headers["server-timing"]
+
+
+def test_query_budget_fails_when_handler_exceeds_it(engine):
+    """Requests made through TestClient run on another thread and are still counted."""
+    client = TestClient(make_app(engine, 3))
+    
+    with query_budget(3) as stats:
+        client.get("/items")
+    assert stats.count == 3
+    
+    with pytest.raises(QueryBudgetExceeded, match="3 queries run, budget is 2"):
+        with query_budget(2):
+            client.get("/items")
@@ -0,0 +1,71 @@
+"""
+Request ID middleware and queued JSON logging tests.
+"""
+import io
+import json
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.observability.logs import configure_logging, request_id_var
+from app.observability.middleware import RequestContextMiddleware
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    
+    @app.get("/echo")
+    async def echo(request: Request):
+        logging.getLogger("test.handler").info("handling", extra={"widget": 7})
+        return {"state": request.state.request_id, "context": request_id_var.get()}
+    
+    return app
+
+
+def test_upstream_request_id_is_kept():
+    client = TestClient(make_app())
+    
+    response = client.get("/echo", headers={"X-Request-ID": "edge-7f3a.1"})
+    
+    assert response.headers["X-Request-ID"] == "edge-7f3a.1"
+    assert response.json() == {"state": "edge-7f3a.1", "context": "edge-7f3a.1"}
+    assert request_id_var.get() is None
+
+
+def test_missing_or_malformed_request_id_is_replaced():
+    """IDs that could break a log line or header are not trusted."""
+    client = TestClient(make_app())
+    
+    generated = client.get("/echo").headers["X-Request-ID"]
+    replaced = client.get("/echo", headers={"X-Request-ID": "bad id\";"}).headers["X-Request-ID"]
+    
+    assert len(generated) == 16
+    assert replaced != "bad id\";" and len(replaced) == 16
+
+
+def test_logs_are_json_lines_with_request_id():
+    """Records carry the request ID and extra fields; the listener writes them off-thread."""
+    stream = io.StringIO()
+    listener = configure_logging(logging.INFO, "json", stream)
+    try:
+        TestClient(make_app()).get("/echo", headers={"X-Request-ID": "req-1"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("test.outside").exception("failed")
+    finally:
+        listener.stop()
+        logging.getLogger().handlers.clear()
+    
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    handler = next(e for e in entries if e["logger"] == "test.handler")
+    access = next(e for e in entries if e["logger"] == "app.access")
+    failure = next(e for e in entries if e["logger"] == "test.outside")
+    
+    assert handler["request_id"] == "req-1" and handler["widget"] == 7
+    assert access["request_id"] == "req-1"
+    assert access["status"] == 200 and access["path"] == "/echo" and access["duration_ms"] >= 0
+    assert "request_id" not in failure
+    assert "ValueError: boom" in failure["exc_info"]
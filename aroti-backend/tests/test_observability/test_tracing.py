@@ -0,0 +1,120 @@
+"""
+Span tracing and OTLP/JSON export tests.
+"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.cache.redis_client import redis_client
+from app.config import settings
+from app.database import instrument_engine
+from app.observability.middleware import RequestContextMiddleware, TracingMiddleware
+from app.observability.tracing import SpanContext, current_span_var, current_traceparent, tracer
+from app.services import outbox
+from app.services.outbox import OutboxRelay, enqueue
+
+INCOMING = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def exported(monkeypatch, tmp_path):
+    """Enable tracing into a temporary file; returns a function that flushes and reads the spans."""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "trace_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "trace_export_path", str(path))
+    monkeypatch.setattr(settings, "trace_export_endpoint", "")
+    
+    def read():
+        tracer.exporter.flush()
+        if not path.exists():
+            return []
+        return [
+            span
+            for line in path.read_text().splitlines()
+            for resource in json.loads(line)["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+    
+    tracer.exporter.flush()
+    return read
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+def attributes(span) -> dict:
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+def test_traceparent_round_trip():
+    context = SpanContext.from_traceparent(INCOMING)
+    
+    assert context == SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+    assert context.traceparent() == INCOMING
+    assert SpanContext.from_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert SpanContext.from_traceparent("garbage") is None
+
+
+def test_request_span_parents_redis_and_sql_spans(exported, engine, fake_redis):
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    
+    @app.get("/profile/{user_id}")
+    async def profile(user_id: str):
+        await redis_client.get_json(f"profile:{user_id}")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {}
+    
+    TestClient(app).get("/profile/u1", headers={"traceparent": INCOMING, "X-Request-ID": "req-trace-1"})
+    
+    spans = {span["name"]: span for span in exported()}
+    server, redis, db = spans["GET /profile/{user_id}"], spans["redis mget"], spans["db SELECT"]
+    assert server["traceId"] == redis["traceId"] == db["traceId"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert server["parentSpanId"] == "00f067aa0ba902b7"
+    assert redis["parentSpanId"] == db["parentSpanId"] == server["spanId"]
+    assert attributes(server)["http.response.status_code"] == "200"
+    assert attributes(server)["request_id"] == "req-trace-1"
+    assert attributes(redis)["cache.namespace"] == "profile"
+    assert attributes(db)["db.statement"] == "SELECT 1"
+
+
+async def test_background_statements_do_not_start_traces(exported, engine):
+    assert current_span_var.get() is None
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    
+    assert exported() == []
+
+
+async def test_outbox_delivery_continues_the_enqueuing_trace(exported, outbox_db, fake_redis, monkeypatch):
+    delivered = []
+    
+    async def handler(payload):
+        delivered.append(current_traceparent())
+    
+    monkeypatch.setitem(outbox.HANDLERS, "test.traced", handler)
+    with tracer.span("POST /api/sessions") as request_span:
+        async with outbox_db() as db:
+            enqueue(db, "test.traced", {})
+            await db.commit()
+    
+    await OutboxRelay(outbox_db).relay_once()
+    
+    delivery = SpanContext.from_traceparent(delivered[0])
+    assert delivery.trace_id == request_span.context.trace_id
+    spans = {span["name"]: span for span in exported()}
+    assert spans["outbox test.traced"]["parentSpanId"] == request_span.context.span_id
@@ -0,0 +1,180 @@
+"""
+Delayed-job scheduler tests.
+Tests marked with the `jobs` fixture require Redis at REDIS_HOST and are skipped otherwise.
+"""
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.cache.redis_client import redis_client
+from app.config import settings
+from app.scheduler import reminders
+from app.scheduler.delayed_jobs import DelayedJobScheduler, Job, backoff_seconds
+from app.services import notifications
+
+
+def test_bucket_of_shards_by_time():
+    scheduler = DelayedJobScheduler(prefix="t")
+    width = settings.scheduler_bucket_seconds * 1000
+    assert scheduler.bucket_of(5 * width + 1) == ("t:due:5", 5 * width)
+    assert scheduler.bucket_of(6 * width - 1)[0] == "t:due:5"
+    assert scheduler.bucket_of(6 * width)[0] == "t:due:6"
+
+
+def test_backoff_doubles_with_cap(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_backoff_base", 10)
+    monkeypatch.setattr(settings, "scheduler_backoff_max", 60)
+    assert 5 <= backoff_seconds(1) <= 10
+    assert 20 <= backoff_seconds(3) <= 40
+    assert 30 <= backoff_seconds(10) <= 60
+
+
+async def test_reminder_due_lead_time_before_session(monkeypatch):
+    scheduled = []
+    
+    async def schedule(job_id, job_type, args, run_at):
+        scheduled.append((job_id, run_at))
+        return True
+    
+    monkeypatch.setattr(reminders.scheduler, "schedule", schedule)
+    start = datetime.now(timezone.utc).replace(microsecond=0, second=0) + timedelta(days=3)
+    
+    assert await reminders.schedule_session_reminder("s1", "u1", start.date().isoformat(), start.strftime("%H:%M"))
+    assert scheduled == [("reminder:s1", (start - timedelta(seconds=settings.reminder_lead_time)).timestamp())]
+    
+    # Past sessions and unparseable times are not scheduled
+    assert not await reminders.schedule_session_reminder("s2", "u1", "2020-01-01", "10:00")
+    assert not await reminders.schedule_session_reminder("s3", "u1", "someday", "10:00")
+    assert len(scheduled) == 1
+
+
+async def test_due_reminder_reaches_the_installed_notifier(monkeypatch):
+    sent, acked = [], []
+    
+    class RecordingNotifier(notifications.Notifier):
+        async def send(self, notification):
+            sent.append(notification)
+    
+    async def claim():
+        args = {"session_id": "s1", "user_id": "u1", "date": "2026-10-20", "time": "09:30"}
+        return [Job("reminder:s1", reminders.REMINDER_JOB, args, 0, now_ms())]
+    
+    async def ack(job_ids):
+        acked.extend(job_ids)
+        return len(job_ids)
+    
+    monkeypatch.setattr(notifications, "notifier", notifications.notifier)
+    monkeypatch.setattr(reminders.scheduler, "claim", claim)
+    monkeypatch.setattr(reminders.scheduler, "ack", ack)
+    notifications.set_notifier(RecordingNotifier())
+    
+    assert await reminders.scheduler.run_once() == 1
+    
+    assert [(n.user_id, n.data["session_id"]) for n in sent] == [("u1", "s1")]
+    assert "2026-10-20 at 09:30" in sent[0].body
+    assert acked == ["reminder:s1"]
+
+
+async def test_failed_notification_fails_the_job(monkeypatch):
+    class DownNotifier(notifications.Notifier):
+        async def send(self, notification):
+            raise ConnectionError("push service unavailable")
+    
+    monkeypatch.setattr(notifications, "notifier", DownNotifier())
+    
+    with pytest.raises(ConnectionError):
+        await reminders.send_session_reminder({"session_id": "s1", "user_id": "u1", "date": "2026-10-20", "time": "09:30"})
+
+
+@pytest.fixture
+async def jobs():
+    """Scheduler on a throwaway key prefix in a real Redis."""
+    if not await redis_client.ping():
+        await redis_client.close()
+        pytest.skip("Redis not available")
+    scheduler = DelayedJobScheduler(prefix=f"test-jobs-{uuid.uuid4().hex[:8]}")
+    yield scheduler
+    keys = await redis_client._client.keys(f"{scheduler.prefix}:*")
+    if keys:
+        await redis_client._client.delete(*keys)
+    await redis_client.close()
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+async def test_claims_only_due_jobs_once(jobs):
+    now = time.time()
+    await jobs.schedule("due", "t", {"n": 1}, now - 1)
+    await jobs.schedule("later", "t", {"n": 2}, now + 3600)
+    
+    claimed = await jobs.claim()
+    assert [(job.id, job.args) for job in claimed] == [("due", {"n": 1})]
+    assert await jobs.claim() == []
+    assert await jobs.ack(["due"]) == 1
+
+
+async def test_rescheduling_deduplicates(jobs):
+    await jobs.schedule("dup", "t", {"v": 1}, time.time() + 3600)
+    await jobs.schedule("dup", "t", {"v": 2}, time.time() - 1)
+    
+    claimed = await jobs.claim()
+    assert [(job.id, job.args) for job in claimed] == [("dup", {"v": 2})]
+
+
+async def test_cancelled_job_is_not_claimed(jobs):
+    await jobs.schedule("gone", "t", {}, time.time() - 1)
+    assert await jobs.cancel("gone")
+    assert await jobs.claim() == []
+
+
+async def test_expired_lease_is_reclaimed(jobs, monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_lease_ms", 1000)
+    await jobs.schedule("stuck", "t", {}, time.time() - 1)
+    assert len(await jobs.claim()) == 1
+    
+    assert await jobs.claim() == []
+    reclaimed = await jobs.claim(now_ms=now_ms() + 2000)
+    assert [job.id for job in reclaimed] == ["stuck"]
+
+
+async def test_failures_retry_then_dead_letter(jobs, monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_max_attempts", 2)
+    calls = []
+    
+    @jobs.handler("flaky")
+    async def flaky(args):
+        calls.append(args)
+        raise RuntimeError("downstream unavailable")
+    
+    await jobs.schedule("f1", "flaky", {"x": 1}, time.time() - 1)
+    assert await jobs.run_once() == 1
+    
+    # Rescheduled with backoff, not immediately due
+    assert await jobs.claim() == []
+    retried = await jobs.claim(now_ms=now_ms() + int(settings.scheduler_backoff_max * 1000) + 1000)
+    assert [(job.id, job.attempts) for job in retried] == [("f1", 1)]
+    await jobs.fail(retried[0], RuntimeError("still down"))
+    
+    dead = await redis_client._client.lrange(jobs.dead_key, 0, -1)
+    assert len(dead) == 1 and '"id": "f1"' in dead[0]
+    assert await redis_client._client.hlen(jobs.keys[2]) == 0
+
+
+async def test_run_once_dispatches_batch(jobs):
+    seen = []
+    
+    @jobs.handler("ping")
+    async def ping(args):
+        seen.append(args["i"])
+    
+    for i in range(20):
+        await jobs.schedule(f"p{i}", "ping", {"i": i}, time.time() - 1)
+    
+    assert await jobs.run_once() == 20
+    assert sorted(seen) == list(range(20))
+    assert await redis_client._client.zcard(jobs.keys[1]) == 0
+    assert await redis_client._client.hlen(jobs.keys[2]) == 0
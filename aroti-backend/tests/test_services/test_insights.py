@@ -0,0 +1,101 @@
+"""
+Daily insights engine and timezone warm-up tests.
+"""
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.cache.cache_aside import get_or_load
+from app.config import settings
+from app.scheduler.insights import due_timezones, warm_insights
+from app.schemas.home import DailyInsightSchema
+from app.services.insights import (
+    build_insight,
+    build_insights,
+    insight_key,
+    insight_ttl,
+    local_date,
+)
+from app.services.numerology import reduce_number
+
+DAY = date(2026, 10, 17)
+
+
+@pytest.fixture
+async def users_db():
+    """Sessionmaker for a throwaway database with a minimal users table (SQLite has no ARRAY)."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE users (id VARCHAR PRIMARY KEY, birth_date DATE, timezone VARCHAR NOT NULL DEFAULT 'UTC')"))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def test_personal_numbers_follow_the_ios_cycle():
+    insight = build_insight("u1", date(1990, 7, 15), DAY)
+    
+    # year 7 + 15 + 2026 -> 5; month 5 + 10 -> 6; day 6 + 17 -> 5
+    assert insight["personalNumbers"] == {"personalYear": 5, "personalMonth": 6, "personalDay": 5}
+    assert insight["numerology"]["number"] == 5
+    assert insight["date"] == "2026-10-17"
+    DailyInsightSchema.model_validate(insight)
+    assert reduce_number(29) == 11 and reduce_number(38) == 11 and reduce_number(1999) == 1
+
+
+def test_batch_matches_single_and_is_stable():
+    user_ids = [f"user-{i}" for i in range(50)]
+    birth_dates = [date(1950 + i, i % 12 + 1, i % 28 + 1) if i % 5 else None for i in range(50)]
+    
+    batch = build_insights(user_ids, birth_dates, DAY)
+    
+    assert batch == [build_insight(u, b, DAY) for u, b in zip(user_ids, birth_dates)]
+    assert batch[0]["personalNumbers"] is None
+    assert batch[0]["numerology"]["number"] == reduce_number(2026 + 10 + 17)
+    assert len({insight["tarotCard"]["id"] for insight in batch}) > 5
+
+
+async def test_warmup_fills_the_keys_of_timezones_reaching_midnight(users_db, fake_redis, monkeypatch):
+    """22:00 UTC is midnight in Berlin (CEST) but not in Kolkata, New York or UTC."""
+    monkeypatch.setattr(settings, "insights_warmup_batch", 2)
+    users = [("user-0", None, "Europe/Berlin"), ("user-1", date(1990, 1, 2), "Europe/Berlin"),
+             ("user-2", date(1990, 1, 3), "Europe/Berlin"), ("user-3", date(1990, 1, 4), "Asia/Kolkata"),
+             ("user-4", date(1990, 1, 5), "America/New_York")]
+    async with users_db() as db:
+        for user_id, birth, tz in users:
+            await db.execute(
+                text("INSERT INTO users (id, birth_date, timezone) VALUES (:id, :birth, :tz)"),
+                {"id": user_id, "birth": birth, "tz": tz}
+            )
+        await db.commit()
+    
+    written = await warm_insights(datetime(2026, 10, 17, 22, tzinfo=timezone.utc), users_db)
+    
+    async def load():
+        raise AssertionError("warmed insight should be a cache hit")
+    
+    berlin_day = date(2026, 10, 18)
+    cached = await get_or_load(insight_key("user-2", berlin_day), load, ttl=60)
+    assert written == 3
+    assert sorted(key for key in fake_redis.data if key.startswith("daily_insights:")) == [
+        insight_key(f"user-{i}", berlin_day) for i in range(3)
+    ]
+    assert json.loads(cached.body) == build_insight("user-2", date(1990, 1, 3), berlin_day)
+
+
+def test_timezones_are_warmed_in_the_wave_holding_their_midnight():
+    timezones = ["UTC", "Europe/Berlin", "Asia/Kolkata", "America/New_York", "Not/AZone"]
+    
+    assert due_timezones(timezones, datetime(2026, 10, 17, 18, tzinfo=timezone.utc)) == {
+        "Asia/Kolkata": date(2026, 10, 18)
+    }
+    assert due_timezones(timezones, datetime(2026, 10, 18, 0, tzinfo=timezone.utc)) == {
+        "UTC": date(2026, 10, 18), "Not/AZone": date(2026, 10, 18)
+    }
+    # Warmed 15 minutes before midnight, fresh for the whole local day after it
+    berlin_eve = datetime(2026, 10, 17, 21, 45, tzinfo=timezone.utc)
+    assert insight_ttl(date(2026, 10, 18), "Europe/Berlin", berlin_eve) == 86400 + 900
+    assert local_date("America/New_York", berlin_eve) == date(2026, 10, 17)
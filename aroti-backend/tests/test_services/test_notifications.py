@@ -0,0 +1,76 @@
+"""
+Notifier tests.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.services import notifications
+from app.services.notifications import EmailNotifier, LogNotifier, Notification, Notifier, build_notifier
+
+
+@pytest.fixture
+async def users_db():
+    """Sessionmaker for a throwaway users table (SQLite has no ARRAY)."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE users (id VARCHAR PRIMARY KEY, email VARCHAR)"))
+        await conn.execute(text("INSERT INTO users VALUES ('u1', 'ada@example.com'), ('u2', '')"))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+class FakeSMTP:
+    """Records what smtplib.SMTP is asked to do."""
+    sent = []
+    
+    def __init__(self, host, port, timeout):
+        self.calls = [("connect", host, port)]
+    
+    def starttls(self):
+        self.calls.append(("starttls",))
+    
+    def login(self, user, password):
+        self.calls.append(("login", user))
+    
+    def send_message(self, message):
+        FakeSMTP.sent.append((self.calls, message))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+def test_notifier_is_abstract():
+    with pytest.raises(TypeError):
+        Notifier()
+
+
+def test_smtp_host_selects_the_email_notifier(monkeypatch):
+    monkeypatch.setattr(settings, "smtp_host", "")
+    assert isinstance(build_notifier(), LogNotifier)
+    
+    monkeypatch.setattr(settings, "smtp_host", "smtp.example.com")
+    assert isinstance(build_notifier(), EmailNotifier)
+
+
+async def test_email_goes_to_the_users_address(users_db, monkeypatch):
+    monkeypatch.setattr(notifications.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, "sent", [])
+    monkeypatch.setattr(settings, "smtp_host", "smtp.example.com")
+    monkeypatch.setattr(settings, "smtp_username", "aroti")
+    notifier = EmailNotifier(users_db)
+    
+    await notifier.send(Notification("u1", "Upcoming session", "Your session is on 2026-10-20 at 09:30 UTC."))
+    # No address: dropped without retrying
+    await notifier.send(Notification("u2", "Upcoming session", "..."))
+    
+    [(calls, message)] = FakeSMTP.sent
+    assert calls == [("connect", "smtp.example.com", settings.smtp_port), ("starttls",), ("login", "aroti")]
+    assert message["To"] == "ada@example.com"
+    assert message["Subject"] == "Upcoming session"
+    assert "09:30 UTC" in message.get_content()
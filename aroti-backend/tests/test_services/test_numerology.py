@@ -0,0 +1,39 @@
+"""
+Numerology table and batch tests.
+"""
+import random
+from datetime import date
+
+from app.services.numerology import KARMIC_MEANINGS, NO_KARMIC_LESSONS, numerology, numerology_batch, reduce_number
+
+DAY = date(2026, 10, 17)
+
+
+def test_numbers_match_the_ios_formulas():
+    result = numerology(date(1990, 7, 15), DAY)
+    
+    # 1990 -> 1, 7, 15 -> 6; 1 + 7 + 6 = 14 -> 5
+    assert result["coreDestinyNumber"] == result["lifePath"] == 5
+    assert (result["personalYear"], result["personalMonth"], result["personalDay"]) == (5, 6, 5)
+    # 1990715 has 0, 1, 5, 7, 9
+    assert result["karmicLessons"] == tuple(KARMIC_MEANINGS[d] for d in (2, 3, 4, 6, 8))
+    # Master numbers stay unreduced: 1993 -> 22
+    assert numerology(date(1993, 1, 1), DAY)["coreDestinyNumber"] == reduce_number(22 + 1 + 1) == 6
+    assert numerology(date(1993, 2, 9), DAY)["coreDestinyNumber"] == 33
+
+
+def test_batch_matches_digit_by_digit_reduction():
+    rng = random.Random(3)
+    birth_dates = [date.fromordinal(rng.randint(date(1, 1, 1).toordinal(), date(9999, 12, 31).toordinal()))
+                   for _ in range(2000)]
+    
+    batch = numerology_batch(birth_dates, DAY)
+    
+    assert batch == [numerology(birth_date, DAY) for birth_date in birth_dates]
+    for birth_date, result in zip(birth_dates, batch):
+        destiny = reduce_number(
+            reduce_number(birth_date.year) + reduce_number(birth_date.month) + reduce_number(birth_date.day)
+        )
+        digits = f"{birth_date.year}{birth_date.month}{birth_date.day}"
+        lessons = tuple(KARMIC_MEANINGS[d] for d in range(1, 10) if str(d) not in digits) or NO_KARMIC_LESSONS
+        assert (result["lifePath"], result["karmicLessons"]) == (destiny, lessons)
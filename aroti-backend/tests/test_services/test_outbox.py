@@ -0,0 +1,148 @@
+"""
+Transactional outbox and relay tests.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.cache.specialist_catalog import CATALOG_VERSION_KEY
+from app.config import settings
+from app.models.outbox import OutboxEvent
+from app.services import outbox
+from app.services.outbox import CACHE_DELETE, OutboxRelay, enqueue, invalidate
+
+
+async def pending(sessionmaker):
+    async with sessionmaker() as db:
+        return (await db.execute(select(OutboxEvent).order_by(OutboxEvent.id))).scalars().all()
+
+
+async def test_events_commit_and_roll_back_with_the_write(outbox_db, fake_redis):
+    async with outbox_db() as db:
+        invalidate(db, "profile:u1")
+        await db.rollback()
+    assert await pending(outbox_db) == []
+    
+    async with outbox_db() as db:
+        invalidate(db, "profile:u1")
+        await db.commit()
+    events = await pending(outbox_db)
+    assert [(e.kind, e.payload) for e in events] == [(CACHE_DELETE, {"keys": ["profile:u1"]})]
+
+
+async def test_relay_batches_cache_deletes(outbox_db, fake_redis):
+    fake_redis.data.update({"profile:u1": "x", "profile:u2": "y", "sessions:user:u1": "z"})
+    async with outbox_db() as db:
+        invalidate(db, "profile:u1")
+        invalidate(db, "profile:u2", "sessions:user:u1")
+        invalidate(db, "profile:u1")
+        await db.commit()
+    
+    relay = OutboxRelay(outbox_db)
+    assert await relay.relay_once() == 3
+    
+    assert fake_redis.deletes == [("profile:u1", "profile:u2", "sessions:user:u1")]
+    assert fake_redis.data == {}
+    assert await pending(outbox_db) == []
+    assert await relay.relay_once() == 0
+    assert CATALOG_VERSION_KEY not in fake_redis.data
+
+
+async def test_specialist_invalidation_bumps_the_catalog_version(outbox_db, fake_redis):
+    fake_redis.data[CATALOG_VERSION_KEY] = "4"
+    async with outbox_db() as db:
+        invalidate(db, "specialist:s1")
+        await db.commit()
+    
+    await OutboxRelay(outbox_db).relay_once()
+    
+    assert fake_redis.data[CATALOG_VERSION_KEY] == "5"
+    assert await pending(outbox_db) == []
+
+
+async def test_failed_events_back_off_and_retry(outbox_db, fake_redis, monkeypatch):
+    calls = []
+    
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise RuntimeError("Temporal unavailable")
+    
+    monkeypatch.setitem(outbox.HANDLERS, "test.flaky", flaky)
+    async with outbox_db() as db:
+        enqueue(db, "test.flaky", {"n": 1})
+        enqueue(db, "test.unknown", {"n": 2})
+        await db.commit()
+    
+    relay = OutboxRelay(outbox_db)
+    assert await relay.relay_once() == 2
+    events = await pending(outbox_db)
+    assert [(e.kind, e.attempts) for e in events] == [("test.flaky", 1), ("test.unknown", 1)]
+    assert events[0].last_error == "Temporal unavailable"
+    assert all(e.available_at > datetime.utcnow() for e in events)
+    
+    # Not due yet
+    assert await relay.relay_once() == 0
+    
+    async with outbox_db() as db:
+        for event in (await db.execute(select(OutboxEvent))).scalars():
+            event.available_at = datetime.utcnow()
+        await db.commit()
+    assert await relay.relay_once() == 2
+    assert [e.kind for e in await pending(outbox_db)] == ["test.unknown"]
+    assert calls == [{"n": 1}, {"n": 1}]
+
+
+async def test_delivery_runs_outside_the_claim_transaction(outbox_db, fake_redis, monkeypatch):
+    seen_by_other_relay = []
+    
+    async def slow(payload):
+        # The batch is leased and committed: a second relay finds nothing to claim
+        seen_by_other_relay.append(await OutboxRelay(outbox_db).relay_once())
+    
+    monkeypatch.setitem(outbox.HANDLERS, "test.slow", slow)
+    async with outbox_db() as db:
+        enqueue(db, "test.slow", {})
+        await db.commit()
+    
+    assert await OutboxRelay(outbox_db).relay_once() == 1
+    assert seen_by_other_relay == [0]
+    assert await pending(outbox_db) == []
+
+
+async def test_interrupted_batch_is_redelivered_after_the_lease(outbox_db, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "outbox_lease_seconds", 30)
+    
+    async def hang(payload):
+        await asyncio.sleep(3600)
+    
+    monkeypatch.setitem(outbox.HANDLERS, "test.hang", hang)
+    async with outbox_db() as db:
+        enqueue(db, "test.hang", {})
+        await db.commit()
+    
+    relay = OutboxRelay(outbox_db)
+    await relay.start()
+    await asyncio.sleep(0.1)
+    await relay.close()
+    
+    [event] = await pending(outbox_db)
+    assert event.attempts == 0
+    assert event.available_at > datetime.utcnow() + timedelta(seconds=20)
+
+
+async def test_slow_handler_times_out(outbox_db, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "outbox_delivery_timeout", 0.05)
+    
+    async def hang(payload):
+        await asyncio.sleep(3600)
+    
+    monkeypatch.setitem(outbox.HANDLERS, "test.hang", hang)
+    async with outbox_db() as db:
+        enqueue(db, "test.hang", {})
+        await db.commit()
+    
+    assert await OutboxRelay(outbox_db).relay_once() == 1
+    [event] = await pending(outbox_db)
+    assert (event.attempts, event.last_error) == (1, "Timed out after 0.05s")
@@ -0,0 +1,27 @@
+"""
+Activity tests, run in Temporal's ActivityEnvironment (no server needed).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from temporalio.exceptions import ApplicationError
+from temporalio.testing import ActivityEnvironment
+
+from app.scheduler import reminders
+from app.workflows.activities import schedule_reminder
+
+
+async def test_unscheduled_reminder_fails_the_activity_so_it_is_retried(monkeypatch):
+    async def schedule(job_id, job_type, args, run_at):
+        return False
+    
+    monkeypatch.setattr(reminders.scheduler, "schedule", schedule)
+    start = datetime.now(timezone.utc) + timedelta(days=3)
+    
+    with pytest.raises(ApplicationError) as error:
+        await ActivityEnvironment().run(schedule_reminder, "s1", "u1", start.date().isoformat(), start.strftime("%H:%M"))
+    assert error.value.type == "ReminderNotScheduled"
+    assert not error.value.non_retryable
+    
+    # A past session needs no reminder, which is not a failure
+    await ActivityEnvironment().run(schedule_reminder, "s2", "u1", "2020-01-01", "10:00")
@@ -0,0 +1,70 @@
+"""
+Activity thread pool and timing interceptor tests.
+"""
+import inspect
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from temporalio.worker import ActivityInboundInterceptor
+
+from app.workflows import activities, instrumentation
+from app.workflows.instrumentation import ActivityThreadPool, ActivityTimingInterceptor
+
+
+def test_db_activities_run_on_thread_pool():
+    """Blocking SessionLocal activities must be sync so the worker runs them off the event loop."""
+    assert not inspect.iscoroutinefunction(activities.check_specialist_availability)
+    assert not inspect.iscoroutinefunction(activities.create_session_record)
+
+
+def test_pool_counts_queued_and_running():
+    pool = ActivityThreadPool(max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+    
+    def blocking():
+        started.set()
+        release.wait(5)
+    
+    first = pool.submit(blocking)
+    started.wait(5)
+    second = pool.submit(lambda: None)
+    assert pool.stats() == {"threads": 1, "queued": 1, "running": 1}
+    
+    release.set()
+    first.result(5)
+    second.result(5)
+    assert pool.stats() == {"threads": 1, "queued": 0, "running": 0}
+    pool.shutdown()
+
+
+class _Next(ActivityInboundInterceptor):
+    def __init__(self, fail: bool):
+        self.fail = fail
+    
+    async def execute_activity(self, input):
+        if self.fail:
+            raise RuntimeError("boom")
+        return "ok"
+
+
+async def test_interceptor_records_latency(monkeypatch):
+    scheduled = datetime(2026, 3, 15, 10, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(instrumentation.activity, "info", lambda: SimpleNamespace(
+        activity_type="create_session_record",
+        current_attempt_scheduled_time=scheduled,
+        started_time=scheduled + timedelta(milliseconds=250)
+    ))
+    timing = ActivityTimingInterceptor()
+    
+    assert await timing.intercept_activity(_Next(fail=False)).execute_activity(None) == "ok"
+    with pytest.raises(RuntimeError):
+        await timing.intercept_activity(_Next(fail=True)).execute_activity(None)
+    
+    report = timing.drain()["create_session_record"]
+    assert report["execution"]["count"] == 2
+    assert report["schedule_to_start"]["avg_ms"] == 250.0
+    assert report["failures"] == 1
+    assert timing.drain() == {}
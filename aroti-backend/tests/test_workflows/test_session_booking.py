@@ -0,0 +1,107 @@
+"""
+SessionBookingWorkflow tests in Temporal's time-skipping test environment.
+Activities are replaced with stand-ins; skipped when the test server cannot start.
+"""
+import uuid
+import pytest
+from temporalio import activity
+from temporalio.client import Client
+from temporalio.exceptions import ApplicationError
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from app.config import settings
+from app.observability.tracing import SpanContext, current_traceparent, tracer
+from app.workflows.session_booking import BookingRequest, SessionBookingWorkflow
+from app.workflows.tracing import TracingInterceptor
+
+
+@pytest.fixture
+async def env():
+    try:
+        environment = await WorkflowEnvironment.start_time_skipping()
+    except RuntimeError:
+        pytest.skip("Temporal test server not available")
+    yield environment
+    await environment.shutdown()
+
+
+def activities(slot_taken: bool = False):
+    @activity.defn(name="check_specialist_availability")
+    async def check(specialist_id: str, date: str, time: str) -> bool:
+        return True
+    
+    @activity.defn(name="create_session_record")
+    async def create(booking_request: dict) -> dict:
+        if slot_taken:
+            raise ApplicationError("Slot already booked", type="SlotTaken", non_retryable=True)
+        return {"session_id": booking_request["session_id"]}
+    
+    @activity.defn(name="send_confirmation_email")
+    async def email(user_id: str, session_data: dict) -> None:
+        pass
+    
+    @activity.defn(name="schedule_reminder")
+    async def reminder(session_id: str, user_id: str, date: str, time: str) -> None:
+        pass
+    
+    @activity.defn(name="generate_meeting_link")
+    async def link(session_id: str) -> str:
+        return f"https://meet.aroti.app/session-{session_id}"
+    
+    return [check, create, email, reminder, link]
+
+
+async def run_booking(env, slot_taken: bool = False) -> dict:
+    task_queue = f"test-{uuid.uuid4().hex}"
+    async with Worker(
+        env.client,
+        task_queue=task_queue,
+        workflows=[SessionBookingWorkflow],
+        activities=activities(slot_taken)
+    ):
+        handle = await env.client.start_workflow(
+            SessionBookingWorkflow.run,
+            BookingRequest(session_id="s1", specialist_id="1", user_id="u1", date="2026-03-15", time="10:00"),
+            id=f"booking-{uuid.uuid4().hex}",
+            task_queue=task_queue
+        )
+        result = await handle.result()
+        assert (await handle.query(SessionBookingWorkflow.status))["step"] in ("completed", "rejected")
+        return result
+
+
+async def test_booking_completes(env):
+    result = await run_booking(env)
+    assert result == {"success": True, "session_id": "s1", "meeting_link": "https://meet.aroti.app/session-s1"}
+
+
+async def test_lost_slot_is_rejected_not_failed(env):
+    result = await run_booking(env, slot_taken=True)
+    assert result["success"] is False
+
+
+async def test_trace_context_reaches_activities(env, monkeypatch):
+    """Activities run in the trace of the span that started the workflow."""
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    seen = []
+    
+    @activity.defn(name="generate_meeting_link")
+    async def link(session_id: str) -> str:
+        seen.append(SpanContext.from_traceparent(current_traceparent()))
+        return "https://meet.aroti.app/traced"
+    
+    client = Client(**{**env.client.config(), "interceptors": [TracingInterceptor()]})
+    task_queue = f"test-{uuid.uuid4().hex}"
+    async with Worker(client, task_queue=task_queue, workflows=[SessionBookingWorkflow],
+                      activities=[*activities()[:-1], link]):
+        with tracer.span("POST /api/sessions") as request_span:
+            handle = await client.start_workflow(
+                SessionBookingWorkflow.run,
+                BookingRequest(session_id="s1", specialist_id="1", user_id="u1", date="2026-03-15", time="10:00"),
+                id=f"booking-{uuid.uuid4().hex}",
+                task_queue=task_queue
+            )
+        await handle.result()
+    
+    assert seen[0].trace_id == request_span.context.trace_id